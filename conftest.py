@@ -1,30 +1,518 @@
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
 import pytest
 from playwright.sync_api import Page, Browser, sync_playwright
 from models.home_page import HomePage
+from utils import config as settings
+from utils import playwright_compat
+from utils.browser_server import BrowserServer
+from utils.context_pool import ContextPool
+from utils.failure_capture import FailureCapture, FailureRecorder, FailureStore, parse_artifacts
+from utils.flakes import LANES, QUARANTINE_RETRIES, FlakeStore, FlakeTracker
+from utils.har import HarArchive, FALLBACK_POLICIES
+from utils.impact import IMPACT_FILE, ImpactRecorder, changed_symbols, load_map, select_affected
+from utils.local_site import LocalSite, LocalSiteConfig
+from utils.parallel import DurationRecorder, DURATIONS_FILE, select_shard
+from utils.perf_budget import BUDGET_DIR, HISTORY_FILE, check as check_budgets, in_ci, recording_baseline, report_lines
+from utils.perf_metrics import PerfLog, read_records, records_html
+from utils.resource_policy import PROFILES, ResourcePolicy, SizeCache
+from utils.screenshots import MODES as SCREENSHOT_MODES, ScreenshotCapture, ScreenshotStore
+from utils.search_api import learn_all, save_endpoints
+from utils.spans import DEFAULT_TOP, StepTracer
 
-@pytest.fixture(scope="function")
-def browser():
-    """Create a browser instance for each test"""
+CONTEXT_POOL_KEY = pytest.StashKey[ContextPool]()
+BROWSER_SERVER_KEY = pytest.StashKey[BrowserServer]()
+LOCAL_SITE_KEY = pytest.StashKey[LocalSite]()
+RESOURCE_METER_KEY = pytest.StashKey[object]()
+RESOURCE_TOTALS_KEY = pytest.StashKey[dict]()
+PERF_LOG_KEY = pytest.StashKey[PerfLog]()
+PERF_RECORDS_KEY = pytest.StashKey[list]()
+PERF_VERDICTS_KEY = pytest.StashKey[list]()
+IMPACT_KEY = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("framework", "PHP Travels test framework")
+    group.addoption(
+        "--context-pool-size",
+        type=int,
+        default=settings.CONTEXT_POOL_SIZE,
+        help="Number of warm browser contexts kept per worker process",
+    )
+    group.addoption(
+        "--browser-server",
+        action="store_true",
+        default=settings.BROWSER_SERVER,
+        help="Connect to a persistent browser server kept between runs (started on demand)",
+    )
+    group.addoption(
+        "--record",
+        action="store_true",
+        default=False,
+        help="Record a HAR archive per test against the live site",
+    )
+    group.addoption(
+        "--replay",
+        action="store_true",
+        default=False,
+        help="Serve every request from recorded HAR archives (no network needed)",
+    )
+    group.addoption(
+        "--har-dir",
+        default=settings.HAR_DIR,
+        help="Directory holding the HAR archives",
+    )
+    group.addoption(
+        "--har-fallback",
+        choices=FALLBACK_POLICIES,
+        default=settings.HAR_FALLBACK,
+        help="How --replay answers requests missing from every archive",
+    )
+    group.addoption(
+        "--local-site",
+        action="store_true",
+        default=False,
+        help="Run against the bundled PHPTravels stand-in (LOCAL_SITE_* env vars tune it)",
+    )
+    group.addoption(
+        "--shard-file",
+        default=None,
+        help="Only run the node ids listed in this file (used by utils.parallel)",
+    )
+    group.addoption(
+        "--durations-file",
+        default=DURATIONS_FILE,
+        help="Where per-test durations are recorded for duration-aware sharding",
+    )
+    group.addoption(
+        "--resource-profile",
+        choices=sorted(PROFILES),
+        default=settings.RESOURCE_PROFILE,
+        help="Which resources to block: full (nothing), structural (images, fonts, media, trackers) or visual (trackers)",
+    )
+    group.addoption(
+        "--perf-dir",
+        default=settings.PERF_DIR,
+        help="Directory for the per-test page-load metrics (JSON lines)",
+    )
+    group.addoption(
+        "--perf-metrics",
+        action="store_true",
+        default=settings.PERF_METRICS,
+        help="Record page-load metrics after every navigation, waiting for the load event (always on in CI)",
+    )
+    group.addoption(
+        "--perf-budgets",
+        default=BUDGET_DIR,
+        help="Directory of per-page performance budget files",
+    )
+    group.addoption(
+        "--perf-history",
+        default=HISTORY_FILE,
+        help="Rolling performance baselines used to detect regressions",
+    )
+    group.addoption(
+        "--perf-record-baseline",
+        action="store_true",
+        default=False,
+        help="Fold this run's page-load medians into --perf-history (always on in CI)",
+    )
+    group.addoption(
+        "--impact",
+        action="store_true",
+        default=False,
+        help="Only run tests that touched page-object code changed since --impact-base",
+    )
+    group.addoption(
+        "--impact-base",
+        default="HEAD",
+        help="git revision the models/ diff for --impact is taken against",
+    )
+    group.addoption(
+        "--impact-map",
+        default=IMPACT_FILE,
+        help="Where the page-object symbols each test touches are recorded",
+    )
+    group.addoption(
+        "--flake-db",
+        default=settings.FLAKE_DB,
+        help="SQLite history of test outcomes, durations and retries used to quarantine flaky tests",
+    )
+    group.addoption(
+        "--flake-lane",
+        choices=LANES,
+        default=settings.FLAKE_LANE,
+        help="all tests, only stable ones (blocking lane) or only quarantined ones (non-blocking lane)",
+    )
+    group.addoption(
+        "--quarantine-retries",
+        type=int,
+        default=QUARANTINE_RETRIES,
+        help="Extra attempts for quarantined tests before their failure is reported (as xfail in the quarantine lane)",
+    )
+    group.addoption(
+        "--trace-steps",
+        action="store_true",
+        default=settings.TRACE_STEPS,
+        help="Record page-object steps and Playwright calls as spans: a step trace and a slowest steps table",
+    )
+    group.addoption(
+        "--slowest-steps",
+        type=int,
+        default=DEFAULT_TOP,
+        help="Page-object steps and Playwright calls listed in the slowest steps table (0 to hide it)",
+    )
+    group.addoption(
+        "--learn-search-api",
+        action="store_true",
+        default=False,
+        help="Learn the requests behind each search form for python -m utils.search_api",
+    )
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Record the visual baselines from this run instead of comparing against them",
+    )
+    group.addoption(
+        "--screenshots",
+        choices=SCREENSHOT_MODES,
+        default=settings.SCREENSHOTS,
+        help="Screenshot failing tests, every page-object step, or only explicit take_screenshot() calls",
+    )
+    group.addoption(
+        "--screenshot-dir",
+        default=settings.SCREENSHOT_DIR,
+        help="Content-addressed screenshot store",
+    )
+    group.addoption(
+        "--screenshot-max-mb",
+        type=int,
+        default=settings.SCREENSHOT_MAX_MB,
+        help="Size limit of the screenshot store; the least recently used frames are evicted",
+    )
+    group.addoption(
+        "--failure-artifacts",
+        default=settings.FAILURE_ARTIFACTS,
+        help="What failing tests keep, comma-separated: trace, video, dom, or none",
+    )
+    group.addoption(
+        "--failure-window",
+        type=float,
+        default=settings.FAILURE_WINDOW_S,
+        help="Seconds of screencast kept in memory per page for the video artifact",
+    )
+    group.addoption(
+        "--failure-dir",
+        default=settings.FAILURE_DIR,
+        help="Directory of the failure captures, one sub-directory per failing test",
+    )
+    group.addoption(
+        "--failure-max-mb",
+        type=int,
+        default=settings.FAILURE_MAX_MB,
+        help="Size limit of --failure-dir; the oldest failures are evicted",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "resource_profile(name): load this test's pages with the given resource profile")
+    config.addinivalue_line("markers", "quarantined: flaky test retried, non-blocking in the quarantine lane (set automatically)")
+    config.stash[RESOURCE_TOTALS_KEY] = {"requests_blocked": 0, "bytes_saved": 0}
+    config.pluginmanager.register(
+        FlakeTracker(
+            FlakeStore(config.getoption("--flake-db")),
+            lane=config.getoption("--flake-lane"),
+            retries=config.getoption("--quarantine-retries"),
+        ),
+        "flake-tracker",
+    )
+    if config.getoption("--update-baselines"):
+        # numpy and Pillow are only needed by the visual tests
+        from utils import visual
+        visual.update_baselines = True
+    try:
+        failure_artifacts = parse_artifacts(config.getoption("--failure-artifacts"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if config.getoption("--record") and config.getoption("--replay"):
+        raise pytest.UsageError("--record and --replay cannot be used together")
+    if config.getoption("--local-site"):
+        site = LocalSite(config=LocalSiteConfig.from_env()).start()
+        config.stash[LOCAL_SITE_KEY] = site
+        settings.BASE_URL = site.url
+    elif config.getoption("--base-url", default=None):
+        settings.BASE_URL = config.getoption("--base-url").rstrip("/") + "/"
+    if not config.getoption("--collect-only"):
+        config.pluginmanager.register(DurationRecorder(config.getoption("--durations-file")), "duration-recorder")
+        config.pluginmanager.register(ImpactRecorder(config.getoption("--impact-map")), "impact-recorder")
+        # Metrics, their log and the budget check only when asked for: recording waits for every load event
+        settings.PERF_METRICS = config.getoption("--perf-metrics") or in_ci()
+        if settings.PERF_METRICS:
+            config.stash[PERF_LOG_KEY] = PerfLog(config.getoption("--perf-dir"), shard=os.environ.get("PYTEST_SHARD"))
+        # Step tracing patches Playwright process-wide, so it is opt-in. Step screenshots only need the
+        # page-object span tree to find the outermost steps, and leave Playwright unpatched.
+        trace_steps = config.getoption("--trace-steps")
+        if trace_steps or config.getoption("--screenshots") == "steps":
+            config.pluginmanager.register(
+                StepTracer(config.getoption("--perf-dir"), shard=os.environ.get("PYTEST_SHARD"),
+                           top=config.getoption("--slowest-steps") if trace_steps else 0, playwright_calls=trace_steps),
+                "step-tracer",
+            )
+        store = ScreenshotStore(config.getoption("--screenshot-dir"), config.getoption("--screenshot-max-mb") * 2**20)
+        config.pluginmanager.register(ScreenshotCapture(store, config.getoption("--screenshots")), "screenshot-capture")
+        if failure_artifacts:
+            recorder = FailureRecorder(
+                FailureStore(config.getoption("--failure-dir"), config.getoption("--failure-max-mb") * 2**20),
+                failure_artifacts,
+                window=config.getoption("--failure-window"),
+            )
+            config.pluginmanager.register(FailureCapture(recorder), "failure-capture")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Until a target's baselines are committed, comparing against them could only fail
+    baselines = Path(settings.VISUAL_BASELINE_DIR) / urlsplit(settings.BASE_URL).hostname
+    if not config.getoption("--update-baselines") and not baselines.is_dir():
+        skip = pytest.mark.skip(reason=f"no visual baselines in {baselines}/; record them with --update-baselines")
+        for item in items:
+            if item.get_closest_marker("visual"):
+                item.add_marker(skip)
+    shard_file = config.getoption("--shard-file")
+    if shard_file:
+        selected, deselected = select_shard(items, shard_file)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    if config.getoption("--impact"):
+        changed = changed_symbols(config.getoption("--impact-base"))
+        affected, _ = select_affected([item.nodeid for item in items], load_map(config.getoption("--impact-map")), changed)
+        wanted = set(affected)
+        deselected = [item for item in items if item.nodeid not in wanted]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        config.stash[IMPACT_KEY] = {"changed": sorted(changed), "selected": len(wanted), "total": len(items)}
+        items[:] = [item for item in items if item.nodeid in wanted]
+
+
+def pytest_sessionfinish(session):
+    """Check this run's page loads against the budgets; shards are checked by utils.parallel"""
+    config = session.config
+    perf_log = config.stash.get(PERF_LOG_KEY, None)
+    if perf_log is None or os.environ.get("PYTEST_SHARD"):
+        return
+    verdicts = check_budgets(
+        read_records(perf_log.path),
+        budget_dir=config.getoption("--perf-budgets"),
+        history_path=config.getoption("--perf-history"),
+        record=recording_baseline(config.getoption("--perf-record-baseline")),
+    )
+    config.stash[PERF_VERDICTS_KEY] = verdicts
+    if in_ci() and any(v.confirmed for v in verdicts) and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_unconfigure(config):
+    site = config.stash.get(LOCAL_SITE_KEY, None)
+    if site is not None:
+        site.stop()
+
+
+@pytest.fixture(scope="session")
+def browser(pytestconfig):
+    """Launch one browser per worker process, or connect to the persistent browser server"""
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+        browser = None
+        if pytestconfig.getoption("--browser-server"):
+            server = BrowserServer()
+            pytestconfig.stash[BROWSER_SERVER_KEY] = server
+            browser = server.connect(p)
+        if browser is None:
+            browser = p.chromium.launch(headless=settings.HEADLESS)
         yield browser
+        # A connected browser only disconnects; the server closes this run's contexts
         browser.close()
 
-@pytest.fixture(scope="function")
-def page(browser: Browser) -> Page:
-    """Create a new page for each test"""
-    context = browser.new_context(
-        viewport={"width": 1920, "height": 1080},
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, pytestconfig) -> ContextPool:
+    """Pool of warm contexts with the default viewport and user agent"""
+    pool = ContextPool(
+        browser,
+        size=pytestconfig.getoption("--context-pool-size"),
+        context_options=settings.context_options(),
+    )
+    pytestconfig.stash[CONTEXT_POOL_KEY] = pool
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def har_archive(pytestconfig) -> HarArchive:
+    """HAR archive store in live, record or replay mode"""
+    mode = "live"
+    if pytestconfig.getoption("--record"):
+        mode = "record"
+    elif pytestconfig.getoption("--replay"):
+        mode = "replay"
+    return HarArchive(
+        pytestconfig.getoption("--har-dir"),
+        mode=mode,
+        fallback=pytestconfig.getoption("--har-fallback"),
     )
-    page = context.new_page()
-    yield page
-    context.close()
+
+@pytest.fixture(scope="session")
+def resource_sizes() -> SizeCache:
+    """Response sizes learned across runs, used to estimate bytes saved by blocking"""
+    sizes = SizeCache()
+    yield sizes
+    sizes.save()
 
 @pytest.fixture(scope="function")
-def home_page(page: Page) -> HomePage:
-    """Create HomePage object"""
-    home = HomePage(page)
+def resource_policy(pytestconfig, request) -> ResourcePolicy:
+    """Resource profile for this test (resource_profile marker, else --resource-profile)"""
+    marker = request.node.get_closest_marker("resource_profile")
+    name = marker.args[0] if marker else pytestconfig.getoption("--resource-profile")
+    return PROFILES[name]
+
+@pytest.fixture(scope="function")
+def page(browser: Browser, har_archive: HarArchive, resource_policy: ResourcePolicy,
+         resource_sizes: SizeCache, request) -> Page:
+    """Lease a warm page from the context pool for each test"""
+    if har_archive.recording:
+        # The archive is only written when its context closes, so recording bypasses the pool
+        context = browser.new_context(**settings.context_options())
+        har_archive.record(context, request.node.nodeid)
+        meter = resource_policy.apply(context, resource_sizes)
+        request.node.stash[RESOURCE_METER_KEY] = meter
+        yield context.new_page()
+        meter.detach()
+        context.close()
+        return
+    context_pool = request.getfixturevalue("context_pool")
+    pooled = context_pool.acquire()
+    if har_archive.replaying:
+        har_archive.replay(pooled.context, request.node.nodeid)
+    meter = resource_policy.apply(pooled.context, resource_sizes)
+    request.node.stash[RESOURCE_METER_KEY] = meter
+    yield pooled.page
+    meter.detach()
+    context_pool.release(pooled)
+
+@pytest.fixture(scope="module")
+def shared_home_page(har_archive: HarArchive, resource_sizes: SizeCache, pytestconfig, request) -> HomePage:
+    """Loaded homepage shared by the read-only tests of a module"""
+    if playwright_compat.UNSUPPORTED:
+        pytest.skip(playwright_compat.UNSUPPORTED)
+    context_pool = request.getfixturevalue("context_pool")
+    pooled = context_pool.acquire()
+    if har_archive.replaying:
+        har_archive.replay(pooled.context, request.node.nodeid)
+    meter = PROFILES[pytestconfig.getoption("--resource-profile")].apply(pooled.context, resource_sizes)
+    home = HomePage(pooled.page)
+    home.resources = meter
     home.navigate()
     home.wait_for_load()
-    return home
\ No newline at end of file
+    yield home
+    meter.detach()
+    context_pool.release(pooled)
+
+def is_read_only(request, har_archive: HarArchive) -> bool:
+    """Read-only tests share a page, except when recording per-test archives or loading another resource profile"""
+    node = request.node
+    if har_archive.recording or node.get_closest_marker("mutating"):
+        return False
+    # The shared page loads under --resource-profile; a test marked for another profile gets its own page
+    marker = node.get_closest_marker("resource_profile")
+    if marker and marker.args[0] != request.config.getoption("--resource-profile"):
+        return False
+    return node.get_closest_marker("readonly") is not None
+
+@pytest.fixture(scope="function")
+def home_page(har_archive: HarArchive, request) -> HomePage:
+    """Create HomePage object (shared and reset for read-only tests)"""
+    if playwright_compat.UNSUPPORTED:
+        # The sync page objects need Playwright internals this version no longer has
+        pytest.skip(playwright_compat.UNSUPPORTED)
+    # Tests marked perf assert on page-load metrics, so they are recorded even when otherwise off
+    measure = settings.PERF_METRICS or request.node.get_closest_marker("perf") is not None
+    if is_read_only(request, har_archive):
+        home = request.getfixturevalue("shared_home_page")
+        home.perf.enabled = measure
+        resources_before = home.resources.checkpoint()
+        first_record = len(home.perf.records)
+        home.reset_view()
+    else:
+        home = HomePage(request.getfixturevalue("page"))
+        home.perf.enabled = measure
+        home.resources = request.node.stash[RESOURCE_METER_KEY]
+        resources_before = home.resources.checkpoint()
+        first_record = 0
+        home.navigate()
+        home.wait_for_load()
+    first_wait = len(home.waits.timings)
+    learning = request.config.getoption("--learn-search-api")
+    home.learn_searches = learning
+    first_search = len(home.search_requests)
+    yield home
+    if learning:
+        endpoints = learn_all(home.search_requests[first_search:])
+        if endpoints:
+            save_endpoints(endpoints, urlsplit(home.base_url).hostname, settings.SEARCH_API_FILE)
+    # Record how long each condition-based wait took for this test
+    request.node.user_properties.append(("wait_timings", home.waits.summary()[first_wait:]))
+    saved = home.resources.summary(since=resources_before)
+    request.node.user_properties.append(("resources", saved))
+    totals = request.config.stash[RESOURCE_TOTALS_KEY]
+    totals["requests_blocked"] += saved["requests_blocked"]
+    totals["bytes_saved"] += saved["bytes_saved"]
+    # Page loads of this test, for the metrics file and the HTML report
+    records = home.perf.records[first_record:]
+    request.node.user_properties.append(("perf", records))
+    request.node.stash[PERF_RECORDS_KEY] = records
+    perf_log = request.config.stash.get(PERF_LOG_KEY, None)
+    if perf_log is not None:
+        perf_log.write(request.node.nodeid, records, home.resources.policy.name)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    records = item.stash.get(PERF_RECORDS_KEY, None)
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if report.when != "teardown" or not records or pytest_html is None:
+        return
+    report.extras = getattr(report, "extras", []) + [pytest_html.extras.html(records_html(records))]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    totals = config.stash.get(RESOURCE_TOTALS_KEY, None)
+    if totals and totals["requests_blocked"]:
+        terminalreporter.section("resource policy")
+        terminalreporter.write_line(
+            f"profile={config.getoption('--resource-profile')} blocked={totals['requests_blocked']} requests "
+            f"saved~{totals['bytes_saved'] / 1024:.0f} KiB"
+        )
+    verdicts = config.stash.get(PERF_VERDICTS_KEY, None)
+    if verdicts:
+        terminalreporter.section("performance budgets")
+        for line in report_lines(verdicts):
+            terminalreporter.write_line(line)
+    impact = config.stash.get(IMPACT_KEY, None)
+    if impact:
+        terminalreporter.section("test impact")
+        terminalreporter.write_line(f"changed since {config.getoption('--impact-base')}: {', '.join(impact['changed']) or 'nothing'}")
+        terminalreporter.write_line(f"selected {impact['selected']} of {impact['total']} tests")
+    server = config.stash.get(BROWSER_SERVER_KEY, None)
+    if server is not None and server.status:
+        terminalreporter.section("browser server")
+        terminalreporter.write_line(server.status)
+    pool = config.stash.get(CONTEXT_POOL_KEY, None)
+    if pool is None:
+        return
+    stats = pool.stats.summary()
+    terminalreporter.section("context pool")
+    terminalreporter.write_line(
+        f"hits={stats['hits']} misses={stats['misses']} evictions={stats['evictions']} "
+        f"resets={stats['resets']} reset_avg={stats['reset_avg_ms']}ms reset_max={stats['reset_max_ms']}ms"
+    )
@@ -0,0 +1,145 @@
+"""
+Async page objects on playwright.async_api, so one event loop can drive many pages at once.
+The sync page objects in models.base_page are thin wrappers running these methods on the
+sync page's own event loop.
+"""
+import weakref
+from urllib.parse import urlsplit
+from playwright.async_api import Error
+from models.locators import declared_selector
+from utils import config
+from utils.batch_expect import Check, batch_expect_async
+from utils.bulk_fill import bulk_fill
+from utils.perf_metrics import AsyncPerfRecorder, install_perf_observers_async
+from utils.playwright_compat import impl_of
+from utils.screenshots import after_step, capture
+from utils.spans import instrument_steps
+from utils.waits import AsyncWaitEngine, install_wait_hooks_async
+
+# Main-frame navigations (including reloads) seen per page, shared by all page objects
+_navigation_counts = weakref.WeakKeyDictionary()
+
+
+def _page_key(page):
+    # Sync and async wrappers of one page share the underlying implementation object
+    return impl_of(page)
+
+
+def track_navigations(page):
+    """Count main-frame navigations of a page once, however many page objects wrap it"""
+    key = _page_key(page)
+    if key in _navigation_counts:
+        return
+    _navigation_counts[key] = 0
+
+    def on_navigated(frame):
+        if frame.parent_frame is None:
+            _navigation_counts[key] += 1
+
+    page.on("framenavigated", on_navigated)
+
+
+def navigation_count(page) -> int:
+    return _navigation_counts.get(_page_key(page), 0)
+
+
+class AsyncBasePage:
+    """Base class for all async page objects with common utilities"""
+
+    def __init__(self, page):
+        self.page = page
+        self.base_url = config.BASE_URL
+        track_navigations(page)
+        self.waits = AsyncWaitEngine(page)
+        # Page-load metrics, one record per navigation while enabled
+        self.perf = AsyncPerfRecorder(page, self.waits, enabled=config.PERF_METRICS)
+        # ResourceMeter enforcing the context's resource policy, set by the fixtures
+        self.resources = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every public page-object coroutine shows up as a step in the per-test span tree
+        instrument_steps(cls, after=after_step)
+
+    async def install(self):
+        """Install the browser-side wait hooks and perf observers (once per page)"""
+        await install_wait_hooks_async(self.page)
+        await install_perf_observers_async(self.page)
+
+    @property
+    def navigation_count(self) -> int:
+        """Number of main-frame navigations so far; changes whenever the document is replaced"""
+        return navigation_count(self.page)
+
+    async def navigate(self, path: str = ""):
+        """Navigate to base URL or specific path"""
+        await self.install()
+        await self.page.goto(self.base_url + path, wait_until="domcontentloaded", timeout=90000)
+        await self.perf.measure("/" + path)
+
+    async def follow_link(self, locator, label: str = None) -> dict:
+        """Click a link that loads a new document and record its page-load metrics (if enabled)"""
+        async with self.page.expect_navigation(wait_until="domcontentloaded", timeout=90000):
+            await locator.click()
+        return await self.perf.measure(label or urlsplit(self.page.url).path)
+
+    async def record_load_since(self, navigations: int) -> dict:
+        """Record page-load metrics if the document changed since the given navigation count"""
+        if self.navigation_count == navigations:
+            return None
+        return await self.perf.measure(urlsplit(self.page.url).path)
+
+    async def wait_for_load(self):
+        """Wait for page load state"""
+        await self.page.wait_for_load_state("domcontentloaded")
+
+    async def scroll_to_element(self, locator):
+        """Scroll element into view"""
+        await locator.scroll_into_view_if_needed()
+        await self.waits.element_stable(locator)
+
+    async def is_element_visible(self, locator, timeout: int = 5000) -> bool:
+        """Check if element is visible within timeout"""
+        try:
+            await locator.wait_for(state="visible", timeout=timeout)
+            return True
+        except Error:
+            # Not a bare except: that would also swallow the task's cancellation
+            return False
+
+    def checks(self, state: str, *names) -> list:
+        """Checks of one expected state for page-object locators, labelled by attribute name"""
+        return [Check(name, getattr(self, name), state, declared_selector(type(self), name)) for name in names]
+
+    async def expect_all(self, checks, timeout: int = 5000) -> dict:
+        """Assert many locator states in one browser round-trip and report all failures together"""
+        return await batch_expect_async(self.page, checks, timeout)
+
+    async def fill_all(self, fills) -> dict:
+        """Fill many form fields in one browser round-trip, falling back to per-field fills (see utils/bulk_fill.py)"""
+        return await bulk_fill(self.page, fills)
+
+    async def wait_and_click(self, locator, timeout: int = 10000):
+        """Wait for element and click"""
+        await locator.wait_for(state="visible", timeout=timeout)
+        await locator.click()
+
+    async def take_screenshot(self, name: str):
+        """Take screenshot with given name (stored in the background, see utils/screenshots.py)"""
+        await capture(self.page, name)
+
+    async def match_baseline(self, name: str, locator, mask: list = ()):
+        """Compare an element screenshot with its visual baseline, dynamic parts masked (see utils/visual.py)"""
+        # numpy and Pillow are only needed by the visual tests
+        from utils import visual
+        await self.scroll_to_element(locator)
+        capture = await locator.screenshot(
+            mask=list(mask), mask_color=visual.MASK_COLOR, animations="disabled", caret="hide", scale="css"
+        )
+        diff = visual.check(name, capture, urlsplit(self.base_url).hostname)
+        if not diff.passed():
+            raise AssertionError(f"{name} does not match its visual baseline: {diff.summary()}")
+        return diff
+
+
+instrument_steps(AsyncBasePage, after=after_step)
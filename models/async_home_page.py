@@ -0,0 +1,480 @@
+from datetime import datetime, timedelta
+from urllib.parse import urljoin
+from playwright.async_api import Page, Error
+from models.async_base_page import AsyncBasePage
+from models.home_page_locators import HomePageLocators
+from models.locators import declared_selector, registry
+from utils.batch_expect import Check
+from utils.bulk_fill import Fill
+
+# Prices and dates change between runs, so they are masked in visual baselines
+DYNAMIC_CONTENT = ("[class*='price']", "[class*='date']", "time")
+# Regions with visual baselines: locator attribute and the dynamic parts masked inside it
+VISUAL_REGIONS = {
+    "header": ("header", ()),
+    "featured_flights": ("feature_flights_cards", DYNAMIC_CONTENT),
+    "featured_tours": ("feature_tours_list", DYNAMIC_CONTENT),
+    "featured_cars": ("feature_cars_row", DYNAMIC_CONTENT),
+    "footer": ("footer", DYNAMIC_CONTENT + ("p:has-text('©')",)),
+}
+# Header navigation links, the starting points of link crawls next to the homepage
+NAV_LINKS = ("flights_nav", "hotels_nav", "tours_nav", "cars_nav", "visa_nav", "blogs_nav")
+# Search panels: submit button and field name -> locator attribute (field names are the learned API fields)
+SEARCH_FORMS = {
+    "flights": ("flight_search_button", {
+        "flight_type": "flight_way_select",
+        "origin": "flying_from_input",
+        "destination": "flying_to_input",
+        "departure": "flight_departure_date",
+        "return": "flight_return_date",
+    }),
+    "hotels": ("hotels_search_button", {
+        "city": "hotels_city_input",
+        "checkin": "hotels_checkin_date",
+        "checkout": "hotels_checkout_date",
+    }),
+    "tours": ("tours_search_button", {"destination": "tours_city_input", "date": "tours_date"}),
+    "cars": ("cars_search_button", {"pickup": "cars_pickup_location", "dropoff": "cars_dropoff_location"}),
+    "visa": ("visa_search_button", {"from_country": "visa_from_country", "to_country": "visa_to_country"}),
+}
+
+
+def date_in(days: int) -> str:
+    """Date the given number of days from today, as the search forms expect it"""
+    return (datetime.now() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+class AsyncHomePage(HomePageLocators, AsyncBasePage):
+    """Page Object for PHP Travels Homepage (playwright.async_api)"""
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        # Search tab known to be active, valid until the page navigates or reloads
+        self._active_tab = None
+        self._active_tab_navigation = None
+        self.tab_activations = 0
+        # With learn_searches set, each search_* records the requests its form submitted
+        # (see utils/search_api.py)
+        self.learn_searches = False
+        self.search_requests = []
+
+    async def reset_view(self):
+        """Cheaply restore the default homepage state between read-only tests"""
+        if self.page.url != self.base_url:
+            # The previous test left the homepage, so a full load is unavoidable
+            await self.navigate()
+            await self.wait_for_load()
+            return
+        # Pressed on a fresh locator rather than page.keyboard, which a sync wrapper may own (see utils/playwright_compat.py)
+        await self.page.locator("body").press("Escape")
+        await self.page.evaluate("window.scrollTo(0, 0)")
+        await self.click_tab("flights")
+
+    # ==================== NAVIGATION METHODS ====================
+    async def verify_logo_visible(self):
+        """Verify logo is visible and clickable"""
+        await self.expect_all(self.checks("visible", "logo"))
+
+    async def verify_navigation_menu(self):
+        """Verify all navigation menu items are visible"""
+        await self.expect_all(self.checks(
+            "visible", "logo", "flights_nav", "hotels_nav", "tours_nav", "cars_nav", "visa_nav", "blogs_nav"
+        ))
+
+    async def nav_links(self) -> list:
+        """Absolute URLs the header navigation links point to"""
+        hrefs = [await getattr(self, name).get_attribute("href") for name in NAV_LINKS]
+        return [urljoin(self.page.url, href) for href in hrefs if href]
+
+    async def verify_dropdown_menus(self):
+        """Verify dropdown menus are present"""
+        await self.expect_all(self.checks(
+            "visible", "language_dropdown", "currency_dropdown", "agents_dropdown", "customer_dropdown"
+        ))
+
+    # ==================== HERO SECTION METHODS ====================
+    async def verify_HomePage_display(self):
+        """Verify homepage banner is displayed"""
+        await self.expect_all(self.checks("visible", "banner_homepage"))
+        await self.waits.animations_finished(self.banner_homepage)
+
+    async def verify_hero_section(self):
+        """Verify hero section with title and tagline"""
+        await self.expect_all(self.checks("visible", "banner_homepage", "home_title"))
+
+    async def verify_search_tabs(self):
+        """Verify all 5 search tabs are visible"""
+        await self.expect_all(self.checks("visible", "flights_tab", "hotels_tab", "tours_tab", "cars_tab", "visa_tab"))
+
+    @property
+    def active_tab(self):
+        """Name of the active search tab, or None if unknown (e.g. after a navigation)"""
+        if self._active_tab_navigation != self.navigation_count:
+            return None
+        return self._active_tab
+
+    async def click_tab(self, tab_name: str):
+        """Activate a search tab, clicking only when it is not already active"""
+        tab_panel_ids = {
+            "flights": "#tab-flights",
+            "hotels": "#tab-hotels",
+            "tours": "#tab-tours",
+            "cars": "#tab-cars",
+            "visa": "#tab-visa"
+        }
+        tabs = {
+            "flights": self.flights_tab,
+            "hotels": self.hotels_tab,
+            "tours": self.tours_tab,
+            "cars": self.cars_tab,
+            "visa": self.visa_tab
+        }
+        if tab_name.lower() in tabs:
+            name = tab_name.lower()
+            panel_id = tab_panel_ids[name]
+            tracked = self.active_tab
+            # A different tracked tab means a click is needed; otherwise confirm with one cheap check
+            if tracked in (None, name) and await self.page.locator(f"{panel_id}.show.active").count() > 0:
+                self._remember_tab(name)
+                return
+            await tabs[name].click()
+            self.tab_activations += 1
+            # Wait for panel with show and active classes (Bootstrap tab activation)
+            try:
+                active_panel = self.page.locator(f"{panel_id}.show.active")
+                await active_panel.wait_for(state="visible", timeout=10000)
+            except Error:
+                # Fallback: wait for the tab transition to finish if class-based wait fails
+                await self.waits.animations_finished(self.page.locator(panel_id))
+            self._remember_tab(name)
+
+    def _remember_tab(self, name: str):
+        """Track the active tab for the current document"""
+        self._active_tab = name
+        self._active_tab_navigation = self.navigation_count
+
+    # ==================== SEARCH FORM METHODS ====================
+    async def verify_flights_search_form(self):
+        """Verify flights search form elements"""
+        await self.click_tab("flights")
+        await self.expect_all(self.checks(
+            "visible", "flight_search_form", "flying_from_input", "flying_to_input",
+            "flight_departure_date", "flight_search_button"
+        ))
+
+    async def verify_hotels_search_form(self):
+        """Verify hotels search form elements"""
+        await self.click_tab("hotels")
+        # Verify elements exist (verify date inputs and search button which are reliable)
+        await self.expect_all(self.checks("attached", "hotels_checkin_date", "hotels_checkout_date", "hotels_search_button"))
+
+    async def verify_tours_search_form(self):
+        """Verify tours search form elements"""
+        await self.click_tab("tours")
+        # Verify elements exist (they may be hidden but should exist in DOM)
+        await self.expect_all(self.checks("attached", "tours_date", "tours_search_button"))
+
+    async def verify_cars_search_form(self):
+        """Verify cars search form elements"""
+        await self.click_tab("cars")
+        # Verify search button exists (input selectors may vary)
+        await self.expect_all(self.checks("attached", "cars_search_button"))
+
+    async def verify_visa_search_form(self):
+        """Verify visa search form elements"""
+        await self.click_tab("visa")
+        # Verify search button exists (input selectors may vary)
+        await self.expect_all(self.checks("attached", "visa_search_button"))
+
+    # ==================== FEATURED SECTIONS METHODS ====================
+    async def verify_feature_flights_section(self):
+        """Verify featured flights section"""
+        await self.scroll_to_element(self.feature_flights_title)
+        await self.expect_all(self.checks("visible", "feature_flights_title", "feature_flights_cards"))
+        await self.waits.animations_finished(self.feature_flights_cards)
+
+    async def verify_feature_hotels_section(self):
+        """Verify featured hotels section"""
+        await self.scroll_to_element(self.feature_hotels_title)
+        await self.expect_all(self.checks("visible", "feature_hotels_title"))
+        await self.waits.animations_finished(self.feature_hotels_title)
+
+    async def verify_feature_tours_section(self):
+        """Verify featured tours section"""
+        await self.scroll_to_element(self.feature_tours_title)
+        checks = self.checks("visible", "feature_tours_title")
+        # Check if tours cards are visible
+        for name in ("feature_tours_cards", "image_tours_cards"):
+            cards = getattr(self, name)
+            if await cards.count() > 0:
+                checks.append(Check(name, cards.first, "visible", declared_selector(type(self), name, first=True)))
+        await self.expect_all(checks)
+        await self.waits.animations_finished(self.feature_tours_title)
+
+    async def verify_feature_cars_section(self):
+        """Verify featured cars section"""
+        await self.scroll_to_element(self.feature_cars_title)
+        await self.expect_all(self.checks("visible", "feature_cars_title"))
+        await self.waits.animations_finished(self.feature_cars_title)
+
+    async def verify_visual(self, region: str):
+        """Verify a homepage region (see VISUAL_REGIONS) matches its visual baseline"""
+        attribute, masks = VISUAL_REGIONS[region]
+        locator = getattr(self, attribute)
+        return await self.match_baseline(region, locator, [locator.locator(selector) for selector in masks])
+
+    # ==================== FOOTER METHODS ====================
+    async def verify_footer_section(self):
+        """Verify footer section is visible"""
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await self.waits.element_stable(self.footer)
+        await self.expect_all(self.checks("visible", "footer"))
+
+    async def verify_footer_links(self):
+        """Verify footer quick links"""
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await self.waits.element_stable(self.footer)
+        await self.expect_all(self.checks("visible", "footer_logo"))
+
+    async def verify_newsletter_form(self):
+        """Verify newsletter signup form"""
+        await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await self.waits.element_stable(self.footer)
+        await self.expect_all(self.checks(
+            "visible", "newsletter_name_input", "newsletter_email_input", "newsletter_signup_button"
+        ))
+
+    # ==================== PRIORITY 1: SEARCH FUNCTIONALITY METHODS ====================
+    async def fill_search_form(self, vertical: str, values: dict, typed: tuple = ()) -> dict:
+        """Fill a search panel from {field: value} in one browser round-trip; typed fields are typed key by key"""
+        await self.click_tab(vertical)
+        definitions = registry(type(self))
+        _, fields = SEARCH_FORMS[vertical]
+        result = await self.fill_all([
+            Fill(name, getattr(self, fields[name]), str(value), typed=name in typed,
+                 optional=definitions[fields[name]].optional, selector=definitions[fields[name]].resolved_selector)
+            for name, value in values.items()
+        ])
+        await self.waits.dom_quiet(f"#tab-{vertical}")
+        return result
+
+    async def submit_search(self, vertical: str, button=None, fields: dict = None):
+        """Submit a search form and wait for the results; records the submitted requests when learning"""
+        if button is None:
+            button_name, field_names = SEARCH_FORMS[vertical]
+            button = getattr(self, button_name)
+            fields = {name: getattr(self, attribute) for name, attribute in field_names.items()}
+        values, sent = {}, []
+        capture = sent.append
+        if self.learn_searches:
+            for name, field in fields.items():
+                if await field.count() > 0:
+                    values[name] = await field.input_value()
+            self.page.on("request", capture)
+        navigations = self.navigation_count
+        try:
+            await button.click()
+            await self.page.wait_for_load_state("networkidle", timeout=30000)
+        finally:
+            if self.learn_searches:
+                self.page.remove_listener("request", capture)
+        await self.waits.dom_quiet()
+        await self.record_load_since(navigations)
+        if self.learn_searches:
+            self.search_requests.append({
+                "vertical": vertical,
+                "values": {name: value for name, value in values.items() if value},
+                "requests": [
+                    {"method": r.method, "url": r.url, "post_data": r.post_data}
+                    for r in sent if r.resource_type in ("document", "xhr", "fetch")
+                ],
+            })
+
+    # FLIGHTS SEARCH METHODS
+    async def select_flight_type(self, flight_type: str):
+        """Select flight type: 'round' or 'oneway'"""
+        await self.click_tab("flights")
+        if await self.flight_way_select.count() > 0:
+            if flight_type.lower() == "round":
+                await self.flight_way_select.select_option("round")
+            else:
+                await self.flight_way_select.select_option("oneway")
+            await self.waits.dom_quiet("#tab-flights")
+
+    async def enter_flight_origin(self, origin: str):
+        """Enter origin airport/city"""
+        await self.click_tab("flights")
+        await self.flying_from_input.clear()
+        await self.flying_from_input.fill(origin)
+        await self.waits.autocomplete(self.flying_from_input)
+
+    async def enter_flight_destination(self, destination: str):
+        """Enter destination airport/city"""
+        await self.click_tab("flights")
+        await self.flying_to_input.clear()
+        await self.flying_to_input.fill(destination)
+        await self.waits.autocomplete(self.flying_to_input)
+
+    async def select_flight_departure_date(self, days_from_today: int = 7):
+        """Select departure date (default: 7 days from today)"""
+        await self.click_tab("flights")
+        future_date = datetime.now() + timedelta(days=days_from_today)
+        date_str = future_date.strftime("%Y-%m-%d")
+        await self.flight_departure_date.fill(date_str)
+        await self.waits.dom_quiet("#tab-flights")
+
+    async def search_flights(self, origin: str, destination: str, flight_type: str = "oneway",
+                             departure_days: int = 7, return_days: int = 14):
+        """Complete flight search flow"""
+        round_trip = flight_type.lower() == "round"
+        values = {
+            "flight_type": "round" if round_trip else "oneway",
+            "origin": origin,
+            "destination": destination,
+            "departure": date_in(departure_days),
+        }
+        if round_trip:
+            values["return"] = date_in(return_days)
+        await self.fill_search_form("flights", values)
+        await self.submit_search("flights")
+
+    async def verify_flight_date_validation(self):
+        """Verify past dates are disabled"""
+        await self.click_tab("flights")
+        today = datetime.now()
+        yesterday = today - timedelta(days=1)
+        date_str = yesterday.strftime("%Y-%m-%d")
+        await self.flight_departure_date.fill(date_str)
+        await self.waits.dom_quiet("#tab-flights")
+        current_value = await self.flight_departure_date.input_value()
+        return current_value != date_str
+
+    # HOTELS SEARCH METHODS
+    async def enter_hotel_city(self, city: str):
+        """Enter city/location for hotel search"""
+        await self.click_tab("hotels")
+        await self.hotels_city_input.clear()
+        await self.hotels_city_input.fill(city)
+        await self.waits.autocomplete(self.hotels_city_input)
+
+    async def select_hotel_checkin_date(self, days_from_today: int = 7):
+        """Select check-in date"""
+        await self.click_tab("hotels")
+        future_date = datetime.now() + timedelta(days=days_from_today)
+        date_str = future_date.strftime("%Y-%m-%d")
+        await self.hotels_checkin_date.fill(date_str)
+        await self.waits.dom_quiet("#tab-hotels")
+
+    async def select_hotel_checkout_date(self, days_from_checkin: int = 2):
+        """Select check-out date"""
+        await self.click_tab("hotels")
+        checkin_days = 7
+        checkout_days = checkin_days + days_from_checkin
+        future_date = datetime.now() + timedelta(days=checkout_days)
+        date_str = future_date.strftime("%Y-%m-%d")
+        await self.hotels_checkout_date.fill(date_str)
+        await self.waits.dom_quiet("#tab-hotels")
+
+    async def search_hotels(self, city: str, checkin_days: int = 7, checkout_days: int = 9):
+        """Complete hotel search flow"""
+        await self.fill_search_form("hotels", {
+            "city": city,
+            "checkin": date_in(checkin_days),
+            "checkout": date_in(checkout_days),
+        })
+        await self.submit_search("hotels")
+
+    async def verify_hotel_date_validation(self):
+        """Verify check-out date is after check-in date"""
+        await self.click_tab("hotels")
+        checkin_days = 7
+        checkout_days = 5  # Before check-in (invalid)
+        checkin_date = datetime.now() + timedelta(days=checkin_days)
+        checkout_date = datetime.now() + timedelta(days=checkout_days)
+        await self.hotels_checkin_date.fill(checkin_date.strftime("%Y-%m-%d"))
+        await self.hotels_checkout_date.fill(checkout_date.strftime("%Y-%m-%d"))
+        await self.waits.dom_quiet("#tab-hotels")
+        current_checkout = await self.hotels_checkout_date.input_value()
+        return current_checkout != checkout_date.strftime("%Y-%m-%d")
+
+    # TOURS SEARCH METHODS
+    async def enter_tour_destination(self, destination: str):
+        """Enter destination for tour search"""
+        await self.click_tab("tours")
+        await self.tours_city_input.clear()
+        await self.tours_city_input.fill(destination)
+        await self.waits.autocomplete(self.tours_city_input)
+
+    async def select_tour_date(self, days_from_today: int = 7):
+        """Select tour date"""
+        await self.click_tab("tours")
+        future_date = datetime.now() + timedelta(days=days_from_today)
+        date_str = future_date.strftime("%Y-%m-%d")
+        await self.tours_date.fill(date_str)
+        await self.waits.dom_quiet("#tab-tours")
+
+    async def search_tours(self, destination: str, days_from_today: int = 7):
+        """Complete tour search flow"""
+        await self.fill_search_form("tours", {"destination": destination, "date": date_in(days_from_today)})
+        await self.submit_search("tours")
+
+    # CARS SEARCH METHODS
+    async def enter_car_pickup_location(self, location: str):
+        """Enter pickup location"""
+        await self.click_tab("cars")
+        await self.cars_pickup_location.clear()
+        await self.cars_pickup_location.fill(location)
+        await self.waits.autocomplete(self.cars_pickup_location)
+
+    async def enter_car_dropoff_location(self, location: str):
+        """Enter drop-off location"""
+        await self.click_tab("cars")
+        await self.cars_dropoff_location.clear()
+        await self.cars_dropoff_location.fill(location)
+        await self.waits.autocomplete(self.cars_dropoff_location)
+
+    async def search_cars(self, pickup_location: str, dropoff_location: str = None):
+        """Complete car search flow"""
+        await self.fill_search_form("cars", {"pickup": pickup_location, "dropoff": dropoff_location or pickup_location})
+        await self.submit_search("cars")
+
+    # VISA SEARCH METHODS
+    async def enter_visa_from_country(self, country: str):
+        """Enter origin country"""
+        await self.click_tab("visa")
+        await self.visa_from_country.clear()
+        await self.visa_from_country.fill(country)
+        await self.waits.autocomplete(self.visa_from_country)
+
+    async def enter_visa_to_country(self, country: str):
+        """Enter destination country"""
+        await self.click_tab("visa")
+        await self.visa_to_country.clear()
+        await self.visa_to_country.fill(country)
+        await self.waits.autocomplete(self.visa_to_country)
+
+    async def search_visa(self, from_country: str, to_country: str):
+        """Complete visa search flow"""
+        await self.fill_search_form("visa", {"from_country": from_country, "to_country": to_country})
+        await self.submit_search("visa")
+
+    # SEARCH RESULTS VERIFICATION
+    async def verify_search_results_displayed(self):
+        """Verify search results are displayed (generic)"""
+        search_results = self.search_results
+        no_results = self.no_results
+        await self.waits.attached(search_results.or_(no_results), name="results")
+        results_count = await search_results.count()
+        if results_count > 0:
+            await self.expect_all([Check("search_results", search_results.first, "visible",
+                                         declared_selector(type(self), "search_results", first=True))])
+            return True
+        elif await no_results.count() > 0:
+            await self.expect_all([Check("no_results", no_results.first, "visible",
+                                         declared_selector(type(self), "no_results", first=True))])
+            return False
+        return False
+
+    async def get_search_results_count(self) -> int:
+        """Get count of search results"""
+        return await self.search_results.count()
@@ -1,39 +1,77 @@
-from playwright.sync_api import Page, expect
-import time
+import functools
+from playwright.sync_api import Page
+from models.async_base_page import AsyncBasePage, track_navigations
+from models.locators import declared_selector
+from utils.async_bridge import as_async, run_sync
+from utils.batch_expect import Check
+from utils.playwright_compat import require_supported
+
+
+def synced(method):
+    """Sync page-object method running the async twin's method on the sync page's event loop"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Sync locators passed in (and inside checks) become their async twins
+        args = as_async(args)
+        kwargs = {key: as_async(value) for key, value in kwargs.items()}
+        return run_sync(self.page, getattr(self.async_impl, name)(*args, **kwargs))
+
+    return wrapper
+
 
 class BasePage:
-    """Base class for all page objects with common utilities"""
-    
+    """Base class for all page objects with common utilities (sync wrapper over AsyncBasePage)"""
+
+    async_class = AsyncBasePage
+
     def __init__(self, page: Page):
+        require_supported()
         self.page = page
-        self.base_url = "https://www.phptravels.net/"
-    
-    def navigate(self, path: str = ""):
-        """Navigate to base URL or specific path"""
-        self.page.goto(self.base_url + path, wait_until="domcontentloaded", timeout=90000)
-    
-    def wait_for_load(self):
-        """Wait for page load state"""
-        self.page.wait_for_load_state("domcontentloaded")
-    
-    def scroll_to_element(self, locator):
-        """Scroll element into view"""
-        locator.scroll_into_view_if_needed()
-        time.sleep(0.5)
-    
-    def is_element_visible(self, locator, timeout: int = 5000) -> bool:
-        """Check if element is visible within timeout"""
-        try:
-            locator.wait_for(state="visible", timeout=timeout)
-            return True
-        except:
-            return False
-    
-    def wait_and_click(self, locator, timeout: int = 10000):
-        """Wait for element and click"""
-        locator.wait_for(state="visible", timeout=timeout)
-        locator.click()
-    
-    def take_screenshot(self, name: str):
-        """Take screenshot with given name"""
-        self.page.screenshot(path=f"screenshots/{name}.png")
\ No newline at end of file
+        track_navigations(page)
+        # The async page object holding the logic, driving the same browser page
+        self.async_impl = self.async_class(as_async(page))
+        run_sync(page, self.async_impl.install())
+        # ResourceMeter enforcing the context's resource policy, set by the fixtures
+        self.resources = None
+
+    @property
+    def base_url(self) -> str:
+        return self.async_impl.base_url
+
+    @base_url.setter
+    def base_url(self, value: str):
+        self.async_impl.base_url = value
+
+    @property
+    def waits(self):
+        """Wait timings of the async page object"""
+        return self.async_impl.waits
+
+    @property
+    def perf(self):
+        """Page-load metrics, one record per navigation"""
+        return self.async_impl.perf
+
+    @property
+    def navigation_count(self) -> int:
+        """Number of main-frame navigations so far; changes whenever the document is replaced"""
+        return self.async_impl.navigation_count
+
+    navigate = synced(AsyncBasePage.navigate)
+    follow_link = synced(AsyncBasePage.follow_link)
+    record_load_since = synced(AsyncBasePage.record_load_since)
+    wait_for_load = synced(AsyncBasePage.wait_for_load)
+    scroll_to_element = synced(AsyncBasePage.scroll_to_element)
+    is_element_visible = synced(AsyncBasePage.is_element_visible)
+
+    def checks(self, state: str, *names) -> list:
+        """Checks of one expected state for page-object locators, labelled by attribute name"""
+        return [Check(name, getattr(self, name), state, declared_selector(type(self), name)) for name in names]
+
+    expect_all = synced(AsyncBasePage.expect_all)
+    fill_all = synced(AsyncBasePage.fill_all)
+    wait_and_click = synced(AsyncBasePage.wait_and_click)
+    take_screenshot = synced(AsyncBasePage.take_screenshot)
+    match_baseline = synced(AsyncBasePage.match_baseline)
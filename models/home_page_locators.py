@@ -0,0 +1,126 @@
+"""
+Locators of the PHP Travels homepage, shared by the sync and async page objects.
+"""
+from models.locators import Section
+
+HEADER = Section("header")
+HERO = Section("hero")
+SEARCH_FLIGHTS = Section("search.flights")
+SEARCH_HOTELS = Section("search.hotels")
+SEARCH_TOURS = Section("search.tours")
+SEARCH_CARS = Section("search.cars")
+SEARCH_VISA = Section("search.visa")
+FEATURED_FLIGHTS = Section("featured.flights")
+FEATURED_HOTELS = Section("featured.hotels")
+FEATURED_TOURS = Section("featured.tours")
+FEATURED_CARS = Section("featured.cars")
+FOOTER = Section("footer")
+RESULTS = Section("results")
+
+
+class HomePageLocators:
+    """Declared homepage locators; built on the page object's own page (sync or async)"""
+
+    # ==================== HEADER SECTION ====================
+    header = HEADER("header", first=True)
+
+    # Logo
+    logo = HEADER("(//img[@class='logo p-1 rounded'])[1]")
+    
+    # Navigation Menu - Left
+    flights_nav = HEADER("(//a[normalize-space()='Flights'])[1]")
+    hotels_nav = HEADER("(//a[normalize-space()='Hotels'])[1]")
+    tours_nav = HEADER("(//a[normalize-space()='Tours'])[1]")
+    cars_nav = HEADER("(//a[normalize-space()='Cars'])[1]")
+    visa_nav = HEADER("(//a[normalize-space()='Visa'])[1]")
+    blogs_nav = HEADER("(//a[normalize-space()='Blogs'])[1]")
+    
+    # Navigation Menu - Right (Dropdowns) - Updated selectors
+    language_dropdown = HEADER("a.dropdown-toggle:has-text('English')")
+    currency_dropdown = HEADER("a.dropdown-toggle:has-text('USD')")
+    agents_dropdown = HEADER("a.dropdown-toggle:has-text('Agents')")
+    customer_dropdown = HEADER("a.dropdown-toggle:has-text('Customer')")
+    
+    # ==================== HERO SECTION ====================
+    banner_homepage = HERO("//div[@class='hero']")
+    home_title = HERO("h4:has-text('Your Trip Starts Here!')")
+    home_tagline = HERO("//h4/following-sibling::p", optional=True)
+    
+    # Search Tabs - Updated to use button[role='tab']
+    flights_tab = HERO("button[role='tab']:has-text('Flights')")
+    hotels_tab = HERO("button[role='tab']:has-text('Hotels')")
+    tours_tab = HERO("button[role='tab']:has-text('Tours')")
+    cars_tab = HERO("button[role='tab']:has-text('Cars')")
+    visa_tab = HERO("button[role='tab']:has-text('Visa')")
+    
+    # ==================== FLIGHTS SEARCH FORM ====================
+    flight_search_form = SEARCH_FLIGHTS("#tab-flights")
+    flight_way_select = SEARCH_FLIGHTS("#tab-flights select.flight_way", first=True, optional=True)
+    flying_from_input = SEARCH_FLIGHTS("#tab-flights input[name='from']")
+    flying_to_input = SEARCH_FLIGHTS("#tab-flights input[name='to']")
+    flight_departure_date = SEARCH_FLIGHTS("#tab-flights input#departure")
+    flight_return_date = SEARCH_FLIGHTS("#tab-flights input#return", optional=True)
+    flight_search_button = SEARCH_FLIGHTS("#tab-flights button#flights-search")
+    
+    # ==================== HOTELS SEARCH FORM ====================
+    # Input selectors may vary; date inputs and the search button are reliable
+    hotels_search_form = SEARCH_HOTELS("#tab-hotels")
+    hotels_city_input = SEARCH_HOTELS("#tab-hotels input[name='city']", optional=True)
+    hotels_checkin_date = SEARCH_HOTELS("#tab-hotels input#checkin")
+    hotels_checkout_date = SEARCH_HOTELS("#tab-hotels input#checkout")
+    hotels_search_button = SEARCH_HOTELS("#tab-hotels button.search_button")
+    
+    # ==================== TOURS SEARCH FORM ====================
+    tours_search_form = SEARCH_TOURS("#tab-tours")
+    tours_city_input = SEARCH_TOURS("#tab-tours input[name='city']", optional=True)
+    tours_date = SEARCH_TOURS("#tab-tours input#date")
+    tours_search_button = SEARCH_TOURS("#tab-tours button.search_button")
+    
+    # ==================== CARS SEARCH FORM ====================
+    cars_search_form = SEARCH_CARS("#tab-cars")
+    cars_pickup_location = SEARCH_CARS("#tab-cars input[name='pickup']", optional=True)
+    cars_dropoff_location = SEARCH_CARS("#tab-cars input[name='dropoff']", optional=True)
+    cars_search_button = SEARCH_CARS("#tab-cars button.search_button")
+    
+    # ==================== VISA SEARCH FORM ====================
+    visa_search_form = SEARCH_VISA("#tab-visa")
+    visa_from_country = SEARCH_VISA("#tab-visa input[name='from_country']", optional=True)
+    visa_to_country = SEARCH_VISA("#tab-visa input[name='nationality']", optional=True)
+    visa_search_button = SEARCH_VISA("#tab-visa button.search_button")
+    
+    # ==================== FEATURED SECTIONS ====================
+    # Featured Flights
+    feature_flights_title = FEATURED_FLIGHTS("//strong[normalize-space()='Featured Flights']")
+    feature_flights_description = FEATURED_FLIGHTS("//div[contains(@class,'section-heading text-end')]//p[contains(text(),'These alluring destinations')]", optional=True)
+    feature_flights_cards = FEATURED_FLIGHTS("(//div[contains(@class,'row g-3')])[2]")
+    
+    # Featured Hotels
+    feature_hotels_title = FEATURED_HOTELS("//strong[normalize-space()='Featured Hotels']")
+    feature_hotels_description = FEATURED_HOTELS("//div[contains(@class,'section-heading text-start')]//p[contains(text(),'These alluring destinations')]", optional=True)
+    
+    # Popular Tours
+    feature_tours_title = FEATURED_TOURS("//strong[normalize-space()='Popular Tours']")
+    feature_tours_description = FEATURED_TOURS("(//p[contains(text(),'These alluring destinations')])[3]", optional=True)
+    feature_tours_cards = FEATURED_TOURS("a.fadeout.list-group-item", optional=True)
+    image_tours_cards = FEATURED_TOURS("//div[@class='rounded-2 overflow-hidden h-100']", optional=True)
+    feature_tours_list = FEATURED_TOURS("//a[contains(@class,'fadeout')]/parent::div", first=True, optional=True)
+    
+    # Recommended Cars
+    feature_cars_title = FEATURED_CARS("//strong[normalize-space()='Recommended Transfer Cars']")
+    feature_cars_banner = FEATURED_CARS("//div[@class='shadow-sm rounded card-item p-2']", optional=True)
+    feature_cars_cards = FEATURED_CARS("//div[contains(@class,'col-md-4 mb-3')]", optional=True)
+    feature_cars_row = FEATURED_CARS("//div[contains(@class,'col-md-4 mb-3')]/parent::div", first=True, optional=True)
+    
+    # ==================== FOOTER SECTION - Updated ====================
+    footer = FOOTER("section.footer-area")
+    footer_logo = FOOTER("a.foot__logo")
+    footer_about_link = FOOTER("section.footer-area a[href*='about']")
+    footer_contact_link = FOOTER("section.footer-area a[href*='contact']")
+    newsletter_name_input = FOOTER("input.newsletter_name")
+    newsletter_email_input = FOOTER("input.newsletter_email")
+    newsletter_signup_button = FOOTER("button.subscribe")
+    footer_copyright = FOOTER("section.footer-area >> text=PHPTRAVELS")
+    
+    # ==================== SEARCH RESULTS ====================
+    search_results = RESULTS(".flight-list, .hotel-list, .tour-list, .car-list, .visa-list, .result-item", optional=True)
+    no_results = RESULTS("text=No flights found, text=No hotels found, text=No tours found, text=No results", optional=True)
@@ -0,0 +1,174 @@
+"""
+Declarative locators for page objects.
+Locators are class attributes grouped by section; each one is built on first access
+and cached on the page object, and the registry exposes their metadata to tooling:
+
+    HEADER = Section("header")
+
+    class HomePage(BasePage):
+        logo = HEADER("(//img[@class='logo p-1 rounded'])[1]")
+
+    registry(HomePage).in_section("header")
+
+Usage:
+    python -m models.locators                   # every HomePage locator as JSON
+    python -m models.locators --engine xpath    # only the XPath ones
+"""
+import argparse
+import json
+import sys
+from utils.batch_expect import ENGINE_PREFIX_RE, split_chain
+from utils.impact import symbol_name, touch
+
+
+def selector_engine(part: str) -> str:
+    """Selector engine Playwright uses for one chain part"""
+    if part.startswith(("xpath=", "//", "..", "(//")):
+        return "xpath"
+    if part.startswith("text="):
+        return "text"
+    if part.startswith("css=") or not ENGINE_PREFIX_RE.match(part):
+        return "css"
+    return part.split("=", 1)[0]
+
+
+class LocatorDef:
+    """A locator declared on a page object class, built lazily per instance"""
+
+    def __init__(self, selector: str, section: str, optional: bool = False, first: bool = False,
+                 description: str = ""):
+        self.selector = selector
+        self.section = section
+        # Optional locators may legitimately be absent (layout variants, empty sections)
+        self.optional = optional
+        self.first = first
+        self.description = description
+        self.name = None
+        self.symbol = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.symbol = symbol_name(owner.__name__, name)
+
+    def __get__(self, page_object, owner=None):
+        if page_object is None:
+            return self
+        # Every access is recorded for test impact analysis, so the cache must not shadow this descriptor
+        touch(self.symbol)
+        cache = page_object.__dict__.setdefault("_locators", {})
+        locator = cache.get(self.name)
+        if locator is None:
+            locator = cache[self.name] = self.build(page_object.page)
+        return locator
+
+    def build(self, page):
+        locator = page.locator(self.selector)
+        return locator.first if self.first else locator
+
+    @property
+    def resolved_selector(self) -> str:
+        """Selector of the built locator, as Playwright resolves it (.first is nth=0)"""
+        return f"{self.selector} >> nth=0" if self.first else self.selector
+
+    @property
+    def engines(self) -> tuple:
+        return tuple(selector_engine(part) for part in split_chain(self.selector))
+
+    @property
+    def engine(self) -> str:
+        engines = set(self.engines)
+        return engines.pop() if len(engines) == 1 else "mixed"
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "section": self.section,
+            "selector": self.selector,
+            "engine": self.engine,
+            "optional": self.optional,
+            "first": self.first,
+            "description": self.description,
+        }
+
+
+class Section:
+    """Factory for the locators of one page section"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, selector: str, **kwargs) -> LocatorDef:
+        return LocatorDef(selector, self.name, **kwargs)
+
+
+class LocatorRegistry:
+    """Locator definitions of a page object class, in declaration order"""
+
+    def __init__(self, definitions: dict):
+        self.definitions = definitions
+
+    def __iter__(self):
+        return iter(self.definitions.values())
+
+    def __len__(self):
+        return len(self.definitions)
+
+    def __getitem__(self, name: str) -> LocatorDef:
+        return self.definitions[name]
+
+    def sections(self) -> list:
+        return list(dict.fromkeys(d.section for d in self))
+
+    def in_section(self, section: str) -> list:
+        """Definitions in a section, including its sub-sections ("search" matches "search.flights")"""
+        return [d for d in self if d.section == section or d.section.startswith(section + ".")]
+
+    def by_engine(self, engine: str) -> list:
+        return [d for d in self if engine in d.engines]
+
+    def required(self) -> list:
+        return [d for d in self if not d.optional]
+
+    def describe(self) -> list:
+        return [d.as_dict() for d in self]
+
+
+def registry(page_class) -> LocatorRegistry:
+    """Registry of every locator declared on a page object class and its bases"""
+    definitions = {}
+    for klass in reversed(page_class.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, LocatorDef):
+                definitions[name] = value
+    return LocatorRegistry(definitions)
+
+
+def declared_selector(page_class, name: str, first: bool = False):
+    """Resolved selector of a locator declared on a page object class, or None if name is not declared"""
+    definition = registry(page_class).definitions.get(name)
+    if definition is None:
+        return None
+    selector = definition.resolved_selector
+    return f"{selector} >> nth=0" if first and not definition.first else selector
+
+
+def main(argv=None):
+    from models.home_page import HomePage
+    # Run with -m this module is __main__, so use the copy HomePage was declared with
+    from models.locators import registry as declared_registry
+
+    parser = argparse.ArgumentParser(description="List declared page-object locators")
+    parser.add_argument("--section", default=None)
+    parser.add_argument("--engine", default=None)
+    args = parser.parse_args(argv)
+    definitions = declared_registry(HomePage)
+    selected = definitions.in_section(args.section) if args.section else list(definitions)
+    if args.engine:
+        selected = [d for d in definitions.by_engine(args.engine) if d in selected]
+    json.dump([d.as_dict() for d in selected], sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
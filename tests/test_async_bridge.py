@@ -0,0 +1,118 @@
+"""
+Unit tests for the sync page objects wrapping the async ones (no browser required)
+"""
+import asyncio
+from pathlib import Path
+import pytest
+from playwright import async_api, sync_api
+from models.async_home_page import AsyncHomePage
+from models.home_page import HomePage
+from utils.async_bridge import as_async
+from utils import playwright_compat
+from utils.batch_expect import Check
+
+
+class FakeImpl:
+    """Stands in for a Playwright connection object"""
+    _loop = None
+    _dispatcher_fiber = None
+
+
+class FakeLocator:
+    def __init__(self, selector):
+        self.selector = selector
+
+    async def count(self):
+        return 3
+
+
+class FakePage:
+    """Drives coroutines the way a sync page does, on its own event loop"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.init_scripts = []
+        self.handlers = {}
+
+    def _sync(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def locator(self, selector):
+        return FakeLocator(selector)
+
+
+class TestPlaywrightCompat:
+    """Test cases for the Playwright internals the sync wrappers rely on"""
+
+    def test_requirements_match_the_tested_range(self):
+        low, high = playwright_compat.TESTED_VERSIONS
+        major, minor, _ = high.split(".")
+        requirements = Path(__file__).parent.parent / "requirements.txt"
+        assert f"playwright>={low.rsplit('.', 1)[0]},<{major}.{int(minor) + 1}" in requirements.read_text().split()
+
+    def test_internals_are_present(self):
+        playwright_compat.verify()
+        assert playwright_compat.UNSUPPORTED is None
+        node, cli = playwright_compat.driver_executable()
+        assert Path(node).exists() and Path(cli).exists()
+
+    def test_missing_internals_fail_loudly(self, monkeypatch):
+        monkeypatch.delattr(playwright_compat.SyncBase, "_sync")
+        with pytest.raises(ImportError, match="SyncBase._sync"):
+            playwright_compat.verify()
+
+    def test_unsupported_playwright_skips_instead_of_breaking(self, monkeypatch):
+        monkeypatch.setattr(playwright_compat, "UNSUPPORTED", "playwright 9.0 changed internals (SyncBase._sync)")
+        with pytest.raises(RuntimeError, match="SyncBase._sync"):
+            HomePage(FakePage())
+        with pytest.raises(RuntimeError):
+            playwright_compat.driver_executable()
+
+
+class TestAsyncBridge:
+    """Test cases for converting sync API objects and delegating to async page objects"""
+
+    def test_as_async_wraps_the_same_impl(self):
+        impl = FakeImpl()
+        converted = as_async(sync_api.Locator(impl))
+        assert isinstance(converted, async_api.Locator)
+        assert converted._impl_obj is impl
+
+    def test_as_async_converts_checks_and_sequences(self):
+        impl = FakeImpl()
+        check, = as_async([Check("logo", sync_api.Locator(impl), "attached")])
+        assert isinstance(check.locator, async_api.Locator)
+        assert (check.label, check.state) == ("logo", "attached")
+        assert as_async(("text", 5)) == ("text", 5)
+
+    def test_sync_page_object_delegates_to_async_twin(self):
+        page = FakePage()
+        home = HomePage(page)
+        try:
+            assert isinstance(home.async_impl, AsyncHomePage)
+            # Hooks and observers are installed once, however many page objects wrap the page
+            HomePage(page)
+            assert len(page.init_scripts) == 2
+            assert "framenavigated" in page.handlers
+            assert home.get_search_results_count() == 3
+            home.base_url = "http://localhost:8000/"
+            assert home.async_impl.base_url == "http://localhost:8000/"
+            assert home.active_tab is None and home.tab_activations == 0
+        finally:
+            page.loop.close()
+
+    def test_navigation_count_is_shared(self):
+        page = FakePage()
+        home = HomePage(page)
+        try:
+            frame = type("Frame", (), {"parent_frame": None})()
+            page.handlers["framenavigated"](frame)
+            assert home.navigation_count == home.async_impl.navigation_count == 1
+        finally:
+            page.loop.close()
@@ -0,0 +1,134 @@
+"""
+Unit tests for batched locator assertions (no browser required)
+"""
+import asyncio
+import pytest
+from utils import batch_expect as batch
+from utils.batch_expect import Check, parse_selector
+
+
+class FakeLocator:
+    """Stands in for a built locator; the batch only ever reads a check's declared selector"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_trust(monkeypatch):
+    """Each test starts with no selector confirmed or distrusted"""
+    monkeypatch.setattr(batch, "_trusted", set())
+    monkeypatch.setattr(batch, "_distrusted", set())
+
+
+class FakePage:
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+
+    async def evaluate(self, script, arg=None):
+        self.calls += 1
+        return self.results
+
+
+class TestSelectorParsing:
+    """Test cases for translating Playwright selectors into in-page engine steps"""
+
+    def test_xpath_and_css(self):
+        assert parse_selector("(//img[@class='logo p-1 rounded'])[1]") == [
+            {"kind": "xpath", "value": "(//img[@class='logo p-1 rounded'])[1]"}
+        ]
+        assert parse_selector("#tab-hotels input#checkin") == [{"kind": "css", "value": "#tab-hotels input#checkin"}]
+
+    def test_has_text_on_last_compound(self):
+        assert parse_selector("button[role='tab']:has-text('Flights')") == [
+            {"kind": "css", "value": "button[role='tab']"},
+            {"kind": "has_text", "value": "Flights", "exact": False},
+        ]
+        assert parse_selector("div:has-text('x') span") is None
+
+    def test_chains_text_and_nth(self):
+        assert parse_selector("section.footer-area >> text=PHPTRAVELS") == [
+            {"kind": "css", "value": "section.footer-area"},
+            {"kind": "text", "value": "PHPTRAVELS", "exact": False},
+        ]
+        assert parse_selector('#tab-flights select.flight_way >> nth=0')[-1] == {"kind": "nth", "value": 0}
+        assert parse_selector('text="a >> b"') == [{"kind": "text", "value": "a >> b", "exact": True}]
+
+    def test_unsupported_selectors(self):
+        assert parse_selector("internal:role=button") is None
+        assert parse_selector("a:visible") is None
+        assert parse_selector("text=/regex/i") is None
+
+
+class TestBatchExpect:
+    """Test cases for the single round-trip and the combined failure report"""
+
+    def test_passes_are_confirmed_once_then_use_one_round_trip(self, monkeypatch):
+        confirmed = []
+
+        async def fake_confirm(check, timeout):
+            confirmed.append(check.label)
+
+        monkeypatch.setattr(batch, "confirm_async", fake_confirm)
+        page = FakePage([{"ok": True, "unsupported": False, "actual": "visible"}] * 3)
+        checks = [Check(f"c{i}", FakeLocator(), selector=f"#c{i}") for i in range(3)]
+        assert asyncio.run(batch.batch_expect_async(page, checks))["confirmed"] == 3
+        assert asyncio.run(batch.batch_expect_async(page, checks)) == {"checks": 3, "batched": 3, "confirmed": 0}
+        assert confirmed == ["c0", "c1", "c2"] and page.calls == 2
+
+    def test_lenient_engine_pass_fails_and_is_never_batched_again(self, monkeypatch):
+        async def fake_confirm(check, timeout):
+            # e.g. the element is inside a shadow root the engine cannot see into
+            return "Locator expected to be hidden"
+
+        monkeypatch.setattr(batch, "confirm_async", fake_confirm)
+        page = FakePage([{"ok": True, "unsupported": False, "actual": "missing"}])
+        check = Check("menu", FakeLocator(), "hidden", "#menu")
+        with pytest.raises(AssertionError, match="menu: expected hidden, got Locator expected to be hidden"):
+            asyncio.run(batch.batch_expect_async(page, [check]))
+        batched, _, fallback = batch.plan([check])
+        assert batched == [] and fallback == [check]
+
+    def test_only_failures_are_confirmed_and_reported_together(self, monkeypatch):
+        confirmed = []
+
+        async def fake_confirm(check, timeout):
+            confirmed.append((check.label, timeout))
+            return None if check.label == "flaky" else "Locator expected to be visible"
+
+        monkeypatch.setattr(batch, "confirm_async", fake_confirm)
+        batch.record_agreement("#logo", "visible", True)
+        page = FakePage([
+            {"ok": True, "unsupported": False, "actual": "visible"},
+            {"ok": False, "unsupported": False, "actual": "hidden"},
+            {"ok": False, "unsupported": False, "actual": "missing"},
+        ])
+        checks = [
+            Check("logo", FakeLocator(), selector="#logo"),
+            Check("flaky", FakeLocator(), selector="#flaky"),
+            Check("button", FakeLocator(), "attached", "#button"),
+            Check("custom", FakeLocator(), selector="internal:role=button"),
+            Check("built", FakeLocator()),
+        ]
+        with pytest.raises(AssertionError) as error:
+            asyncio.run(batch.batch_expect_async(page, checks))
+        # Unsupported and undeclared selectors get expect()'s full timeout
+        assert [label for label, _ in confirmed] == ["flaky", "button", "custom", "built"]
+        assert dict(confirmed)["flaky"] == batch.CONFIRM_TIMEOUT
+        assert dict(confirmed)["built"] == batch.DEFAULT_TIMEOUT
+        message = str(error.value)
+        assert message.startswith("3 of 5 checks failed:")
+        assert "button: expected attached, got missing" in message
+        assert "custom: expected visible, got Locator expected to be visible" in message
+        assert "flaky" not in message
+
+    def test_unknown_state_is_rejected(self):
+        with pytest.raises(ValueError):
+            Check("logo", FakeLocator(), "shiny", "#logo")
+
+    def test_locators_are_never_inspected(self):
+        page = FakePage([])
+        locator = FakeLocator()
+        # Looks like a Playwright locator's internals, but no selector was declared
+        locator._selector = "#logo"
+        batched, specs, fallback = batch.plan([Check("logo", locator)])
+        assert (batched, specs) == ([], []) and fallback[0].label == "logo"
+        assert page.calls == 0
@@ -0,0 +1,63 @@
+"""
+Unit tests for the persistent browser server lifecycle (no browser required)
+"""
+import pytest
+from utils import browser_server
+from utils.browser_server import BrowserServer, pid_alive, tree_rss_mb
+
+# Stands in for chromium.launchServer(): listens like the server and reports its endpoint
+FAKE_SERVER = """
+const net = require("net");
+const server = net.createServer(socket => socket.end()).listen(0, "127.0.0.1", () => {
+  const port = server.address().port;
+  process.stdout.write(JSON.stringify({ ws_endpoint: `ws://127.0.0.1:${port}/fake`, browser_pid: process.pid }) + "\\n");
+});
+process.on("SIGTERM", () => process.exit(0));
+"""
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(browser_server, "SERVER_SCRIPT", FAKE_SERVER)
+    server = BrowserServer(str(tmp_path / "server.json"), headless=True, max_runs=3, max_mb=100_000)
+    yield server
+    server.stop()
+
+
+class TestBrowserServer:
+    """Test cases for starting, reusing and recycling the browser server"""
+
+    def test_reused_then_recycled_after_max_runs(self, server):
+        first = server.ensure()
+        assert first.startswith("ws://127.0.0.1:") and server.status == "started (not running)"
+        assert server.ensure() == first and server.status.startswith("reused (run 2 of 3")
+        assert server.ensure() == first
+        pid = server.load()["pid"]
+        assert server.ensure() != first and server.status == "started (3 runs)"
+        assert not pid_alive(pid)
+        assert server.load()["runs"] == 1
+
+    def test_dead_server_is_replaced(self, server):
+        server.ensure()
+        state = server.load()
+        server.stop(dict(state))
+        server.save(state)
+        assert server.restart_reason(state) == "unhealthy"
+        assert server.ensure() != state["ws_endpoint"] and server.status == "started (unhealthy)"
+
+    def test_restart_reasons(self, server):
+        server.ensure()
+        state = server.load()
+        assert server.restart_reason(state) is None
+        assert server.restart_reason(state, memory_mb=200_000) == "200000 MiB used"
+        assert server.restart_reason({**state, "headless": False}) == "headless setting changed"
+        assert server.restart_reason({**state, "playwright": "0.0"}) == "playwright upgraded"
+        assert server.restart_reason({}) == "not running"
+        memory = tree_rss_mb(state["browser_pid"])
+        assert memory is None or memory > 0
+
+    def test_unavailable_server_falls_back(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(browser_server, "SERVER_SCRIPT", "process.exit(1)")
+        server = BrowserServer(str(tmp_path / "server.json"))
+        assert server.ensure() is None
+        assert server.status.startswith("unavailable")
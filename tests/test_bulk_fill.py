@@ -0,0 +1,135 @@
+"""
+Unit tests for single round-trip form filling (no browser required)
+"""
+import asyncio
+import pytest
+from utils import batch_expect
+from utils.bulk_fill import Fill, bulk_fill
+
+
+@pytest.fixture(autouse=True)
+def fresh_trust(monkeypatch):
+    """Each test starts with no selector confirmed or distrusted"""
+    monkeypatch.setattr(batch_expect, "_trusted", set())
+    monkeypatch.setattr(batch_expect, "_distrusted", set())
+
+
+class FakeLocator:
+    """Async locator recording the per-field calls; sticky=False drops filled values like a strict widget"""
+
+    def __init__(self, selector, tag="input", count=1, sticky=True):
+        self.selector = selector
+        self.tag = tag
+        self.elements = count
+        self.sticky = sticky
+        self.value = ""
+        self.calls = []
+
+    async def evaluate(self, script):
+        self.calls.append("evaluate")
+        return self.tag.upper()
+
+    async def count(self):
+        return self.elements
+
+    async def clear(self):
+        self.calls.append("clear")
+        self.value = ""
+
+    async def fill(self, value):
+        self.calls.append("fill")
+        self.value = value if self.sticky else ""
+
+    async def press_sequentially(self, value):
+        self.calls.append("type")
+        self.value = value
+
+    async def select_option(self, value):
+        self.calls.append("select")
+        return ["round"]
+
+    async def input_value(self):
+        return self.value
+
+
+class FakePage:
+    """Returns canned in-page results; fields set "ok" also land on the locators in elements"""
+
+    def __init__(self, results, elements=()):
+        self.results = results
+        self.elements = {locator.selector: locator for locator in elements}
+        self.specs = []
+
+    async def evaluate(self, script, specs):
+        self.specs.append(specs)
+        for spec, result in zip(specs, self.results):
+            element = self.elements.get(spec["steps"][0]["value"])
+            if element is not None and result["status"] == "ok":
+                element.value = result["actual"]
+        return self.results
+
+
+def field(label, locator, value, **kwargs):
+    """Fill of a field declared with the locator's selector"""
+    return Fill(label, locator, value, selector=locator.selector, **kwargs)
+
+
+def ok(value):
+    return {"status": "ok", "actual": value, "tag": "input"}
+
+
+class TestBulkFill:
+    """Test cases for the one-pass fill and its per-field fallback"""
+
+    def test_all_fields_set_in_one_round_trip(self):
+        fills = [field("origin", FakeLocator("#from"), "New York"), field("destination", FakeLocator("#to"), "London"),
+                 field("departure", FakeLocator("#departure"), "2026-10-25")]
+        page = FakePage([ok("New York"), ok("London"), ok("2026-10-25")], [fill.locator for fill in fills])
+        result = asyncio.run(bulk_fill(page, fills))
+        assert len(page.specs) == 1
+        assert page.specs[0][0] == {"steps": [{"kind": "css", "value": "#from"}], "value": "New York"}
+        assert result == {"fields": 3, "batched": 3, "one_by_one": 0,
+                          "values": {"origin": "New York", "destination": "London", "departure": "2026-10-25"}}
+        assert all(not fill.locator.calls for fill in fills)
+
+    def test_fallback_fills_field_by_field(self):
+        mismatch = FakeLocator("#to")
+        typed = FakeLocator("#from")
+        custom = FakeLocator("internal:role=combobox", tag="select")
+        absent = FakeLocator("#return", count=0)
+        page = FakePage([{"status": "mismatch", "actual": "", "tag": "input"}, {"status": "missing", "actual": None}])
+        result = asyncio.run(bulk_fill(page, [
+            field("origin", typed, "Paris", typed=True),
+            field("destination", mismatch, "Rome"),
+            field("flight_type", custom, "Round Trip"),
+            field("return", absent, "2026-11-01", optional=True),
+        ]))
+        # Typed and engine-unsupported fields never go to the page; the optional absent one is skipped
+        assert [spec["value"] for spec in page.specs[0]] == ["Rome", "2026-11-01"]
+        assert typed.calls == ["clear", "type"]
+        assert mismatch.calls == ["fill"]
+        assert custom.calls == ["evaluate", "select"]
+        assert absent.calls == []
+        assert result["values"] == {"origin": "Paris", "destination": "Rome", "flight_type": "round"}
+        assert result["one_by_one"] == 3
+
+    def test_values_that_do_not_stick_are_reported_together(self):
+        page = FakePage([{"status": "mismatch", "actual": "", "tag": "input"}, ok("x"),
+                         {"status": "missing", "actual": None}])
+        with pytest.raises(AssertionError) as error:
+            asyncio.run(bulk_fill(page, [
+                field("checkin", FakeLocator("#checkin", sticky=False), "2026-10-25"),
+                field("city", FakeLocator("#city"), "x"),
+                field("checkout", FakeLocator("#checkout", sticky=False), "2026-10-27"),
+            ]))
+        message = str(error.value)
+        assert message.startswith("2 of 3 fields not filled:")
+        assert "checkin: expected '2026-10-25', got ''" in message
+
+    def test_field_the_engine_resolved_differently_is_filled_by_playwright(self):
+        # The engine set an element Playwright does not match, e.g. a lookalike outside a shadow root
+        city = FakeLocator("#city")
+        page = FakePage([ok("Rome")])
+        result = asyncio.run(bulk_fill(page, [field("city", city, "Rome")]))
+        assert city.calls == ["evaluate", "fill"] and result["one_by_one"] == 1
+        assert asyncio.run(bulk_fill(page, [field("city", city, "Rome")]))["batched"] == 0
@@ -6,6 +6,7 @@ URL_WEB = "https://www.phptravels.net/"
 
 
 # ==================== NAVIGATION TESTS ====================
+@pytest.mark.readonly
 class TestNavigationMenu:
     """Test cases for navigation menu"""
     
@@ -48,6 +49,7 @@ class TestNavigationMenu:
 
 
 # ==================== HERO SECTION TESTS ====================
+@pytest.mark.readonly
 class TestHeroSection:
     """Test cases for hero section"""
     
@@ -0,0 +1,118 @@
+"""
+Unit tests for the warm context pool (no browser required)
+"""
+from playwright.sync_api import Error
+from utils.context_pool import ContextPool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.viewport_size = {"width": 1920, "height": 1080}
+        self.fail_reset = False
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def evaluate(self, script):
+        if self.fail_reset:
+            raise Error("Target crashed")
+
+    def unroute_all(self, behavior=None):
+        pass
+
+    def goto(self, url):
+        self.url = url
+
+    def set_viewport_size(self, viewport):
+        self.viewport_size = viewport
+
+    def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.cookies_cleared = 0
+        self.pages = []
+
+    def on(self, event, handler):
+        pass
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def unroute_all(self, behavior=None):
+        pass
+
+    def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    def clear_permissions(self):
+        pass
+
+    def set_extra_http_headers(self, headers):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+class TestContextPool:
+    """Test cases for context leasing, reset and eviction"""
+
+    def test_contexts_are_created_up_front(self):
+        browser = FakeBrowser()
+        ContextPool(browser, size=3)
+        assert len(browser.contexts) == 3
+
+    def test_released_context_is_reused(self):
+        pool = ContextPool(FakeBrowser(), size=1)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+        assert second is first
+        assert pool.stats.hits == 2
+        assert first.context.cookies_cleared == 1
+        assert pool.stats.summary()["resets"] == 1
+
+    def test_empty_pool_counts_a_miss(self):
+        pool = ContextPool(FakeBrowser(), size=1)
+        pool.acquire()
+        pool.acquire()
+        assert pool.stats.hits == 1
+        assert pool.stats.misses == 1
+
+    def test_broken_context_is_evicted_and_replaced(self):
+        browser = FakeBrowser()
+        pool = ContextPool(browser, size=1)
+        pooled = pool.acquire()
+        pooled.page.fail_reset = True
+        pool.release(pooled)
+        assert pooled.context.closed
+        assert pool.stats.evictions == 1
+        replacement = pool.acquire()
+        assert replacement is not pooled
+        assert pool.stats.hits == 2
+
+    def test_crashed_page_marks_context_broken(self):
+        pool = ContextPool(FakeBrowser(), size=1)
+        pooled = pool.acquire()
+        for handler in pooled.page.handlers["crash"]:
+            handler(pooled.page)
+        pool.release(pooled)
+        assert pool.stats.evictions == 1
@@ -0,0 +1,100 @@
+"""
+Unit tests for the failure-only trace, screencast and DOM capture (no browser required)
+"""
+import gzip
+import pytest
+from utils.failure_capture import FailureRecorder, FailureStore, FrameRing, directory_name, parse_artifacts
+
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **options):
+        self.calls.append(("start", options))
+
+    def start_chunk(self):
+        self.calls.append(("start_chunk",))
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+        if path is not None:
+            path.write_bytes(b"trace")
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    def is_closed(self):
+        return False
+
+    def content(self):
+        return "<html><body>failed</body></html>"
+
+
+class TestFailureCapture:
+    """Test cases for the rolling capture kept only for failing tests"""
+
+    def test_parse_artifacts(self):
+        assert parse_artifacts("trace, dom") == ("trace", "dom")
+        assert parse_artifacts("none") == ()
+        with pytest.raises(ValueError):
+            parse_artifacts("trace,har")
+
+    def test_frame_ring_keeps_last_window(self):
+        ring = FrameRing(window=2.0, max_frames=100)
+        for second in range(10):
+            ring.push(b"f%d" % second, float(second))
+        assert len(ring) == 3
+        assert ring.mjpeg() == b"f7f8f9"
+        capped = FrameRing(window=60.0, max_frames=4)
+        for second in range(10):
+            capped.push(b"x", float(second))
+        assert len(capped) == 4
+
+    def test_passing_tests_write_nothing(self, tmp_path):
+        recorder = FailureRecorder(FailureStore(str(tmp_path)), ("trace", "dom"))
+        context = FakeContext()
+        page = FakePage(context)
+        for _ in range(3):
+            recorder.start(page)
+            assert recorder.finish("tests/test_a.py::test_ok", page, failed=False) is None
+        # Tracing is started once per context, each test is a discarded chunk
+        assert [c[0] for c in context.tracing.calls].count("start") == 1
+        assert context.tracing.calls[-1] == ("stop_chunk", None)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failure_writes_trace_and_dom(self, tmp_path):
+        recorder = FailureRecorder(FailureStore(str(tmp_path)), ("trace", "dom"))
+        page = FakePage(FakeContext())
+        recorder.start(page)
+        target = recorder.finish("tests/test_a.py::TestX::test_fails[param]", page, failed=True)
+        assert target.parent == tmp_path
+        assert target.name.endswith("tests_test_a.py_TestX_test_fails_param")
+        assert (target / "trace.zip").read_bytes() == b"trace"
+        assert gzip.decompress((target / "dom.html.gz").read_bytes()) == b"<html><body>failed</body></html>"
+        assert recorder.store.stats["saved"] == 1
+
+    def test_oldest_failures_evicted(self, tmp_path):
+        store = FailureStore(str(tmp_path), max_bytes=2500)
+        entries = []
+        for index in range(4):
+            entry = tmp_path / directory_name(f"test_{index}", 1_700_000_000 + index)
+            entry.mkdir()
+            (entry / "trace.zip").write_bytes(b"x" * 1000)
+            store.saved(entry)
+            entries.append(entry)
+        assert store.entries() == entries[2:]
+        assert store.stats["evicted"] == 2
+        # A single failure above the limit is still kept
+        big = tmp_path / directory_name("test_big", 1_700_000_100)
+        big.mkdir()
+        (big / "trace.zip").write_bytes(b"x" * 5000)
+        store.saved(big)
+        assert store.entries() == [big]
@@ -0,0 +1,74 @@
+"""
+Unit tests for the flake tracker and quarantine (no browser required)
+"""
+from utils.flakes import FlakeStore, flakiness, select_lane
+
+
+class FakeItem:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+def passed(retries=0):
+    return {"outcome": "passed", "duration": 1.0, "retries": retries}
+
+
+def failed():
+    return {"outcome": "failed", "duration": 2.0, "retries": 0}
+
+
+class TestFlakes:
+    """Test cases for flakiness scoring, quarantine and lanes"""
+
+    def test_flakiness(self):
+        assert flakiness([("passed", 0)] * 10) == 0.0
+        assert flakiness([("failed", 0)] * 10) == 0.0
+        # Too little history to judge
+        assert flakiness([("passed", 0), ("failed", 0)]) is None
+        # Two recoveries (fail then pass) over five transitions
+        assert flakiness([("passed", 0), ("failed", 0)] * 3) == 0.4
+        # Passing only after a retry counts as a recovery; skips are ignored
+        history = [("passed", 0)] * 3 + [("passed", 2), ("skipped", 0), ("passed", 1)]
+        assert flakiness(history) == 0.5
+        # A single recovery is not enough to call a test flaky
+        assert flakiness([("passed", 0)] * 4 + [("failed", 0), ("passed", 0)]) == 0.0
+
+    def test_regression_is_not_quarantined(self, tmp_path):
+        store = FlakeStore(str(tmp_path / "flakes.db"))
+        history = [passed()] * 4 + [failed()] * 20
+        for result in history:
+            changes = store.record_run({"t::broken": result})
+            assert changes["quarantined"] == []
+        assert flakiness(store.history("t::broken")) == 0.0
+        assert store.quarantined() == {}
+        store.close()
+
+    def test_flipping_test_is_quarantined_and_released(self, tmp_path):
+        store = FlakeStore(str(tmp_path / "flakes.db"))
+        outcomes = [passed(), failed(), passed(), failed(), passed()]
+        changes = []
+        for result in outcomes:
+            changes.append(store.record_run({"t::pagination": result, "t::logo": passed()}))
+        assert changes[-1]["quarantined"] == ["t::pagination"]
+        assert list(store.quarantined()) == ["t::pagination"]
+        # A long stable streak pushes the flips out of the window
+        for _ in range(30):
+            last = store.record_run({"t::pagination": passed()})
+            if last["released"]:
+                break
+        assert last["released"] == ["t::pagination"]
+        assert store.quarantined() == {}
+        report = store.report()
+        assert {row["nodeid"] for row in report} == {"t::pagination", "t::logo"}
+        assert report[0]["nodeid"] == "t::pagination"
+        store.close()
+
+    def test_lanes(self):
+        items = [FakeItem("t::stable"), FakeItem("t::flaky")]
+        quarantined = {"t::flaky": 0.4}
+        assert select_lane(items, quarantined, "all") == (items, [])
+        selected, deselected = select_lane(items, quarantined, "stable")
+        assert [i.nodeid for i in selected] == ["t::stable"]
+        assert [i.nodeid for i in deselected] == ["t::flaky"]
+        selected, _ = select_lane(items, quarantined, "quarantine")
+        assert [i.nodeid for i in selected] == ["t::flaky"]
@@ -0,0 +1,94 @@
+"""
+Unit tests for HAR archive naming and replay fallbacks (no browser required)
+"""
+import base64
+import json
+from utils.har import HarArchive, har_name
+
+
+def write_har(path, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"log": {"entries": entries}}), encoding="utf-8")
+
+
+def har_entry(url, body, status=200, encoding=None):
+    content = {"text": body, "mimeType": "text/html"}
+    if encoding:
+        content["encoding"] = encoding
+    return {
+        "request": {"method": "GET", "url": url},
+        "response": {
+            "status": status,
+            "headers": [
+                {"name": "Content-Type", "value": "text/html"},
+                {"name": "Content-Length", "value": "999"},
+            ],
+            "content": content,
+        },
+    }
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="document", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.action = None
+        self.kwargs = None
+
+    def fulfill(self, **kwargs):
+        self.action, self.kwargs = "fulfill", kwargs
+
+    def abort(self):
+        self.action = "abort"
+
+    def fallback(self):
+        self.action = "fallback"
+
+
+class TestHarArchive:
+    """Test cases for archive paths and unmatched-request handling"""
+
+    def test_archive_path_per_test(self, tmp_path):
+        archive = HarArchive(tmp_path, mode="record")
+        path = archive.path_for("tests/test_search_functionality.py::TestFlightsSearch::test_flights_pagination[chromium]")
+        assert path.parent.name == "test_search_functionality"
+        assert path.name == "TestFlightsSearch_test_flights_pagination_chromium.har"
+        assert har_name("tests/test_a.py::test_b") == "test_b"
+
+    def test_unmatched_url_served_from_any_archive_ignoring_query(self, tmp_path):
+        write_har(tmp_path / "test_x" / "a.har", [
+            har_entry("https://www.phptravels.net/flights/search?date=2024-01-01", "<p>results</p>"),
+        ])
+        archive = HarArchive(tmp_path, mode="replay")
+        route = FakeRoute(FakeRequest("https://www.phptravels.net/flights/search?date=2030-05-05"))
+        archive._handle_unmatched(route)
+        assert route.action == "fulfill"
+        assert route.kwargs["body"] == b"<p>results</p>"
+        assert "Content-Length" not in route.kwargs["headers"]
+        assert archive.stats["fallback_hits"] == 1
+
+    def test_base64_bodies_are_decoded(self, tmp_path):
+        payload = base64.b64encode(b"\x89PNG").decode()
+        write_har(tmp_path / "a.har", [har_entry("https://www.phptravels.net/logo.png", payload, encoding="base64")])
+        archive = HarArchive(tmp_path, mode="replay")
+        route = FakeRoute(FakeRequest("https://www.phptravels.net/logo.png", "image"))
+        archive._handle_unmatched(route)
+        assert route.kwargs["body"] == b"\x89PNG"
+
+    def test_fallback_policies(self, tmp_path):
+        url = "https://cdn.example.com/app.js"
+        stub = FakeRoute(FakeRequest(url, "script"))
+        HarArchive(tmp_path, mode="replay", fallback="stub")._handle_unmatched(stub)
+        assert stub.action == "fulfill" and stub.kwargs["status"] == 200
+        aborted = FakeRoute(FakeRequest(url, "script"))
+        HarArchive(tmp_path, mode="replay", fallback="abort")._handle_unmatched(aborted)
+        assert aborted.action == "abort"
+        live = FakeRoute(FakeRequest(url, "script"))
+        HarArchive(tmp_path, mode="replay", fallback="network")._handle_unmatched(live)
+        assert live.action == "fallback"
@@ -0,0 +1,118 @@
+"""
+Unit tests for test impact analysis (no browser required)
+"""
+from models.home_page import HomePage
+from utils import impact
+from utils.impact import (
+    EVERYTHING, ImpactRecorder, changed_lines, load_map, select_affected, symbols_for_lines,
+)
+
+SOURCE = '''from models.locators import Section
+
+HEADER = Section("header")
+
+
+class AsyncHomePage(HomePageLocators, AsyncBasePage):
+    """Page Object"""
+
+    logo = HEADER("//img")
+
+    # Search tabs
+    async def click_tab(self, name):
+        await self.tabs[name].click()
+
+    @property
+    def active_tab(self):
+        return self._active_tab
+
+    def __init__(self, page):
+        self._active_tab = None
+
+
+class LocatorDef:
+    def build(self, page):
+        return page.locator(self.selector)
+'''
+
+DIFF = """diff --git a/models/home_page.py b/models/home_page.py
+index 1111111..2222222 100644
+--- a/models/home_page.py
++++ b/models/home_page.py
+@@ -9 +9 @@ class AsyncHomePage(HomePageLocators, AsyncBasePage):
+-    logo = HEADER("//img[1]")
++    logo = HEADER("//img")
+@@ -20,0 +21,2 @@ class AsyncHomePage(HomePageLocators, AsyncBasePage):
++    def reset(self):
++        pass
+"""
+
+
+class FakeItem:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+class FakePage:
+    def locator(self, selector):
+        return selector
+
+
+class TestImpact:
+    """Test cases for recording touched symbols and selecting affected tests"""
+
+    def test_changed_lines(self):
+        changes = changed_lines(DIFF)
+        assert changes == {"models/home_page.py": ({9}, {9, 21, 22})}
+
+    def test_symbols_for_lines(self):
+        assert symbols_for_lines(SOURCE, {9}) == {"HomePage.logo"}
+        # Decorators belong to the member they decorate
+        assert symbols_for_lines(SOURCE, {13}) == {"HomePage.click_tab"}
+        assert symbols_for_lines(SOURCE, {7}) == {"HomePage.*"}
+        assert symbols_for_lines(SOURCE, {3}) == {EVERYTHING}
+        # Blank and comment-only lines change nothing
+        assert symbols_for_lines(SOURCE, {2, 11}) == set()
+
+    def test_unrecorded_members_select_their_whole_class(self):
+        # Properties and constructors are never touch()ed, so they stand for the whole class
+        assert symbols_for_lines(SOURCE, {17, 20}) == {"HomePage.*"}
+        impact_map = {"t::tabs": ["HomePage.click_tab"], "t::logo": ["HomePageLocators.logo"]}
+        affected, _ = select_affected(sorted(impact_map), impact_map, symbols_for_lines(SOURCE, {20}))
+        assert affected == ["t::tabs"]
+        # A class none of whose members is ever recorded selects everything
+        assert symbols_for_lines(SOURCE, {25}) == {EVERYTHING}
+
+    def test_select_affected(self):
+        impact_map = {
+            "t::logo": ["HomePageLocators.logo", "BasePage.navigate"],
+            "t::tabs": ["HomePage.click_tab"],
+        }
+        nodeids = ["t::logo", "t::tabs", "t::new"]
+        assert select_affected(nodeids, impact_map, {"HomePage.click_tab"}) == (["t::tabs", "t::new"], ["t::logo"])
+        assert select_affected(nodeids, impact_map, {"BasePage.*"})[0] == ["t::logo", "t::new"]
+        assert select_affected(nodeids, impact_map, {EVERYTHING})[0] == nodeids
+        assert select_affected(nodeids, impact_map, set())[0] == ["t::new"]
+
+    def test_recorder_tracks_locators_per_test(self, tmp_path):
+        path = tmp_path / "impact.json"
+        path.write_text('{"t::flaky": ["HomePage.search_flights"]}', encoding="utf-8")
+        recorder = ImpactRecorder(str(path))
+        home = HomePage.__new__(HomePage)
+        home.page = FakePage()
+        saved = impact._touched
+        try:
+            for nodeid, failed in (("t::logo", False), ("t::flaky", True), ("t::broken", True)):
+                hook = recorder.pytest_runtest_protocol(FakeItem(nodeid), None)
+                next(hook)
+                home.logo
+                if failed:
+                    recorder.pytest_runtest_logreport(type("Report", (), {"failed": True, "nodeid": nodeid})())
+                next(hook, None)
+        finally:
+            impact._touched = saved
+        recorder.pytest_sessionfinish(None)
+        # A failing test with no earlier entry stays out of the map, so it is always selected
+        assert load_map(str(path)) == {
+            "t::flaky": ["HomePage.search_flights", "HomePageLocators.logo"],
+            "t::logo": ["HomePageLocators.logo"],
+        }
@@ -0,0 +1,84 @@
+"""
+Unit tests for the concurrent link crawler (no browser required)
+"""
+import asyncio
+import time
+from utils.link_crawler import LinkChecker, RateLimiter, check_site, extract_links, normalize
+from utils.local_site import LocalSite, LocalSiteConfig
+
+
+class FakeResponse:
+    def __init__(self, url, status, headers=None):
+        self.url = url
+        self.status = status
+        self.ok = status < 400
+        self.headers = headers or {}
+
+    async def text(self):
+        return ""
+
+    async def dispose(self):
+        pass
+
+
+class FakeRequestContext:
+    """Rejects HEAD like some servers do, and redirects /old to /new"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, url, method=None, **options):
+        self.calls.append((method, url))
+        if method == "HEAD":
+            return FakeResponse(url, 405)
+        if url.endswith("/old"):
+            return FakeResponse(url, 301, {"location": "/new"})
+        return FakeResponse(url, 200)
+
+    async def dispose(self):
+        pass
+
+
+class TestLinkCrawler:
+    """Test cases for link extraction, checking and site crawls"""
+
+    def test_extract_links(self):
+        html = ('<a href="/flights">F</a><a href="/flights#top">F</a><a href="hotels?x=1">H</a>'
+                '<a href="#form">skip</a><a href="mailto:a@b.c">skip</a><a href="HTTPS://Other.test">ext</a>')
+        assert extract_links(html, "http://site.test/en/") == [
+            "http://site.test/flights", "http://site.test/en/hotels?x=1", "https://other.test/",
+        ]
+        assert extract_links('<base href="/base/"><a href="page">p</a>', "http://site.test/x") == ["http://site.test/base/page"]
+        assert normalize("javascript:void(0)", "http://site.test/") is None
+
+    def test_head_falls_back_to_get_and_follows_redirects(self):
+        async def run():
+            checker = LinkChecker(playwright=None, contexts=1, rate=0)
+            checker.contexts = [FakeRequestContext()]
+            return await checker.check("http://site.test/old"), checker.contexts[0].calls
+
+        result, calls = asyncio.run(run())
+        assert result["status"] == 200 and result["method"] == "GET"
+        assert result["redirects"] == [[301, "http://site.test/old"]]
+        assert result["final_url"] == "http://site.test/new"
+        assert calls[0] == ("HEAD", "http://site.test/old")
+
+    def test_rate_limiter_spaces_requests(self):
+        async def run():
+            limiter = RateLimiter(per_second=100)
+            started = time.perf_counter()
+            await asyncio.gather(*(limiter.wait() for _ in range(6)))
+            return time.perf_counter() - started
+
+        assert asyncio.run(run()) >= 0.045
+
+    def test_crawl_local_site(self):
+        with LocalSite(config=LocalSiteConfig(catalog_size=50)) as site:
+            summary = check_site(site.url, [site.url + "home", site.url + "missing"], depth=3, rate=0)
+        # Landing pages, 5 x 50 detail and 5 x 50 booking pages, each checked once
+        assert 500 < summary["checked"] < 520
+        assert summary["skipped"] == 2
+        assert [r["url"] for r in summary["broken"]] == [site.url + "missing"]
+        assert summary["broken"][0]["found_on"] == []
+        redirect, = summary["redirects"]
+        assert redirect["redirects"] == [[302, site.url + "home"]] and redirect["final_url"] == site.url
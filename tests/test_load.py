@@ -0,0 +1,109 @@
+"""
+Unit tests for the load generator's schedules and statistics (no browser required)
+"""
+import asyncio
+import random
+import pytest
+from playwright.async_api import Error
+from utils.load import (
+    LoadConfig, LoadStats, VirtualUser, arrival_schedule, parse_scenario, parse_think_time,
+    ramp_schedule, search_hotels,
+)
+from utils.stats import percentile
+
+
+class FakeHome:
+    """Records the page-object calls a scenario makes"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    async def navigate(self):
+        self.calls.append(("navigate",))
+
+    async def search_hotels(self, city, checkin_days, checkout_days):
+        self.calls.append(("search_hotels", city, checkin_days, checkout_days))
+        if self.error:
+            raise self.error
+
+
+class TestSchedules:
+    """Test cases for ramp-up and arrival-rate schedules"""
+
+    def test_ramp_up_spreads_users_evenly(self):
+        assert ramp_schedule(4, 10) == [0, 2.5, 5.0, 7.5]
+        assert ramp_schedule(0, 10) == []
+
+    def test_poisson_arrivals_match_the_rate(self):
+        offsets = arrival_schedule(5, 200, random.Random(1))
+        assert offsets == sorted(offsets) and offsets[-1] < 200
+        assert 900 < len(offsets) < 1100
+
+    def test_cli_values(self):
+        assert parse_think_time("1-3") == (1.0, 3.0)
+        assert parse_think_time("2") == (2.0, 2.0)
+        assert parse_scenario("flights=2") == ("flights", 2.0)
+        with pytest.raises(Exception):
+            parse_scenario("cruises")
+
+
+class TestLoadStats:
+    """Test cases for percentiles, throughput and the error timeline"""
+
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) is None
+
+    def test_summary_and_timeline(self):
+        stats = LoadStats(bucket_s=5)
+        for i in range(10):
+            stats.record(i, "search_flights", 100 + i, None if i < 8 else "TimeoutError")
+        stats.active += [(0, 1), (4, 3), (6, 2)]
+        summary = stats.summary(duration_s=10)
+        assert summary["search_flights"]["count"] == 10
+        assert summary["all"]["error_rate"] == 0.2
+        assert summary["all"]["throughput_per_s"] == 1.0
+        assert summary["search_flights"]["p50_ms"] == 103
+        first, second = stats.timeline(duration_s=10)
+        assert (first["requests"], first["errors"], first["active_users"]) == (5, 0, 3)
+        assert (second["errors"], second["error_rate"]) == (2, 0.4)
+        assert stats.error_counts() == {"TimeoutError": 2}
+
+    def test_failed_transaction_is_recorded(self):
+        stats = LoadStats()
+        vu = VirtualUser(0, None, "http://127.0.0.1/", LoadConfig(seed=1), stats, started=0)
+
+        async def failing():
+            async with vu.transaction("home"):
+                raise Error("net::ERR_CONNECTION_REFUSED\nmore")
+
+        with pytest.raises(Error):
+            asyncio.run(failing())
+        assert stats.samples[0][1] == "home"
+        assert stats.samples[0][3] == "Error: net::ERR_CONNECTION_REFUSED"
+
+
+class TestScenarios:
+    """Test cases for scenarios replaying the page-object search flows"""
+
+    def test_scenario_times_each_page_object_call(self):
+        stats = LoadStats()
+        vu = VirtualUser(0, None, "http://127.0.0.1/", LoadConfig(seed=1), stats, started=0)
+        vu.home = FakeHome()
+        asyncio.run(search_hotels(vu))
+        (_,), (name, _, checkin, checkout) = vu.home.calls
+        assert name == "search_hotels" and checkout > checkin
+        assert [s[1] for s in stats.samples] == ["home", "search_hotels"]
+        assert all(s[3] is None for s in stats.samples)
+
+    def test_field_that_did_not_stick_fails_the_transaction(self):
+        stats = LoadStats()
+        vu = VirtualUser(0, None, "http://127.0.0.1/", LoadConfig(seed=1), stats, started=0)
+        vu.home = FakeHome(error=AssertionError("1 of 3 fields not filled:\n  - city"))
+        with pytest.raises(AssertionError):
+            asyncio.run(search_hotels(vu))
+        _, name, _, error = stats.samples[-1]
+        assert (name, error) == ("search_hotels", "AssertionError: 1 of 3 fields not filled:")
@@ -0,0 +1,81 @@
+"""
+HTTP-level tests for the local PHPTravels stand-in (no browser required)
+"""
+import json
+import time
+import urllib.error
+import urllib.request
+import pytest
+from utils.local_site import LocalSite, LocalSiteConfig
+
+
+def fetch(url, data=None):
+    request = urllib.request.Request(url, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.read().decode("utf-8"), response.geturl()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read().decode("utf-8"), url
+
+
+@pytest.fixture
+def site():
+    with LocalSite(config=LocalSiteConfig(results={"flights": 25, "hotels": 0})) as site:
+        yield site
+
+
+class TestLocalSite:
+    """Test cases for the stand-in pages and search backends"""
+
+    def test_homepage_has_search_panels(self, site):
+        status, body, _ = fetch(site.url)
+        assert status == 200
+        for panel in ("tab-flights", "tab-hotels", "tab-tours", "tab-cars", "tab-visa"):
+            assert f'id="{panel}"' in body
+        assert "Your Trip Starts Here!" in body
+        assert 'id="flights-search"' in body
+        assert 'class="footer-area"' in body
+
+    def test_flight_search_is_paginated(self, site):
+        status, body, _ = fetch(site.url + "flights/search?from=Paris&to=Tokyo")
+        assert status == 200
+        assert body.count('class="flight-list') == 10
+        assert 'class="next"' in body
+        _, last_page, _ = fetch(site.url + "flights/search?from=Paris&to=Tokyo&page=3")
+        assert last_page.count('class="flight-list') == 5
+        assert 'class="next"' not in last_page
+
+    def test_results_are_deterministic_per_query(self, site):
+        _, first, _ = fetch(site.url + "flights/search?from=Paris&to=Tokyo")
+        _, second, _ = fetch(site.url + "flights/search?from=Paris&to=Tokyo")
+        assert first == second
+
+    def test_empty_results_message(self, site):
+        _, body, _ = fetch(site.url + "hotels/search?city=Nowhere")
+        assert "No hotels found" in body
+
+    def test_error_rate_and_runtime_config(self, site):
+        status, body, _ = fetch(site.url + "__config", data=json.dumps({"error_rate": 1.0}).encode())
+        assert status == 200
+        assert json.loads(body)["error_rate"] == 1.0
+        status, _, _ = fetch(site.url + "tours/search?city=Bali")
+        assert status == 500
+
+    def test_search_latency(self, site):
+        site.config.search_latency_ms = 200
+        start = time.perf_counter()
+        fetch(site.url + "cars/search?pickup=Miami")
+        assert time.perf_counter() - start >= 0.2
+
+    def test_autocomplete(self, site):
+        status, body, _ = fetch(site.url + "api/autocomplete?q=lon")
+        assert status == 200
+        assert "London" in json.loads(body)
+
+    def test_unknown_page_and_redirect(self, site):
+        status, body, _ = fetch(site.url + "nonexistent-page-12345")
+        assert status == 404
+        assert "Page Not Found" in body
+        status, _, final_url = fetch(site.url + "home")
+        assert status == 200
+        assert final_url == site.url
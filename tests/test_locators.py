@@ -0,0 +1,76 @@
+"""
+Unit tests for the declarative locator registry (no browser required)
+"""
+from models.home_page import HomePage
+from models.locators import declared_selector, registry, selector_engine
+from utils.batch_expect import parse_selector
+
+
+class FakeLocator:
+    def __init__(self, selector):
+        self.selector = selector
+
+    @property
+    def first(self):
+        return FakeLocator(self.selector + " >> nth=0")
+
+
+class FakePage:
+    def __init__(self):
+        self.built = []
+
+    def locator(self, selector):
+        self.built.append(selector)
+        return FakeLocator(selector)
+
+
+def make_home_page(page):
+    # Skip BasePage.__init__, which installs browser-side hooks
+    home = HomePage.__new__(HomePage)
+    home.page = page
+    return home
+
+
+class TestLocatorRegistry:
+    """Test cases for lazy building, caching and registry metadata"""
+
+    def test_locators_are_built_lazily_and_cached(self):
+        page = FakePage()
+        home = make_home_page(page)
+        assert page.built == []
+        assert home.logo is home.logo
+        assert page.built == ["(//img[@class='logo p-1 rounded'])[1]"]
+        assert home.flight_way_select.selector == "#tab-flights select.flight_way >> nth=0"
+
+    def test_cache_is_per_instance(self):
+        first, second = make_home_page(FakePage()), make_home_page(FakePage())
+        assert first.footer is not second.footer
+
+    def test_sections_and_metadata(self):
+        locators = registry(HomePage)
+        assert locators.sections()[:3] == ["header", "hero", "search.flights"]
+        assert {d.name for d in locators.in_section("search")} >= {"flying_from_input", "visa_search_button"}
+        assert locators["logo"].engine == "xpath"
+        assert locators["footer_copyright"].engines == ("css", "text")
+        assert locators["footer_copyright"].engine == "mixed"
+        assert locators["feature_tours_cards"].optional
+        assert not locators["flight_search_button"].optional
+        assert "hotels_city_input" not in {d.name for d in locators.required()}
+
+    def test_selector_engines(self):
+        assert selector_engine("(//a)[1]") == "xpath"
+        assert selector_engine("a.dropdown-toggle:has-text('English')") == "css"
+        assert selector_engine("#tab-flights input[name='from']") == "css"
+        assert selector_engine("text=PHPTRAVELS") == "text"
+        assert selector_engine("internal:role=button") == "internal:role"
+
+    def test_checks_carry_the_declared_selector(self):
+        home = make_home_page(FakePage())
+        logo, header = home.checks("visible", "logo", "header")
+        # The selector Playwright resolves for the built locator, .first included
+        assert logo.selector == logo.locator.selector == "(//img[@class='logo p-1 rounded'])[1]"
+        assert header.selector == header.locator.selector == "header >> nth=0"
+        assert declared_selector(HomePage, "search_results", first=True).endswith(" >> nth=0")
+        assert parse_selector(declared_selector(HomePage, "flights_tab"))[-1]["kind"] == "has_text"
+        # Anything not declared on the page object is left to Playwright
+        assert declared_selector(HomePage, "page") is None
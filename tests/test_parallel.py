@@ -0,0 +1,74 @@
+"""
+Unit tests for duration-aware sharding and report merging (no browser required)
+"""
+import xml.etree.ElementTree as ET
+from utils import parallel
+from utils.parallel import partition, merge_durations, merge_junit, select_shard
+
+
+class FakeItem:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+def write_junit(path, cases, failures=0):
+    suite = ET.Element("testsuite", name="pytest", tests=str(len(cases)), failures=str(failures),
+                       errors="0", skipped="0", time="3.5")
+    for name in cases:
+        case = ET.SubElement(suite, "testcase", classname="tests.test_x", name=name, time="1.0")
+        if name.startswith("fail"):
+            ET.SubElement(case, "failure", message="boom")
+    root = ET.Element("testsuites")
+    root.append(suite)
+    ET.ElementTree(root).write(path)
+
+
+class TestPartition:
+    """Test cases for load balancing across workers"""
+
+    def test_slow_tests_are_spread_across_workers(self):
+        durations = {"search_1": 40, "search_2": 40, "nav_1": 20, "nav_2": 20, "logo": 1, "title": 1}
+        shards = partition(list(durations), durations, 2)
+        assert len(shards) == 2
+        assert [s["estimate"] for s in shards] == [61, 61]
+        for shard in shards:
+            assert sum(1 for t in shard["tests"] if t.startswith("search")) == 1
+
+    def test_unknown_tests_use_median_duration(self):
+        durations = {"a": 10, "b": 20, "c": 30}
+        shards = partition(["a", "b", "c", "new"], durations, 2)
+        assert sum(s["estimate"] for s in shards) == 80
+
+    def test_never_more_shards_than_tests(self):
+        assert len(partition(["a", "b"], {}, 8)) == 2
+
+    def test_durations_are_smoothed(self):
+        merged = merge_durations({"a": 10.0}, {"a": 20.0, "b": 5.0})
+        assert merged == {"a": 15.0, "b": 5.0}
+
+
+class TestReports:
+    """Test cases for shard selection and merged reports"""
+
+    def test_select_shard(self, tmp_path):
+        shard_file = tmp_path / "shard-0.txt"
+        shard_file.write_text("tests/test_x.py::test_a\n")
+        selected, deselected = select_shard([FakeItem("tests/test_x.py::test_a"), FakeItem("tests/test_x.py::test_b")], shard_file)
+        assert [i.nodeid for i in selected] == ["tests/test_x.py::test_a"]
+        assert [i.nodeid for i in deselected] == ["tests/test_x.py::test_b"]
+
+    def test_junit_files_are_merged(self, tmp_path):
+        write_junit(tmp_path / "shard-0.xml", ["test_a", "fail_b"], failures=1)
+        write_junit(tmp_path / "shard-1.xml", ["test_c"])
+        root = merge_junit([tmp_path / "shard-0.xml", tmp_path / "shard-1.xml", tmp_path / "missing.xml"])
+        suite = root.find("testsuite")
+        assert suite.get("tests") == "3"
+        assert suite.get("failures") == "1"
+        assert len(suite.findall("testcase")) == 3
+
+    def test_perf_dir_is_read_by_the_runner(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(parallel, "run", lambda *args: calls.append(args) or 0)
+        parallel.main(["-n", "2", "--perf-dir", "out/perf", "tests/", "--local-site"])
+        # The runner merges the shards' files from it; it is not left among the plain pytest arguments
+        assert calls[0][1] == ["tests/", "--local-site"] and calls[0][-1] == "out/perf"
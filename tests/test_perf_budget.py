@@ -0,0 +1,93 @@
+"""
+Unit tests for performance budgets and baseline regression detection (no browser required)
+"""
+import json
+from utils import perf_budget
+from utils.perf_budget import Budget, BudgetHistory, evaluate, load_budgets, robust_z, run_samples
+
+BUDGETS = [
+    Budget("home", ["/"], {"lcp_ms": 2500, "transfer_bytes": 3_000_000}),
+    Budget("search_results", ["/flights/*"], {"transfer_bytes": 1_000_000}),
+]
+
+
+def run(history, lcp_ms, transfer_bytes=500_000):
+    records = [{"label": "/", "lcp_ms": lcp_ms, "transfer_bytes": transfer_bytes}]
+    verdicts = evaluate(records, BUDGETS, history, "127.0.0.1")
+    return {f"{v.budget}/{v.metric}": v for v in verdicts}
+
+
+def seeded_history(tmp_path, samples=(1000, 1020, 990, 1010, 1005, 995)):
+    history = BudgetHistory(tmp_path / "history.json")
+    for value in samples:
+        run(history, value)
+    return history
+
+
+class TestPerfBudget:
+    """Test cases for budget matching, robust baselines and regression confirmation"""
+
+    def test_budget_files_and_page_matching(self, tmp_path):
+        (tmp_path / "flights.json").write_text(json.dumps({"pages": ["/flights"], "metrics": {"ttfb_ms": 800}}))
+        budgets = load_budgets(tmp_path)
+        assert budgets[0].name == "flights"
+        assert budgets[0].matches("/flights/") and not budgets[0].matches("/flights/search")
+        assert BUDGETS[1].matches("/flights/search")
+
+    def test_run_samples_use_the_median(self):
+        records = [{"label": "/", "lcp_ms": v} for v in (900, 5000, 1000)]
+        assert run_samples(records, BUDGETS) == {("home", "lcp_ms"): 1000}
+
+    def test_robust_z_ignores_outliers_in_baseline(self):
+        assert robust_z(1100, [1000, 1010, 990, 1005, 995, 9000]) > 5
+
+    def test_single_spike_is_only_suspect(self, tmp_path):
+        history = seeded_history(tmp_path)
+        verdict = run(history, 1600)["home/lcp_ms"]
+        assert verdict.regressed and verdict.status == "suspect"
+        assert run(history, 1010)["home/lcp_ms"].status == "ok"
+
+    def test_sustained_regression_is_confirmed(self, tmp_path):
+        history = seeded_history(tmp_path)
+        run(history, 1600)
+        verdict = run(history, 1650)["home/lcp_ms"]
+        assert verdict.confirmed
+        # Flagged samples never enter the baseline
+        assert max(history.entry("127.0.0.1", "home/lcp_ms")["samples"]) == 1020
+
+    def test_small_changes_and_short_history_are_not_regressions(self, tmp_path):
+        assert not run(seeded_history(tmp_path), 1080)["home/lcp_ms"].flagged
+        short = seeded_history(tmp_path / "short", samples=(1000, 1000))
+        assert not run(short, 2000)["home/lcp_ms"].flagged
+
+    def test_over_budget_is_flagged_without_baseline(self, tmp_path):
+        history = BudgetHistory(tmp_path / "history.json")
+        assert run(history, 3000)["home/lcp_ms"].over_budget
+
+    def test_check_persists_history_only_when_recording(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("CI", raising=False)
+        (tmp_path / "budgets").mkdir()
+        (tmp_path / "budgets" / "home.json").write_text(json.dumps({"pages": ["/"], "metrics": {"lcp_ms": 2500}}))
+        path = tmp_path / "history.json"
+        assert perf_budget.check([{"label": "/", "lcp_ms": 1000}], "host", tmp_path / "budgets", path)
+        assert not path.exists()
+        perf_budget.check([{"label": "/", "lcp_ms": 1000}], "host", tmp_path / "budgets", path,
+                          record=perf_budget.recording_baseline(True))
+        assert json.loads(path.read_text())["host"]["home/lcp_ms"]["samples"] == [1000]
+        monkeypatch.setenv("CI", "true")
+        assert perf_budget.recording_baseline()
+
+    def test_history_is_kept_per_host_and_resource_profile(self, tmp_path):
+        (tmp_path / "budgets").mkdir()
+        (tmp_path / "budgets" / "home.json").write_text(json.dumps({"pages": ["/"], "metrics": {"lcp_ms": 2500}}))
+        path = tmp_path / "history.json"
+        records = [
+            {"label": "/", "url": "http://127.0.0.1:8000/", "lcp_ms": 1000, "resource_profile": "full"},
+            {"label": "/", "url": "http://127.0.0.1:8000/", "lcp_ms": 400, "resource_profile": "structural"},
+            {"label": "/", "url": "http://127.0.0.1:8000/", "lcp_ms": 1200},
+        ]
+        verdicts = perf_budget.check(records, budget_dir=tmp_path / "budgets", history_path=path, record=True)
+        assert [(v.target, v.value) for v in verdicts] == [
+            ("127.0.0.1/full", 1100), ("127.0.0.1/structural", 400),
+        ]
+        assert set(json.loads(path.read_text())) == {"127.0.0.1/full", "127.0.0.1/structural"}
@@ -0,0 +1,96 @@
+"""
+Unit tests for page-load metric records (no browser required)
+"""
+import asyncio
+from playwright.async_api import Error
+from utils.perf_metrics import AsyncPerfRecorder, PerfLog, read_records, records_html, summarize
+
+RAW = {
+    "url": "https://www.phptravels.net/",
+    "navigation": {
+        "startTime": 0,
+        "responseStart": 180.44,
+        "domContentLoadedEventEnd": 900.1,
+        "loadEventEnd": 0,
+        "transferSize": 20_000,
+    },
+    "paint": {"first-paint": 400.0, "first-contentful-paint": 410.26},
+    "lcp": 950.0,
+    "cls": 0.012345,
+    "resources": [
+        {"type": "img", "transfer": 40_000},
+        {"type": "img", "transfer": 0},
+        {"type": "script", "transfer": 10_000},
+    ],
+}
+
+
+class FakeWaits:
+    def __init__(self):
+        self.loads = 0
+
+    async def page_loaded(self):
+        self.loads += 1
+        return True
+
+
+class FakePage:
+    def __init__(self, raw=RAW, error=None):
+        self.raw = raw
+        self.error = error
+
+    async def evaluate(self, script, arg=None):
+        if self.error:
+            raise self.error
+        return self.raw
+
+
+class TestPerfMetrics:
+    """Test cases for metric summaries and the per-test records file"""
+
+    def test_summarize(self):
+        metrics = summarize(RAW)
+        assert metrics["ttfb_ms"] == 180.4
+        assert metrics["fcp_ms"] == 410.3
+        assert metrics["lcp_ms"] == 950.0
+        assert metrics["load_ms"] is None, "Load event has not fired yet"
+        assert metrics["cls"] == 0.0123
+        assert metrics["transfer_bytes"] == 70_000
+        assert metrics["request_count"] == 4
+        assert metrics["resources"]["img"] == {"count": 2, "transfer_bytes": 40_000}
+
+    def test_missing_entries(self):
+        metrics = summarize({"url": "about:blank", "navigation": None, "resources": []})
+        assert metrics["ttfb_ms"] is None
+        assert metrics["request_count"] == 0
+
+    def test_records_file_and_report(self, tmp_path):
+        log = PerfLog(tmp_path / "perf", shard="1")
+        record = {"label": "/", **summarize(RAW)}
+        log.write("tests/test_performance.py::test_x", [record])
+        assert log.path.name == "metrics-1.jsonl"
+        written = read_records(log.path)
+        assert written[0]["nodeid"] == "tests/test_performance.py::test_x"
+        assert written[0]["resource_profile"] == "full"
+        assert written[0]["lcp_ms"] == 950.0
+        table = records_html([record])
+        assert "<td>/</td>" in table and "<td>-</td>" in table
+
+    def test_recorder_measures_each_navigation(self):
+        waits = FakeWaits()
+        recorder = AsyncPerfRecorder(FakePage(), waits)
+        record = asyncio.run(recorder.measure("/"))
+        assert waits.loads == 1
+        assert record["label"] == "/" and record["lcp_ms"] == 950.0
+        assert recorder.latest is record
+
+    def test_replaced_document_is_not_recorded(self):
+        recorder = AsyncPerfRecorder(FakePage(error=Error("Execution context was destroyed")), FakeWaits())
+        assert asyncio.run(recorder.measure("/flights")) is None
+        assert recorder.records == [] and recorder.latest is None
+
+    def test_disabled_recorder_does_not_wait_for_load(self):
+        waits = FakeWaits()
+        recorder = AsyncPerfRecorder(FakePage(), waits, enabled=False)
+        assert asyncio.run(recorder.measure("/")) is None
+        assert waits.loads == 0 and recorder.records == []
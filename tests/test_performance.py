@@ -0,0 +1,41 @@
+"""
+Priority 4: Performance Tests
+Page-load checks from TEST_PLAN.md section 4.1, asserted on the metrics
+BasePage records after every navigation
+"""
+import pytest
+from models.home_page import HomePage
+
+pytestmark = pytest.mark.perf
+
+# TEST_PLAN.md 4.1: page load time < 3 seconds
+PAGE_LOAD_BUDGET_MS = 3000
+
+
+class TestPageLoadTime:
+    """Test cases for page load timings"""
+
+    def test_homepage_load_time(self, home_page):
+        """TC-P4-001: Homepage loads in under 3 seconds"""
+        metrics = home_page.perf.latest
+        assert metrics is not None, "Homepage load should be measured"
+        assert metrics["load_ms"] is not None, "Load event should have fired"
+        assert metrics["load_ms"] < PAGE_LOAD_BUDGET_MS, f"Homepage took {metrics['load_ms']}ms to load"
+
+    def test_homepage_paint_timings(self, home_page):
+        """TC-P4-002: First Contentful Paint and Largest Contentful Paint are within budget"""
+        metrics = home_page.perf.latest
+        assert metrics["fcp_ms"] is not None, "FCP should be reported"
+        assert metrics["fcp_ms"] < PAGE_LOAD_BUDGET_MS
+        if metrics["lcp_ms"] is not None:
+            assert metrics["fcp_ms"] <= metrics["lcp_ms"], "LCP cannot happen before FCP"
+            assert metrics["lcp_ms"] < PAGE_LOAD_BUDGET_MS
+
+    @pytest.mark.parametrize("nav", ["flights_nav", "hotels_nav", "tours_nav", "cars_nav", "visa_nav"])
+    def test_nav_page_load_time(self, home_page, nav):
+        """TC-P4-003: Pages reached from the navigation menu load in under 3 seconds"""
+        metrics = home_page.follow_link(getattr(home_page, nav))
+        assert metrics is not None
+        assert metrics["request_count"] >= 1
+        assert metrics["load_ms"] is not None and metrics["load_ms"] < PAGE_LOAD_BUDGET_MS, \
+            f"{metrics['label']} took {metrics['load_ms']}ms to load"
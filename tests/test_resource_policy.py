@@ -0,0 +1,93 @@
+"""
+Unit tests for resource blocking profiles and savings accounting (no browser required)
+"""
+from utils.resource_policy import PROFILES, ResourcePolicy, SizeCache, TYPICAL_SIZES
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.action = None
+
+    def abort(self, error_code=None):
+        self.action = "abort"
+
+    def fallback(self):
+        self.action = "fallback"
+
+
+class FakeResponse:
+    def __init__(self, url, length):
+        self.url = url
+        self.headers = {"content-length": str(length)}
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def route(self, pattern, handler):
+        self.routes.append(handler)
+
+
+class TestResourcePolicy:
+    """Test cases for allow/deny decisions and savings counters"""
+
+    def test_structural_profile_blocks_media_and_trackers(self):
+        policy = PROFILES["structural"]
+        assert policy.is_blocked("image", "https://www.phptravels.net/uploads/hotel.jpg")
+        assert policy.is_blocked("font", "https://fonts.gstatic.com/roboto.woff2")
+        assert policy.is_blocked("script", "https://www.googletagmanager.com/gtm.js")
+        assert not policy.is_blocked("document", "https://www.phptravels.net/")
+        assert not policy.is_blocked("script", "https://www.phptravels.net/app.js")
+
+    def test_visual_profile_keeps_images(self):
+        policy = PROFILES["visual"]
+        assert not policy.is_blocked("image", "https://www.phptravels.net/uploads/hotel.jpg")
+        assert policy.is_blocked("xhr", "https://stats.g.doubleclick.net/collect")
+
+    def test_allow_list_wins(self):
+        policy = ResourcePolicy("custom", block_types={"image"}, allow_hosts=("cdn.phptravels.net",))
+        assert not policy.is_blocked("image", "https://cdn.phptravels.net/logo.png")
+        assert policy.is_blocked("image", "https://other.example.com/logo.png")
+
+    def test_full_profile_does_not_route(self, tmp_path):
+        context = FakeContext()
+        PROFILES["full"].apply(context, SizeCache(tmp_path / "sizes.json"))
+        assert context.routes == []
+
+    def test_bytes_saved_uses_learned_sizes(self, tmp_path):
+        sizes = SizeCache(tmp_path / "sizes.json")
+        context = FakeContext()
+        meter = PROFILES["structural"].apply(context, sizes)
+        context.listeners["response"][0](FakeResponse("https://www.phptravels.net/hero.jpg", 250_000))
+        before = meter.checkpoint()
+        for url, resource_type in [("https://www.phptravels.net/hero.jpg", "image"),
+                                   ("https://www.phptravels.net/card.jpg", "image"),
+                                   ("https://www.phptravels.net/", "document")]:
+            route = FakeRoute(url, resource_type)
+            context.routes[0](route)
+        summary = meter.summary(since=before)
+        assert summary["requests_blocked"] == 2
+        assert summary["bytes_saved"] == 250_000 + TYPICAL_SIZES["image"]
+        meter.detach()
+        assert context.listeners["response"] == []
+
+    def test_learned_sizes_persist(self, tmp_path):
+        sizes = SizeCache(tmp_path / "sizes.json")
+        sizes.learn("https://www.phptravels.net/a.png", 1234)
+        sizes.save()
+        assert SizeCache(tmp_path / "sizes.json").estimate("https://www.phptravels.net/a.png", "image") == 1234
@@ -0,0 +1,116 @@
+"""
+Unit tests for the background screenshot store (no browser required)
+"""
+import asyncio
+import os
+import struct
+import zlib
+from utils import screenshots
+from utils.screenshots import PNG_SIGNATURE, ScreenshotStore, _chunk, after_step, recompress_png
+from utils.spans import CURRENT, Span
+
+
+def png(width=64, height=64, shade=0, level=1) -> bytes:
+    """Grayscale PNG compressed at a low zlib level, as browsers do for speed"""
+    rows = b"".join(b"\x00" + bytes([(shade + x // 8) % 256 for x in range(width)]) for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return PNG_SIGNATURE + _chunk(b"IHDR", header) + _chunk(b"IDAT", zlib.compress(rows, level)) + _chunk(b"IEND", b"")
+
+
+class FakePage:
+    def __init__(self):
+        self.shots = 0
+
+    async def screenshot(self):
+        self.shots += 1
+        return png()
+
+
+class FakePageObject:
+    def __init__(self):
+        self.page = FakePage()
+
+
+class TestScreenshots:
+    """Test cases for PNG recompression, deduplication, eviction and step capture"""
+
+    def test_recompression_is_lossless_and_smaller(self):
+        original = png(256, 256, level=0)
+        smaller = recompress_png(original)
+        assert len(smaller) < len(original)
+        idat = lambda data: zlib.decompress(data[data.index(b"IDAT") + 4:data.index(b"IEND") - 8])
+        assert idat(smaller) == idat(original)
+        assert recompress_png(b"\xff\xd8jpeg") == b"\xff\xd8jpeg"
+
+    def test_identical_frames_are_stored_once(self, tmp_path):
+        store = ScreenshotStore(str(tmp_path))
+        for name in ("t1@failure", "t2@failure", "t3@failure"):
+            store.submit(name, png(shade=7))
+        store.submit("t4@failure", png(shade=9))
+        store.close()
+        assert len(store.frames()) == 2
+        assert store.stats["deduplicated"] == 2
+        lookup = store.lookup("@failure")
+        assert lookup["t1@failure"] == lookup["t3@failure"] != lookup["t4@failure"]
+
+    def test_store_is_kept_under_its_size_limit(self, tmp_path):
+        frame_size = len(recompress_png(png(shade=0)))
+        store = ScreenshotStore(str(tmp_path), max_bytes=frame_size * 3)
+        for shade in range(6):
+            store.submit(f"step{shade}", png(shade=shade * 40))
+            store.flush()
+            os.utime(store.lookup(f"step{shade}")[f"step{shade}"], (shade, shade))
+        store.close()
+        assert store.disk_usage() <= frame_size * 3
+        assert store.stats["evicted"] >= 3
+        assert "step5" in store.lookup() and "step0" not in store.lookup()
+
+    def test_writer_survives_bad_frames(self, tmp_path, monkeypatch):
+        store = ScreenshotStore(str(tmp_path))
+        truncated = png(shade=3)[:40]
+        assert recompress_png(truncated) == truncated
+        real_store = store._store
+
+        def flaky_store(name, data, taken):
+            if name == "disk-full":
+                raise OSError(28, "No space left on device")
+            return real_store(name, data, taken)
+
+        monkeypatch.setattr(store, "_store", flaky_store)
+        store.submit("truncated", truncated)
+        store.submit("disk-full", png(shade=5))
+        store.submit("after", png(shade=6))
+        store.flush()
+        assert store.thread.is_alive()
+        assert store.stats["failed"] == 1 and "No space left" in store.last_error
+        assert {"truncated", "after"} <= set(store.lookup())
+        store.close()
+
+    def test_frames_are_dropped_once_the_writer_is_gone(self, tmp_path):
+        store = ScreenshotStore(str(tmp_path))
+        store.submit("first", png())
+        store.queue.put(None)
+        store.thread.join()
+        store.submit("late", png(shade=1))
+        assert store.stats["dropped"] == 1
+        assert list(store.lookup()) == ["first"]
+
+    def test_steps_mode_captures_outermost_steps_only(self, tmp_path, monkeypatch):
+        store = ScreenshotStore(str(tmp_path))
+        monkeypatch.setattr(screenshots, "_shared", store)
+        monkeypatch.setattr(screenshots, "mode", "steps")
+        monkeypatch.setattr(screenshots, "_test", {"name": "t::search", "steps": 0})
+        page_object = FakePageObject()
+
+        def run_under(kind):
+            token = CURRENT.set(Span("call", kind))
+            try:
+                asyncio.run(after_step("HomePage.click_tab", (page_object,)))
+            finally:
+                CURRENT.reset(token)
+
+        run_under("phase")
+        run_under("step")
+        store.close()
+        assert page_object.page.shots == 1
+        assert list(store.lookup()) == ["t::search@001-HomePage.click_tab"]
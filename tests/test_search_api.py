@@ -0,0 +1,120 @@
+"""
+Unit tests for the direct search API mode (no browser required)
+"""
+import asyncio
+from utils.local_site import LocalSite, LocalSiteConfig
+from playwright.async_api import Error
+from utils.search_api import (
+    SearchClient, build_matrix, check_matrix, count_results, expand, learn, learn_all, summarize,
+)
+
+FLIGHT_VALUES = {"flight_type": "oneway", "origin": "New York", "destination": "London", "departure": "2026-10-25"}
+
+
+def flight_capture(host="https://www.phptravels.net"):
+    return {
+        "vertical": "flights",
+        "values": FLIGHT_VALUES,
+        "requests": [
+            {"method": "GET", "url": f"{host}/api/autocomplete?q=Lon", "post_data": None},
+            {
+                "method": "GET",
+                "url": f"{host}/flights/search?flight_way=oneway&from=New+York&to=London&departure=2026-10-25&return=",
+                "post_data": None,
+            },
+        ],
+    }
+
+
+class FakeResponse:
+    def __init__(self, body="", status=200, error=None):
+        self.body = body
+        self.status = status
+        self.error = error
+        self.headers = {"content-type": "application/json"}
+        self.disposed = False
+
+    async def text(self):
+        if self.error:
+            raise self.error
+        return self.body
+
+    async def dispose(self):
+        self.disposed = True
+
+
+class FakeContext:
+    def __init__(self, response):
+        self.response = response
+
+    async def fetch(self, url, **kwargs):
+        return self.response
+
+
+class TestSearchApi:
+    """Test cases for learning search requests and running search matrices"""
+
+    def test_learns_query_templates(self):
+        endpoint = learn(flight_capture())
+        assert endpoint["path"] == "/flights/search"
+        assert endpoint["query"] == [
+            ["flight_way", "{flight_type}"], ["from", "{origin}"], ["to", "{destination}"],
+            ["departure", "{departure}"], ["return", ""],
+        ]
+        assert endpoint["fields"] == ["departure", "destination", "flight_type", "origin"]
+        method, url, options = expand(endpoint, {"origin": "San Francisco", "departure": "2026-12-01"})
+        assert method == "GET"
+        assert url == "/flights/search?flight_way=oneway&from=San+Francisco&to=London&departure=2026-12-01&return="
+        assert options == {}
+
+    def test_learns_path_slugs_and_date_formats(self):
+        capture = {
+            "vertical": "hotels",
+            "values": {"city": "New York", "checkin": "2026-10-25"},
+            "requests": [{"method": "POST", "url": "https://x.test/api/hotels/new-york",
+                          "post_data": '{"checkin": "25/10/2026", "guests": 2}'}],
+        }
+        endpoint = learn_all([capture])["hotels"]
+        assert endpoint["path"] == "/api/hotels/{city:slug}"
+        assert endpoint["json"] == {"checkin": "{checkin:%d/%m/%Y}", "guests": 2}
+        method, url, options = expand(endpoint, {"city": "San Francisco", "checkin": "2026-12-01"})
+        assert (method, url) == ("POST", "/api/hotels/san-francisco")
+        assert options == {"data": {"checkin": "01/12/2026", "guests": 2}}
+
+    def test_count_results(self):
+        html = '<ul><li class="flight-list result">a</li><li class="flight-list result">b</li><li class="x">c</li></ul>'
+        assert count_results(html, "text/html") == 2
+        assert count_results("<p>No hotels found</p>", "text/html") == 0
+        assert count_results('{"data": [1, 2, 3]}', "application/json") == 3
+        assert count_results("[1]", "application/json") == 1
+
+    def test_matrix_only_varies_learned_fields(self):
+        endpoints = {"tours": {"fields": ["destination"]}, "cars": {"fields": ["dropoff", "pickup"]}}
+        cases = build_matrix(endpoints, cities=["Paris", "Rome", "Bali"], days=[7, 14])
+        assert len([c for c in cases if c[0] == "tours"]) == 3
+        assert len([c for c in cases if c[0] == "cars"]) == 6
+        assert len(build_matrix(endpoints, cities=["Paris", "Rome", "Bali"], limit=4)) == 4
+
+    def test_matrix_against_local_site(self):
+        with LocalSite(config=LocalSiteConfig(results={"flights": 25, "hotels": 0})) as site:
+            hotels = {
+                "vertical": "hotels",
+                "values": {"city": "Paris"},
+                "requests": [{"method": "GET", "url": site.url + "hotels/search?city=Paris&guests=1", "post_data": None}],
+            }
+            endpoints = learn_all([flight_capture(site.url.rstrip("/")), hotels])
+            cases = build_matrix(endpoints, cities=["Paris", "Rome", "Bali"], days=[7])
+            results, elapsed = asyncio.run(check_matrix(site.url, endpoints, cases, contexts=2, concurrency=8))
+        summary = summarize(results, elapsed)
+        assert summary["checks"] == len(cases) == 9
+        assert summary["verticals"]["flights"] == {**summary["verticals"]["flights"], "checks": 6, "errors": 0, "empty": 0}
+        assert summary["verticals"]["hotels"]["empty"] == 3
+        assert {r["results"] for r in results if r["vertical"] == "flights"} == {10}
+
+    def test_responses_are_disposed(self):
+        client = SearchClient(None, "https://www.phptravels.net/", {"flights": learn(flight_capture())})
+        for response in (FakeResponse('{"data": [1, 2]}'), FakeResponse(error=Error("Response body is unavailable"))):
+            client.contexts = [FakeContext(response)]
+            result = asyncio.run(client.check("flights", FLIGHT_VALUES))
+            assert response.disposed
+        assert result["error"] == "Error" and result["ms"] is not None
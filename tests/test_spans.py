@@ -0,0 +1,97 @@
+"""
+Unit tests for step-level timing spans (no browser required)
+"""
+import asyncio
+from utils import spans
+from utils.spans import CURRENT, Span, StepTracer, instrument_steps, slowest_steps, span, traced
+
+
+class AsyncFakePage:
+    async def click_tab(self, name):
+        await self.locate()
+        return name
+
+    async def locate(self):
+        await asyncio.sleep(0)
+
+    async def _private(self):
+        return None
+
+    def checks(self):
+        return []
+
+
+instrument_steps(AsyncFakePage)
+
+
+def run_traced(function):
+    """Run function under a root span, like StepTracer does for each test"""
+    root = Span("test", "test")
+    token = CURRENT.set(root)
+    try:
+        function()
+    finally:
+        root.finish()
+        CURRENT.reset(token)
+    return root
+
+
+class TestSpans:
+    """Test cases for span trees, instrumentation and the slowest steps table"""
+
+    def test_nothing_is_recorded_outside_tests(self):
+        # This test itself may run under the suite's step tracer (--trace-steps)
+        token = CURRENT.set(None)
+        try:
+            with span("step") as recorded:
+                assert recorded is None
+            assert asyncio.run(AsyncFakePage().click_tab("hotels")) == "hotels"
+        finally:
+            CURRENT.reset(token)
+
+    def test_instrumented_coroutines_nest(self):
+        root = run_traced(lambda: asyncio.run(AsyncFakePage().click_tab("flights")))
+        step, = root.children
+        assert step.name == "FakePage.click_tab"
+        assert [child.name for child in step.children] == ["FakePage.locate"]
+        assert step.duration_ms >= step.children[0].duration_ms
+        assert not hasattr(AsyncFakePage._private, "__traced__")
+        assert not hasattr(AsyncFakePage.checks, "__traced__")
+
+    def test_errors_are_recorded_and_reraised(self):
+        def fail():
+            raise TimeoutError("slow")
+
+        def body():
+            try:
+                traced(fail, "Locator.click", "playwright")()
+            except TimeoutError:
+                pass
+
+        root = run_traced(body)
+        assert root.children[0].error == "TimeoutError"
+        assert root.children[0].kind == "playwright"
+
+    def test_trace_events_and_slowest_steps(self):
+        root = Span("test", "test")
+        outer = Span("HomePage.search_flights", "step")
+        inner = Span("Page.wait_for_timeout", "playwright")
+        root.children, outer.children = [outer], [inner]
+        outer.start, inner.start, inner.end, outer.end = 0.0, 0.1, 3.1, 3.2
+        root.start, root.end = 0.0, 3.2
+        events = root.trace_events(pid=0, tid=1)
+        assert [e["name"] for e in events] == ["test", "HomePage.search_flights", "Page.wait_for_timeout"]
+        assert events[2]["dur"] == 3000000
+        steps = slowest_steps(events + events[1:], top=5)
+        assert [s["name"] for s in steps] == ["Page.wait_for_timeout", "HomePage.search_flights"]
+        assert steps[0]["calls"] == 2
+        assert round(steps[1]["self_ms"]) == 400
+        assert round(steps[1]["total_ms"]) == 6400
+
+    def test_playwright_is_patched_only_when_asked(self, tmp_path, monkeypatch):
+        patched = []
+        monkeypatch.setattr(spans, "instrument_playwright", lambda: patched.append(True))
+        StepTracer(str(tmp_path), playwright_calls=False)
+        assert patched == []
+        StepTracer(str(tmp_path))
+        assert patched == [True]
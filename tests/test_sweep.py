@@ -0,0 +1,112 @@
+"""
+Unit tests for data-driven search sweeps (no browser required)
+"""
+import asyncio
+import json
+from utils.sweep import (
+    ResultWriter, generate_rows, main, page_lost, read_rows, resume_point, run_row, search_arguments,
+)
+
+
+class FakePage:
+    url = "http://127.0.0.1/flights/search?from=Paris"
+    closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeHome:
+    def __init__(self, results=3, error=None):
+        self.page = FakePage()
+        self.results = results
+        self.error = error
+        self.searches = []
+
+    async def navigate(self):
+        pass
+
+    async def wait_for_load(self):
+        pass
+
+    async def search_flights(self, **kwargs):
+        self.searches.append(kwargs)
+        if self.error:
+            raise self.error
+
+    async def get_search_results_count(self):
+        return self.results
+
+
+class TestSweep:
+    """Test cases for streaming rows, running them and resuming a sweep"""
+
+    def test_read_rows_streams_csv_and_jsonl_from_an_offset(self, tmp_path):
+        csv_path = tmp_path / "routes.csv"
+        csv_path.write_text("origin,destination,departure_days\nParis,Rome,7\nRome,Bali,8\nBali,Paris,9\n")
+        rows = read_rows(str(csv_path), start=1)
+        assert next(rows) == (1, {"origin": "Rome", "destination": "Bali", "departure_days": "8"})
+        assert [offset for offset, _ in rows] == [2]
+        jsonl_path = tmp_path / "cities.jsonl"
+        jsonl_path.write_text('{"city": "Paris"}\n\n{"city": "Rome"}\n')
+        assert list(read_rows(str(jsonl_path))) == [(0, {"city": "Paris"}), (1, {"city": "Rome"})]
+
+    def test_search_arguments_follow_the_method_signature(self):
+        row = {"origin": "Paris", "destination": "Rome", "departure_days": "7", "return_days": "", "notes": "x"}
+        assert search_arguments("flights", row) == {"origin": "Paris", "destination": "Rome", "departure_days": 7}
+        assert search_arguments("hotels", {"city": "Rome", "checkin_days": 3}) == {"city": "Rome", "checkin_days": 3}
+        rows = list(generate_rows("cars", 3))
+        assert search_arguments("cars", rows[0]) == rows[0]
+
+    def test_run_row(self):
+        home = FakeHome(results=3)
+        result = asyncio.run(run_row(home, "flights", 4, {"origin": "Paris", "destination": "Rome", "min_results": "5"}))
+        assert home.searches == [{"origin": "Paris", "destination": "Rome"}]
+        assert result["offset"] == 4 and result["results"] == 3
+        assert result["error"] == "expected at least 5 results"
+        result = asyncio.run(run_row(home, "flights", 5, {"origin": "Paris", "departure_days": "soon"}))
+        assert result["error"].startswith("ValueError")
+
+    def test_field_that_did_not_stick_is_the_rows_error(self):
+        home = FakeHome(error=AssertionError("1 of 4 fields not filled:\n  - origin: expected 'Paris', got ''"))
+        result = asyncio.run(run_row(home, "flights", 7, {"origin": "Paris", "destination": "Rome"}))
+        assert result["offset"] == 7 and result["results"] is None
+        assert result["error"] == "AssertionError: 1 of 4 fields not filled:"
+
+    def test_resume_after_interruption(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        writer = ResultWriter(str(path))
+        for offset in (0, 1, 3):
+            writer.write({"offset": offset, "results": 2, "error": None})
+        writer.close()
+        # The interruption cut the last line short
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"offset": 4, "res')
+        assert resume_point(str(path)) == (2, {3})
+        writer = ResultWriter(str(path))
+        writer.write({"offset": 2, "results": 0, "error": "Error: timeout"})
+        writer.close()
+        lines = path.read_text().splitlines()
+        assert json.loads(lines[-1])["offset"] == 2
+        # The errored row is not done: --resume runs it again, and its latest line decides
+        assert resume_point(str(path)) == (2, {3})
+        assert writer.summary() == {"rows": 1, "errors": 1, "results": 0}
+        writer = ResultWriter(str(path))
+        writer.write({"offset": 2, "results": 1, "error": None})
+        writer.close()
+        assert resume_point(str(path)) == (4, set())
+        assert resume_point(str(tmp_path / "missing.jsonl")) == (0, set())
+
+    def test_rows_failed_by_a_dead_page_are_told_apart(self):
+        home = FakeHome()
+        assert not page_lost(home, {"error": None})
+        assert not page_lost(home, {"error": "AssertionError: 1 of 4 fields not filled:"})
+        assert page_lost(home, {"error": "TargetClosedError: Target page, context or browser has been closed"})
+        assert page_lost(home, {"error": "Error: Page crashed"})
+        home.page.closed = True
+        assert page_lost(home, {"error": "TimeoutError: Timeout 10000ms exceeded."})
+
+    def test_generate_zero_rows_writes_only_the_header(self, tmp_path):
+        path = tmp_path / "routes.csv"
+        assert main(["generate", "hotels", "--rows", "0", "--output", str(path)]) == 0
+        assert path.read_text().splitlines() == ["city,checkin_days,checkout_days"]
@@ -0,0 +1,74 @@
+"""
+Unit tests for the visual diff engine (no browser required)
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from utils import visual
+from utils.visual import Diff, check, compare, decode, encode, heatmap
+
+
+def page(height=1080, width=1920):
+    """White full-HD capture with a dark diagonal stroke"""
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    rows = np.arange(min(height, width) // 2)
+    for offset in range(3):
+        image[rows, rows + offset + 20] = 30
+    return image
+
+
+class TestVisual:
+    """Test cases for pixel diffs, anti-aliasing tolerance, masks and heatmaps"""
+
+    def test_identical_captures(self):
+        diff = compare(page(), page())
+        assert diff.changed_pixels == 0 and diff.passed()
+
+    def test_anti_aliasing_is_tolerated_but_real_changes_are_not(self):
+        baseline = page()
+        shifted = np.roll(baseline, 1, axis=1)
+        assert compare(baseline, shifted).changed_pixels == 0
+        assert compare(baseline, shifted, aa_radius=0).changed_pixels > 0
+        changed = baseline.copy()
+        changed[700:720, 1000:1020] = (220, 30, 30)
+        diff = compare(baseline, changed)
+        assert diff.changed_pixels == 400
+        assert diff.bbox() == (1000, 700, 20, 20)
+        assert (diff.tiles() > 0).sum() == 4
+        assert not diff.passed()
+        assert diff.compare_ms < 1000
+
+    def test_masks_and_size_changes(self):
+        baseline, changed = page(), page()
+        changed[10:20, 10:20] = 0
+        assert compare(baseline, changed, masks=[(5, 5, 20, 20)]).changed_pixels == 0
+        diff = compare(page(100, 200), page(120, 200))
+        assert diff.size_changed == ((200, 100), (200, 120))
+        assert not diff.passed()
+
+    def test_heatmap_is_compact(self):
+        baseline, changed = page(), page()
+        changed[0:16, 0:16] = 0
+        image = heatmap(changed, compare(baseline, changed))
+        assert image.shape == (68 * 4, 120 * 4, 3)
+        assert tuple(image[0, 0]) == (255, 0, 0)
+
+    def test_check_records_then_compares(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(visual, "update_baselines", False)
+        dirs = {"baseline_dir": str(tmp_path / "baselines"), "diff_dir": str(tmp_path / "diffs")}
+        capture = encode(page(200, 300))
+        # Without a recorded baseline the region fails instead of passing whatever it looks like
+        missing = check("footer", capture, "127.0.0.1", **dirs)
+        assert not missing.passed() and "--update-baselines" in missing.summary()
+        assert not (tmp_path / "baselines" / "127.0.0.1" / "footer.png").exists()
+        monkeypatch.setattr(visual, "update_baselines", True)
+        assert check("footer", capture, "127.0.0.1", **dirs).new
+        monkeypatch.setattr(visual, "update_baselines", False)
+        assert check("footer", capture, "127.0.0.1", **dirs).passed()
+        broken = page(200, 300)
+        broken[50:150, 50:150] = (0, 0, 255)
+        diff = check("footer", encode(broken), "127.0.0.1", **dirs)
+        assert isinstance(diff, Diff) and not diff.passed()
+        assert decode((tmp_path / "diffs" / "127.0.0.1" / "footer.heatmap.png").read_bytes()).shape == (52, 76, 3)
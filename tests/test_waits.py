@@ -0,0 +1,74 @@
+"""
+Unit tests for the wait engine bookkeeping (no browser required)
+"""
+import asyncio
+from playwright.async_api import TimeoutError
+from utils.waits import AsyncWaitEngine
+
+
+class FakePage:
+    def __init__(self, result=True, error=None):
+        self.result = result
+        self.error = error
+
+    async def wait_for_function(self, script, arg=None, timeout=None, polling=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+    async def evaluate(self, script, arg=None):
+        if self.error:
+            raise self.error
+        return self.result
+
+    async def wait_for_load_state(self, state=None, timeout=None):
+        if self.error:
+            raise self.error
+
+
+class FakeLocator:
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = []
+
+    async def evaluate(self, script, arg=None, timeout=None):
+        self.calls.append((arg, timeout))
+        return self.result
+
+
+class TestWaitEngine:
+    """Test cases for per-condition timeouts and timing reports"""
+
+    def test_satisfied_wait_is_recorded(self):
+        waits = AsyncWaitEngine(FakePage(result=True))
+        assert asyncio.run(waits.dom_quiet("#tab-flights"))
+        assert waits.summary()[0]["name"] == "dom_quiet"
+        assert waits.summary()[0]["satisfied"]
+
+    def test_timeout_does_not_raise(self):
+        waits = AsyncWaitEngine(FakePage(error=TimeoutError("Timeout 3000ms exceeded")))
+        assert not asyncio.run(waits.network_quiet())
+        assert not asyncio.run(waits.page_loaded())
+        assert [t["satisfied"] for t in waits.summary()] == [False, False]
+
+    def test_per_condition_timeouts_can_be_overridden(self):
+        waits = AsyncWaitEngine(FakePage(), timeouts={"dom_quiet": 500})
+        asyncio.run(waits.dom_quiet())
+        assert waits.summary()[0]["timeout_ms"] == 500
+        assert waits.timeouts["network_quiet"] == AsyncWaitEngine.DEFAULT_TIMEOUTS["network_quiet"]
+
+    def test_dom_quiet_false_result_is_unsatisfied(self):
+        waits = AsyncWaitEngine(FakePage(result=False))
+        assert not asyncio.run(waits.dom_quiet())
+        assert waits.total_ms() >= 0
+
+    def test_autocomplete_waits_on_the_inputs_own_list(self):
+        waits = AsyncWaitEngine(FakePage(error=TimeoutError("page-level waits are not used")))
+        origin = FakeLocator(result=True)
+        assert asyncio.run(waits.autocomplete(origin))
+        assert origin.calls == [([250, 3000], 3000)]
+        assert not asyncio.run(waits.autocomplete(FakeLocator(result=False), timeout=800))
+        # One timing per call: nothing nested is counted twice in total_ms()
+        assert [(t["name"], t["timeout_ms"], t["satisfied"]) for t in waits.summary()] == [
+            ("autocomplete", 3000, True), ("autocomplete", 800, False),
+        ]
@@ -0,0 +1,31 @@
+"""
+Bridge between playwright.sync_api objects and their playwright.async_api twins.
+Both APIs wrap the same connection objects, so a coroutine written against the async twins
+can run on the event loop that drives a sync page. Code running inside that coroutine must
+only use async objects: calling a sync API method from within the loop would deadlock.
+The Playwright internals this relies on are isolated in utils.playwright_compat.
+"""
+from utils.batch_expect import Check
+from utils.bulk_fill import Fill
+from utils.playwright_compat import async_twin, is_sync, run_on_loop
+
+
+def as_async(value):
+    """Async twin of a sync API object (Page, Locator, Frame...), also inside checks, fills, lists and dicts"""
+    if is_sync(value):
+        return async_twin(value)
+    if isinstance(value, Check):
+        return Check(value.label, as_async(value.locator), value.state, value.selector)
+    if isinstance(value, Fill):
+        return Fill(value.label, as_async(value.locator), value.value, value.typed, value.optional,
+                    value.selector)
+    if isinstance(value, (list, tuple)):
+        return type(value)(as_async(item) for item in value)
+    if isinstance(value, dict):
+        return {key: as_async(item) for key, item in value.items()}
+    return value
+
+
+def run_sync(sync_object, coroutine):
+    """Run a coroutine to completion on the event loop driving a sync API object"""
+    return run_on_loop(sync_object, coroutine)
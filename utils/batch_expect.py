@@ -0,0 +1,329 @@
+"""
+Batched locator assertions: many locator/state checks evaluated in one browser round-trip.
+Selectors are resolved by a small in-page engine (css, xpath, text=, :has-text(), nth= and >> chains);
+checks that fail are re-polled inside the same call, and only checks still failing at the deadline
+(or using selectors the engine does not understand) go through Playwright's own expect().
+Only selectors a page object declares (see models.locators) are batched: the engine never looks
+inside Locator objects, so checks without a declared selector (get_by_role(), filter(), frame
+locators...) always go through expect().
+The engine only approximates Playwright (no shadow-DOM piercing, simpler text matching and
+visibility), so a batched pass is trusted only once expect() has agreed with it: the first pass
+of each selector and state is confirmed, and a selector the two disagree on is never batched again.
+"""
+import re
+from playwright.async_api import Locator, Error, expect
+
+STATES = ("visible", "hidden", "attached", "detached", "enabled")
+DEFAULT_TIMEOUT = 5000
+# Checks that already failed in the browser are confirmed by expect() with this short timeout
+CONFIRM_TIMEOUT = 500
+
+# In-page selector engine shared by the batched checks and utils.bulk_fill: resolveSteps(steps) -> elements
+ENGINE_JS = """
+    const norm = s => (s || "").replace(/\\s+/g, " ").trim();
+    const textMatches = (el, step) => {
+        const text = norm(el.textContent);
+        return step.exact ? text === step.value : text.toLowerCase().includes(step.value.toLowerCase());
+    };
+    const skipped = el => ["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE"].includes(el.tagName) || el.closest("head");
+    const inOrder = els => [...new Set(els)].sort((a, b) =>
+        a === b ? 0 : (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1));
+    const apply = (roots, step) => {
+        if (step.kind === "nth") {
+            const el = roots[step.value < 0 ? roots.length + step.value : step.value];
+            return el ? [el] : [];
+        }
+        if (step.kind === "has_text") return roots.filter(el => textMatches(el, step));
+        const found = [];
+        for (const root of roots) {
+            if (step.kind === "css") {
+                found.push(...root.querySelectorAll(step.value));
+            } else if (step.kind === "xpath") {
+                // Like Playwright, chained absolute xpaths are relative to the previous match
+                const xpath = root.nodeType !== Node.DOCUMENT_NODE && step.value.startsWith("/") ? "." + step.value : step.value;
+                const snapshot = document.evaluate(xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (let i = 0; i < snapshot.snapshotLength; i++) {
+                    const node = snapshot.snapshotItem(i);
+                    if (node.nodeType === Node.ELEMENT_NODE) found.push(node);
+                }
+            } else {
+                // Smallest elements containing the text, like Playwright's text engine
+                for (const el of root.querySelectorAll("*")) {
+                    if (skipped(el) || !textMatches(el, step)) continue;
+                    if (![...el.children].some(child => textMatches(child, step))) found.push(el);
+                }
+            }
+        }
+        return inOrder(found);
+    };
+    const resolveSteps = steps => {
+        let els = [document];
+        for (const step of steps) els = apply(els, step);
+        return els;
+    };
+"""
+
+BATCH_JS = """
+([specs, timeoutMs]) => new Promise(resolve => {
+""" + ENGINE_JS + """
+    const visible = el => {
+        if (getComputedStyle(el).visibility !== "visible") return false;
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0;
+    };
+    const disabled = el => el.matches(":disabled") || !!el.closest("[aria-disabled='true']");
+    const check = spec => {
+        let els;
+        try {
+            els = resolveSteps(spec.steps);
+        } catch (e) {
+            return { ok: false, unsupported: true, actual: String(e.message || e), count: 0 };
+        }
+        const count = els.length;
+        let actual;
+        if (count === 0) actual = "missing";
+        else if (count > 1) actual = count + " matches";
+        else if (spec.state === "enabled") actual = disabled(els[0]) ? "disabled" : "enabled";
+        else actual = visible(els[0]) ? "visible" : "hidden";
+        const ok = {
+            visible: actual === "visible",
+            hidden: actual === "hidden" || actual === "missing",
+            attached: count === 1,
+            detached: count === 0,
+            enabled: actual === "enabled",
+        }[spec.state];
+        return { ok, unsupported: false, actual, count };
+    };
+    const results = specs.map(check);
+    const deadline = performance.now() + timeoutMs;
+    const poll = () => {
+        let pending = false;
+        results.forEach((result, i) => {
+            if (result.ok || result.unsupported) return;
+            results[i] = check(specs[i]);
+            pending = pending || !results[i].ok;
+        });
+        if (!pending || performance.now() >= deadline) resolve(results);
+        else setTimeout(poll, 50);
+    };
+    if (results.every(r => r.ok || r.unsupported)) resolve(results);
+    else setTimeout(poll, 50);
+})
+"""
+
+HAS_TEXT_RE = re.compile(r":has-text\((['\"])(.*?)\1\)")
+# Playwright-only CSS extensions the in-page engine cannot evaluate
+PLAYWRIGHT_PSEUDO_RE = re.compile(r":(visible|text|text-is|text-matches|nth-match|left-of|right-of|above|below|near)\b")
+ENGINE_PREFIX_RE = re.compile(r"^[a-zA-Z][\w:-]*=")
+
+# (selector, state) pairs whose batched pass Playwright has agreed with, in this process
+_trusted = set()
+# Selectors the in-page engine got wrong; always left to Playwright
+_distrusted = set()
+
+
+def is_trusted(selector: str, state: str) -> bool:
+    return (selector, state) in _trusted
+
+
+def record_agreement(selector: str, state: str, agreed: bool):
+    """Remember whether Playwright confirmed a batched verdict for selector"""
+    if agreed:
+        _trusted.add((selector, state))
+    else:
+        _distrusted.add(selector)
+
+
+class Check:
+    """One expected state of one locator"""
+
+    def __init__(self, label: str, locator: Locator, state: str = "visible", selector: str = None):
+        if state not in STATES:
+            raise ValueError(f"Unknown state '{state}', expected one of {STATES}")
+        self.label = label
+        self.locator = locator
+        self.state = state
+        # Declared selector the locator was built from; None leaves the check to expect()
+        self.selector = selector
+
+
+def split_chain(selector: str) -> list:
+    """Split a selector on ' >> ', ignoring separators inside quotes"""
+    parts, current, quote, i = [], "", None, 0
+    while i < len(selector):
+        char = selector[i]
+        if quote:
+            if char == "\\" and i + 1 < len(selector):
+                current += selector[i:i + 2]
+                i += 2
+                continue
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif selector.startswith(" >> ", i):
+            parts.append(current)
+            current = ""
+            i += 4
+            continue
+        current += char
+        i += 1
+    parts.append(current)
+    return [p.strip() for p in parts]
+
+
+def parse_part(part: str):
+    """Steps for one chain part, or None if the in-page engine cannot evaluate it"""
+    if part.startswith("xpath="):
+        return [{"kind": "xpath", "value": part[6:]}]
+    if part.startswith(("//", "..", "(//")):
+        return [{"kind": "xpath", "value": part}]
+    if part.startswith("nth="):
+        try:
+            return [{"kind": "nth", "value": int(part[4:])}]
+        except ValueError:
+            return None
+    if part.startswith("text="):
+        text = part[5:]
+        if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+            return [{"kind": "text", "value": text[1:-1], "exact": True}]
+        if text.startswith("/"):
+            return None
+        return [{"kind": "text", "value": text, "exact": False}]
+    if part.startswith("css="):
+        part = part[4:]
+    elif ENGINE_PREFIX_RE.match(part):
+        return None
+    if PLAYWRIGHT_PSEUDO_RE.search(part):
+        return None
+    matches = list(HAS_TEXT_RE.finditer(part))
+    if not matches:
+        return [{"kind": "css", "value": part}]
+    # :has-text() is only supported on the last compound selector
+    tail = part[matches[0].start():]
+    if re.search(r"[\s>+~,]", HAS_TEXT_RE.sub("", tail)):
+        return None
+    steps = [{"kind": "css", "value": HAS_TEXT_RE.sub("", part) or "*"}]
+    steps += [{"kind": "has_text", "value": m.group(2), "exact": False} for m in matches]
+    return steps
+
+
+def parse_selector(selector: str):
+    """In-page engine steps for a Playwright selector, or None if unsupported"""
+    steps = []
+    for part in split_chain(selector):
+        parsed = parse_part(part) if part else None
+        if parsed is None:
+            return None
+        steps += parsed
+    return steps
+
+
+def steps_for(item):
+    """Steps for a check or fill's declared selector, or None if it must go through Playwright"""
+    if not item.selector or item.selector in _distrusted:
+        return None
+    return parse_selector(item.selector)
+
+
+# State -> expect() assertion and its extra arguments
+ASSERTIONS = {
+    "visible": ("to_be_visible", {}),
+    "hidden": ("to_be_hidden", {}),
+    "attached": ("to_be_attached", {}),
+    "detached": ("to_be_attached", {"attached": False}),
+    "enabled": ("to_be_enabled", {}),
+}
+
+
+async def confirm_async(check: Check, timeout: int):
+    """Re-check with Playwright's expect(); returns the failure message or None"""
+    name, kwargs = ASSERTIONS[check.state]
+    try:
+        await getattr(expect(check.locator), name)(timeout=timeout, **kwargs)
+    except AssertionError as error:
+        return str(error).strip().splitlines()[0]
+    return None
+
+
+def format_failures(failures: list, total: int) -> str:
+    """One combined diff for every failed check"""
+    lines = [f"{len(failures)} of {total} checks failed:"]
+    for check, actual in failures:
+        lines.append(f"  - {check.label}: expected {check.state}, got {actual}")
+    return "\n".join(lines)
+
+
+def plan(checks: list) -> tuple:
+    """Split checks into (batched, in-page specs, checks that need expect())"""
+    batched, specs, fallback = [], [], []
+    for check in checks:
+        steps = steps_for(check)
+        if steps is None:
+            fallback.append(check)
+        else:
+            batched.append(check)
+            specs.append({"steps": steps, "state": check.state})
+    return batched, specs, fallback
+
+
+def triage(batched: list, results: list, fallback: list) -> list:
+    """(check, actual) pairs the browser saw fail; unsupported checks join the fallback"""
+    if results is None:
+        # e.g. the page navigated mid-check; let expect() decide
+        fallback.extend(batched)
+        return []
+    suspects = []
+    for check, result in zip(batched, results):
+        if result["ok"]:
+            continue
+        if result["unsupported"]:
+            fallback.append(check)
+        else:
+            suspects.append((check, result["actual"]))
+    return suspects
+
+
+def first_passes(batched: list, results: list) -> list:
+    """Checks the browser passed whose selector and state Playwright has not confirmed yet"""
+    if not results:
+        return []
+    return [check for check, result in zip(batched, results)
+            if result["ok"] and not is_trusted(check.selector, check.state)]
+
+
+def verdict(checks: list, batched: list, confirmed: int, failures: list) -> dict:
+    if failures:
+        raise AssertionError(format_failures(failures, len(checks)))
+    return {"checks": len(checks), "batched": len(batched), "confirmed": confirmed}
+
+
+async def batch_expect_async(page, checks: list, timeout: int = DEFAULT_TIMEOUT) -> dict:
+    """Assert every check, raising one AssertionError that lists all failures"""
+    checks = list(checks)
+    batched, specs, fallback = plan(checks)
+    results = None
+    if specs:
+        try:
+            results = await page.evaluate(BATCH_JS, [specs, timeout])
+        except Error:
+            pass
+    unconfirmed = first_passes(batched, results)
+    suspects = triage(batched, results if specs else [], fallback)
+
+    failures = []
+    # A pass the engine has not been checked on yet must also pass in Playwright
+    for check in unconfirmed:
+        message = await confirm_async(check, CONFIRM_TIMEOUT)
+        record_agreement(check.selector, check.state, message is None)
+        if message:
+            failures.append((check, message))
+    # The browser already waited the full timeout for suspects; expect() only confirms the verdict
+    for check, actual in suspects:
+        if await confirm_async(check, CONFIRM_TIMEOUT):
+            failures.append((check, actual))
+    for check in fallback:
+        message = await confirm_async(check, timeout)
+        if message:
+            failures.append((check, message))
+    return verdict(checks, batched, len(unconfirmed) + len(suspects) + len(fallback), failures)
@@ -0,0 +1,276 @@
+"""
+Persistent browser server shared by local pytest runs.
+Python Playwright has no launch_server, so the Node driver bundled with the playwright package
+runs chromium.launchServer() as a detached daemon. Its websocket endpoint, pids and run count
+are kept in .browser_server.json. With --browser-server, the browser fixture connects to it
+instead of launching Chromium, so repeated runs skip the browser start-up. Contexts a run
+leaves open are closed by the server when the run disconnects.
+
+Before each run the server is health-checked (process alive, endpoint accepting connections)
+and restarted when it is unhealthy, after BROWSER_SERVER_MAX_RUNS runs, when the browser's
+process tree uses more than BROWSER_SERVER_MAX_MB of memory, or when the Playwright version or
+headless setting changed. When no server can be started, the fixture launches as usual.
+
+Usage:
+    pytest --browser-server                         # start or reuse the daemon
+    BROWSER_SERVER=1 pytest                         # same, via the environment
+    python -m utils.browser_server status
+    python -m utils.browser_server start | restart | stop
+"""
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from importlib.metadata import version
+from pathlib import Path
+from urllib.parse import urlsplit
+from playwright.sync_api import Error
+from utils import config as settings
+from utils.playwright_compat import driver_executable
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process lock outside POSIX; concurrent first runs may each start a server
+    fcntl = None
+
+# Runs in the bundled Node driver: launch the server, report where it listens, stop on SIGTERM
+SERVER_SCRIPT = """
+const playwright = require(process.env.PLAYWRIGHT_PACKAGE);
+(async () => {
+  const server = await playwright.chromium.launchServer({
+    headless: process.env.HEADLESS !== "0",
+    host: "127.0.0.1",
+  });
+  process.stdout.write(JSON.stringify({ ws_endpoint: server.wsEndpoint(), browser_pid: server.process().pid }) + "\\n");
+  const stop = () => server.close().finally(() => process.exit(0));
+  process.on("SIGTERM", stop);
+  process.on("SIGINT", stop);
+  server.process().on("exit", () => process.exit(1));
+})().catch(error => {
+  console.error(error.message);
+  process.exit(1);
+});
+"""
+START_TIMEOUT_S = 30
+CONNECT_TIMEOUT_MS = 5000
+
+
+def pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    with contextlib.suppress(ChildProcessError, AttributeError):
+        # Reap the server if this process started it, so it does not linger as a zombie
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def endpoint_open(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    """Whether the server's port accepts TCP connections"""
+    parts = urlsplit(ws_endpoint)
+    try:
+        with socket.create_connection((parts.hostname, parts.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def tree_rss_mb(root: int):
+    """Resident memory of a process and all its descendants in MiB, or None without /proc"""
+    proc = Path("/proc")
+    if not proc.is_dir():
+        return None
+    children, rss = {}, {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, ... rss is the 22nd
+        fields = stat[stat.rindex(")") + 2:].split()
+        pid = int(entry.name)
+        children.setdefault(int(fields[1]), []).append(pid)
+        rss[pid] = int(fields[21]) * page_size
+    total, pending = 0, [root]
+    while pending:
+        pid = pending.pop()
+        total += rss.get(pid, 0)
+        pending.extend(children.get(pid, ()))
+    return total / 2**20 if root in rss else None
+
+
+class BrowserServer:
+    """The daemon's state file, health checks and restart policy"""
+
+    def __init__(self, state_path: str = settings.BROWSER_SERVER_FILE, headless: bool = settings.HEADLESS,
+                 max_runs: int = settings.BROWSER_SERVER_MAX_RUNS, max_mb: int = settings.BROWSER_SERVER_MAX_MB):
+        self.state_path = Path(state_path)
+        self.headless = headless
+        self.max_runs = max_runs
+        self.max_mb = max_mb
+        # What happened on the last ensure(), for the terminal summary
+        self.status = None
+
+    # ==================== STATE ====================
+    def load(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, state: dict):
+        partial = self.state_path.with_suffix(".tmp")
+        partial.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(partial, self.state_path)
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Serialize checks and restarts of concurrent runs (parallel shards)"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.state_path.with_suffix(".lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ==================== HEALTH ====================
+    def healthy(self, state: dict) -> bool:
+        return bool(state.get("ws_endpoint")) and pid_alive(state.get("pid")) and endpoint_open(state["ws_endpoint"])
+
+    def restart_reason(self, state: dict, memory_mb=None):
+        """Why a server must be replaced before the next run, or None to reuse it"""
+        if not state:
+            return "not running"
+        if not self.healthy(state):
+            return "unhealthy"
+        if state.get("playwright") != version("playwright"):
+            return "playwright upgraded"
+        if state.get("headless") != self.headless:
+            return "headless setting changed"
+        if state.get("runs", 0) >= self.max_runs:
+            return f"{state['runs']} runs"
+        if memory_mb is not None and memory_mb > self.max_mb:
+            return f"{memory_mb:.0f} MiB used"
+        return None
+
+    # ==================== LIFECYCLE ====================
+    def start(self) -> dict:
+        """Start a detached server and wait for its endpoint; raises RuntimeError when it fails"""
+        node, cli = driver_executable()
+        env = {**os.environ, "PLAYWRIGHT_PACKAGE": str(Path(cli).parent), "HEADLESS": "1" if self.headless else "0"}
+        log = open(self.state_path.with_suffix(".log"), "ab")
+        process = subprocess.Popen(
+            [node, "-e", SERVER_SCRIPT], env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=log,
+            # Its own session, so the server outlives this run and Ctrl+C in the terminal
+            start_new_session=True,
+        )
+        log.close()
+        line = []
+        reader = threading.Thread(target=lambda: line.append(process.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(START_TIMEOUT_S)
+        process.stdout.close()
+        if not line or not line[0]:
+            process.kill()
+            raise RuntimeError(f"browser server did not start, see {self.state_path.with_suffix('.log')}")
+        state = {
+            **json.loads(line[0]),
+            "pid": process.pid,
+            "started": time.time(),
+            "runs": 0,
+            "playwright": version("playwright"),
+            "headless": self.headless,
+        }
+        self.save(state)
+        return state
+
+    def stop(self, state: dict = None):
+        state = self.load() if state is None else state
+        pid = state.get("pid")
+        if pid_alive(pid):
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + 5
+            while pid_alive(pid) and time.monotonic() < deadline:
+                time.sleep(0.05)
+        with contextlib.suppress(OSError):
+            self.state_path.unlink()
+
+    def ensure(self, force_restart: bool = False):
+        """Endpoint of a healthy server, restarting it if due; None when none can be started"""
+        with self.lock():
+            state = self.load()
+            memory = tree_rss_mb(state["browser_pid"]) if state.get("browser_pid") else None
+            reason = "forced" if force_restart else self.restart_reason(state, memory)
+            if reason:
+                self.stop(state)
+                try:
+                    state = self.start()
+                except (OSError, RuntimeError, ValueError) as e:
+                    self.status = f"unavailable ({e}), launched a browser instead"
+                    return None
+                self.status = f"started ({reason})"
+            else:
+                self.status = f"reused (run {state['runs'] + 1} of {self.max_runs}, {memory or 0:.0f} MiB)"
+            state["runs"] += 1
+            self.save(state)
+            return state["ws_endpoint"]
+
+    def connect(self, playwright):
+        """Browser connected to the server, restarting a server that refuses once; None to launch instead"""
+        for force_restart in (False, True):
+            endpoint = self.ensure(force_restart)
+            if endpoint is None:
+                return None
+            try:
+                return playwright.chromium.connect(endpoint, timeout=CONNECT_TIMEOUT_MS)
+            except Error:
+                continue
+        self.status = "refused connections, launched a browser instead"
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the persistent browser server")
+    parser.add_argument("command", choices=("status", "start", "restart", "stop"))
+    args = parser.parse_args(argv)
+    server = BrowserServer()
+    if args.command == "stop":
+        server.stop()
+        print("stopped")
+        return 0
+    if args.command in ("start", "restart"):
+        endpoint = server.ensure(force_restart=args.command == "restart")
+        print(f"{server.status}: {endpoint}" if endpoint else server.status)
+        return 0 if endpoint else 1
+    state = server.load()
+    if not state:
+        print("not running")
+        return 1
+    memory = tree_rss_mb(state["browser_pid"]) if state.get("browser_pid") else None
+    print(f"{state['ws_endpoint']} pid={state['pid']} runs={state['runs']} "
+          f"up {(time.time() - state['started']) / 60:.0f} min, {memory or 0:.0f} MiB, "
+          f"restart: {server.restart_reason(state, memory) or 'not due'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Bulk form filling: every field of a form set and verified in one browser round-trip.
+Fields are resolved by the in-page engine of utils.batch_expect from their declared selectors. Each value goes through the
+element's native value setter and is announced with input and change events, so the site's
+scripts react as they do to Playwright's fill(); the values are read back in the same pass,
+after every field is set. Fields the engine cannot resolve, elements that are not plain
+inputs or selects, values that did not stick, and fields marked typed (widgets that listen
+to key presses) are filled one by one through Playwright instead. As with the batched checks,
+the first batched fill of each selector is read back through Playwright; a selector the engine
+resolved to a different element is filled one by one from then on.
+"""
+from playwright.async_api import Error
+from utils.batch_expect import ENGINE_JS, is_trusted, record_agreement, steps_for
+
+FILL_JS = """
+(fields) => {
+""" + ENGINE_JS + """
+    const kinds = { INPUT: HTMLInputElement, TEXTAREA: HTMLTextAreaElement, SELECT: HTMLSelectElement };
+    const set = field => {
+        let els;
+        try {
+            els = resolveSteps(field.steps);
+        } catch (e) {
+            return { status: "unsupported", actual: String(e.message || e) };
+        }
+        if (els.length === 0) return { status: "missing", actual: null };
+        // Ambiguous locators are left to Playwright, which reports them as strict mode violations
+        if (els.length > 1) return { status: "unsupported", actual: els.length + " matches" };
+        const el = els[0];
+        const tag = el.tagName.toLowerCase();
+        const kind = kinds[el.tagName];
+        if (!kind || el.disabled || el.readOnly || ["checkbox", "radio", "file"].includes(el.type)) {
+            return { status: "unsupported", actual: tag, tag };
+        }
+        let value = field.value;
+        if (tag === "select") {
+            // Like select_option(): an option's value, else its label
+            const option = [...el.options].find(o => o.value === value) || [...el.options].find(o => norm(o.label) === value);
+            if (!option) return { status: "mismatch", actual: el.value, tag };
+            value = option.value;
+        }
+        el.focus();
+        // The prototype's setter, so frameworks tracking the value property notice the change
+        Object.getOwnPropertyDescriptor(kind.prototype, "value").set.call(el, value);
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        return { status: "set", expected: value, el, tag };
+    };
+    const results = fields.map(set);
+    // Read back only once everything is set: a later field's handlers may reset an earlier one
+    return results.map(({ el, expected, ...result }) => {
+        if (result.status !== "set") return result;
+        return { ...result, status: el.value === expected ? "ok" : "mismatch", actual: el.value };
+    });
+}
+"""
+
+
+class Fill:
+    """One value for one form field"""
+
+    def __init__(self, label: str, locator, value: str, typed: bool = False, optional: bool = False,
+                 selector: str = None):
+        self.label = label
+        self.locator = locator
+        self.value = value
+        # Declared selector the locator was built from; None fills the field through Playwright
+        self.selector = selector
+        # Type key by key instead of setting the value (widgets reacting to key events)
+        self.typed = typed
+        # Absent optional fields are skipped, like layout variants of the form
+        self.optional = optional
+
+
+def plan(fills: list) -> tuple:
+    """Split fills into (batched, in-page specs, fills done one by one)"""
+    batched, specs, fallback = [], [], []
+    for fill in fills:
+        steps = None if fill.typed else steps_for(fill)
+        if steps is None:
+            fallback.append((fill, None))
+        else:
+            batched.append(fill)
+            specs.append({"steps": steps, "value": fill.value})
+    return batched, specs, fallback
+
+
+def triage(batched: list, results: list, fallback: list) -> dict:
+    """Values the browser set and verified; everything else joins the fallback"""
+    if results is None:
+        # e.g. the page navigated mid-fill; fill those fields one by one
+        fallback.extend((fill, None) for fill in batched)
+        return {}
+    values = {}
+    for fill, result in zip(batched, results):
+        if result["status"] == "ok":
+            values[fill.label] = result["actual"]
+        elif not (result["status"] == "missing" and fill.optional):
+            fallback.append((fill, result.get("tag")))
+    return values
+
+
+async def fill_one(fill: Fill, tag: str = None) -> tuple:
+    """Fill one field through Playwright; returns (tag name, the value it ended with)"""
+    locator = fill.locator
+    if fill.typed:
+        await locator.clear()
+        await locator.press_sequentially(fill.value)
+        return "input", await locator.input_value()
+    if tag is None:
+        tag = (await locator.evaluate("el => el.tagName")).lower()
+    if tag == "select":
+        return tag, (await locator.select_option(fill.value))[0]
+    await locator.fill(fill.value)
+    return tag, await locator.input_value()
+
+
+def format_failures(failures: list, total: int) -> str:
+    lines = [f"{len(failures)} of {total} fields not filled:"]
+    for fill, actual in failures:
+        lines.append(f"  - {fill.label}: expected {fill.value!r}, got {actual!r}")
+    return "\n".join(lines)
+
+
+async def bulk_fill(page, fills: list) -> dict:
+    """Fill every field, raising one AssertionError that lists the fields whose value did not stick"""
+    fills = list(fills)
+    batched, specs, fallback = plan(fills)
+    results = None
+    if specs:
+        try:
+            results = await page.evaluate(FILL_JS, specs)
+        except Error:
+            pass
+    values = triage(batched, results if specs else [], fallback)
+    # The engine and Playwright must agree on the element before the engine is trusted with it
+    for fill in batched:
+        if fill.label not in values or is_trusted(fill.selector, "fill"):
+            continue
+        agreed = await fill.locator.input_value() == values[fill.label]
+        record_agreement(fill.selector, "fill", agreed)
+        if not agreed:
+            del values[fill.label]
+            fallback.append((fill, None))
+
+    failures = []
+    for fill, tag in fallback:
+        if fill.optional and await fill.locator.count() == 0:
+            continue
+        tag, actual = await fill_one(fill, tag)
+        values[fill.label] = actual
+        # A select reports the chosen option's value, which may differ from the label asked for
+        if tag != "select" and actual != fill.value:
+            failures.append((fill, actual))
+    if failures:
+        raise AssertionError(format_failures(failures, len(fills)))
+    return {"fields": len(fills), "batched": len(batched), "one_by_one": len(fallback), "values": values}
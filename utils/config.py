@@ -0,0 +1,89 @@
+"""
+Shared settings for the test framework.
+Values can be overridden with environment variables.
+"""
+import os
+
+# ==================== SITE ====================
+# Point at the local stand-in with BASE_URL=http://127.0.0.1:8000/ or pytest --local-site
+BASE_URL = os.environ.get("BASE_URL", "https://www.phptravels.net/")
+
+# ==================== BROWSER ====================
+VIEWPORT = {"width": 1920, "height": 1080}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+HEADLESS = os.environ.get("HEADLESS", "1") != "0"
+
+# ==================== CONTEXT POOL ====================
+# Number of warm browser contexts kept per worker process
+CONTEXT_POOL_SIZE = int(os.environ.get("CONTEXT_POOL_SIZE", "2"))
+
+# ==================== HAR RECORD/REPLAY ====================
+HAR_DIR = os.environ.get("HAR_DIR", "hars")
+HAR_FALLBACK = os.environ.get("HAR_FALLBACK", "stub")
+
+# ==================== RESOURCE POLICY ====================
+# "full", "structural" or "visual" (see utils/resource_policy.py)
+RESOURCE_PROFILE = os.environ.get("RESOURCE_PROFILE", "full")
+
+# ==================== PERFORMANCE ====================
+# Per-test page-load metrics are written here as JSON lines
+PERF_DIR = os.environ.get("PERF_DIR", "perf")
+# Record page-load metrics after every navigation; each record waits for the window load event
+PERF_METRICS = os.environ.get("PERF_METRICS", "0") == "1"
+# Record page-object steps and Playwright calls as spans; patches Playwright's classes for the whole process
+TRACE_STEPS = os.environ.get("TRACE_STEPS", "0") == "1"
+
+# ==================== FLAKE TRACKING ====================
+# SQLite history of every test result, shared by all runs on this machine
+FLAKE_DB = os.environ.get("FLAKE_DB", ".flakes.db")
+# "all", "stable" or "quarantine" (see utils/flakes.py)
+FLAKE_LANE = os.environ.get("FLAKE_LANE", "all")
+
+# ==================== SEARCH API ====================
+# Search requests learned from the UI, per host (see utils/search_api.py)
+SEARCH_API_FILE = os.environ.get("SEARCH_API_FILE", ".search_api.json")
+
+# ==================== SCREENSHOTS ====================
+# Content-addressed frames written in the background (see utils/screenshots.py)
+SCREENSHOT_DIR = os.environ.get("SCREENSHOT_DIR", "screenshots")
+SCREENSHOT_MAX_MB = int(os.environ.get("SCREENSHOT_MAX_MB", "200"))
+# "off", "failure" or "steps"
+SCREENSHOTS = os.environ.get("SCREENSHOTS", "failure")
+
+# ==================== VISUAL BASELINES ====================
+# Committed element baselines, one directory per target host (see utils/visual.py)
+VISUAL_BASELINE_DIR = os.environ.get("VISUAL_BASELINE_DIR", "visual_baselines")
+
+# ==================== FAILURE CAPTURE ====================
+# Trace, screencast and DOM of failing tests only (see utils/failure_capture.py)
+FAILURE_DIR = os.environ.get("FAILURE_DIR", "failures")
+FAILURE_MAX_MB = int(os.environ.get("FAILURE_MAX_MB", "500"))
+# Comma-separated: trace, video, dom (or none)
+FAILURE_ARTIFACTS = os.environ.get("FAILURE_ARTIFACTS", "trace,dom")
+# Seconds of screencast kept per page for the video artifact
+FAILURE_WINDOW_S = float(os.environ.get("FAILURE_WINDOW_S", "10"))
+
+# ==================== LINK CRAWLER ====================
+# Internal hops followed from the homepage and navigation links (see utils/link_crawler.py)
+LINK_CHECK_DEPTH = int(os.environ.get("LINK_CHECK_DEPTH", "1"))
+LINK_CHECK_CONCURRENCY = int(os.environ.get("LINK_CHECK_CONCURRENCY", "32"))
+# Requests per second across all contexts (0: no limit); keeps crawls of the live site polite
+LINK_CHECK_RATE = float(os.environ.get("LINK_CHECK_RATE", "20"))
+# Responses slower than this are reported
+LINK_SLOW_MS = float(os.environ.get("LINK_SLOW_MS", "1500"))
+
+# ==================== BROWSER SERVER ====================
+# Reuse a detached browser across local runs instead of launching one (see utils/browser_server.py)
+BROWSER_SERVER = os.environ.get("BROWSER_SERVER", "0") == "1"
+BROWSER_SERVER_FILE = os.environ.get("BROWSER_SERVER_FILE", ".browser_server.json")
+# The server is restarted after this many runs or above this much memory
+BROWSER_SERVER_MAX_RUNS = int(os.environ.get("BROWSER_SERVER_MAX_RUNS", "50"))
+BROWSER_SERVER_MAX_MB = int(os.environ.get("BROWSER_SERVER_MAX_MB", "2048"))
+
+
+def context_options() -> dict:
+    """Options used for every browser context created by the framework"""
+    return {
+        "viewport": dict(VIEWPORT),
+        "user_agent": USER_AGENT,
+    }
@@ -0,0 +1,147 @@
+"""
+Warm, recyclable browser context pool.
+One browser is launched per worker process and a few contexts are created up front.
+Each test leases a context, and the context is reset and returned to the pool afterwards.
+"""
+import time
+from collections import deque
+from playwright.sync_api import Browser, BrowserContext, Page, Error
+
+
+class PooledContext:
+    """A browser context and its primary page as handed out by the pool"""
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.broken = False
+        self.leases = 0
+        context.on("close", lambda _: self.mark_broken())
+        page.on("crash", lambda _: self.mark_broken())
+        page.on("close", lambda _: self.mark_broken())
+
+    def mark_broken(self):
+        """Flag the context so it is evicted instead of being reused"""
+        self.broken = True
+
+
+class PoolStats:
+    """Hit/miss counters and reset timings for a context pool"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reset_times = []
+
+    def record_reset(self, seconds: float):
+        self.reset_times.append(seconds)
+
+    def summary(self) -> dict:
+        """Return the stats as a plain dict (timings in milliseconds)"""
+        resets = len(self.reset_times)
+        total = sum(self.reset_times)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "resets": resets,
+            "reset_avg_ms": round(total / resets * 1000, 1) if resets else 0.0,
+            "reset_max_ms": round(max(self.reset_times) * 1000, 1) if resets else 0.0,
+        }
+
+
+class ContextPool:
+    """Pool of pre-created browser contexts sharing a single browser"""
+
+    def __init__(self, browser: Browser, size: int = 2, context_options: dict = None):
+        self.browser = browser
+        self.size = max(1, size)
+        self.context_options = context_options or {}
+        self.stats = PoolStats()
+        self._idle = deque()
+        self._leased = []
+        for _ in range(self.size):
+            self._idle.append(self._create())
+
+    def _create(self) -> PooledContext:
+        """Create a new context with one blank page"""
+        context = self.browser.new_context(**self.context_options)
+        page = context.new_page()
+        return PooledContext(context, page)
+
+    def acquire(self) -> PooledContext:
+        """Hand out a warm context, creating one if the pool is empty"""
+        while self._idle:
+            pooled = self._idle.popleft()
+            if pooled.broken:
+                self._evict(pooled)
+                continue
+            self.stats.hits += 1
+            break
+        else:
+            self.stats.misses += 1
+            pooled = self._create()
+        pooled.leases += 1
+        self._leased.append(pooled)
+        return pooled
+
+    def release(self, pooled: PooledContext):
+        """Reset a leased context and put it back, or evict it if it broke"""
+        if pooled in self._leased:
+            self._leased.remove(pooled)
+        if not pooled.broken:
+            start = time.perf_counter()
+            try:
+                self._reset(pooled)
+            except Error:
+                pooled.mark_broken()
+            else:
+                self.stats.record_reset(time.perf_counter() - start)
+        if pooled.broken:
+            self._evict(pooled)
+            # Keep the pool warm by replacing the evicted context
+            if len(self._idle) < self.size:
+                self._idle.append(self._create())
+            return
+        self._idle.append(pooled)
+
+    def _reset(self, pooled: PooledContext):
+        """Clear cookies, storage, permissions, routes and extra pages"""
+        context, page = pooled.context, pooled.page
+        for extra in context.pages:
+            if extra != page:
+                extra.close()
+        # Storage is per-origin, so clear it while the page is still on the test's origin
+        page.evaluate("""() => {
+            try { window.localStorage.clear(); } catch (e) {}
+            try { window.sessionStorage.clear(); } catch (e) {}
+        }""")
+        page.unroute_all(behavior="ignoreErrors")
+        context.unroute_all(behavior="ignoreErrors")
+        page.goto("about:blank")
+        context.clear_cookies()
+        context.clear_permissions()
+        context.set_extra_http_headers({})
+        viewport = self.context_options.get("viewport")
+        if viewport and page.viewport_size != viewport:
+            page.set_viewport_size(viewport)
+
+    def _evict(self, pooled: PooledContext):
+        """Close a context that can no longer be reused"""
+        self.stats.evictions += 1
+        try:
+            pooled.context.close()
+        except Error:
+            pass
+
+    def close(self):
+        """Close every context owned by the pool"""
+        while self._idle:
+            self._idle.popleft().context.close()
+        for pooled in self._leased:
+            try:
+                pooled.context.close()
+            except Error:
+                pass
+        self._leased = []
@@ -0,0 +1,258 @@
+"""
+Failure-only capture: a trace, a short screencast and a DOM dump of every failing test.
+Tracing is started once per (pooled) context and every test runs in its own trace chunk; the
+chunk of a passing test is discarded without being written, a failing test's chunk is saved.
+The screencast keeps only the last few seconds of JPEG frames per page in a ring buffer
+(Chromium only). Each failure gets a directory in failures/, and the oldest directories are
+evicted to keep the whole directory under a size limit.
+
+Artifacts (--failure-artifacts, comma-separated):
+    trace   Playwright trace of the test (npx playwright show-trace .../trace.zip)
+    video   last --failure-window seconds of the page as MJPEG (ffplay, VLC)
+    dom     HTML of the page when the test failed, gzipped
+    none    nothing
+
+Usage:
+    pytest --failure-artifacts trace,dom                # default
+    pytest --failure-artifacts trace,video,dom --failure-window 15 --failure-max-mb 300
+    python -m utils.failure_capture                     # failures on disk, newest last
+"""
+import argparse
+import base64
+import collections
+import gzip
+import re
+import shutil
+import sys
+import time
+import weakref
+from pathlib import Path
+import pytest
+from playwright.sync_api import Error
+from utils import config as settings
+
+ARTIFACTS = ("trace", "video", "dom")
+# Screencast frames are scaled down and every other repaint is skipped to keep the ring small
+SCREENCAST = {"format": "jpeg", "quality": 60, "maxWidth": 1280, "maxHeight": 720, "everyNthFrame": 2}
+# Upper bound of frames per page whatever the window, in case the page repaints constantly
+MAX_FRAMES = 600
+# Page a test runs on, from its call until its call report
+FAILURE_PAGE_KEY = pytest.StashKey[object]()
+
+
+def parse_artifacts(value: str) -> tuple:
+    """Artifact names of a --failure-artifacts value"""
+    names = tuple(name.strip() for name in value.split(",") if name.strip() and name.strip() != "none")
+    unknown = set(names) - set(ARTIFACTS)
+    if unknown:
+        raise ValueError(f"unknown failure artifacts: {', '.join(sorted(unknown))} (choose from {', '.join(ARTIFACTS)})")
+    return names
+
+
+def directory_name(nodeid: str, when: float) -> str:
+    """Failure directory name: sortable timestamp, then the test id made file-system safe"""
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(when)) + f"-{int(when * 1000) % 1000:03d}"
+    return f"{stamp}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', nodeid).strip('_')[:120]}"
+
+
+class FrameRing:
+    """Screencast frames of the last window seconds, oldest dropped first"""
+
+    def __init__(self, window: float = settings.FAILURE_WINDOW_S, max_frames: int = MAX_FRAMES):
+        self.window = window
+        self.frames = collections.deque(maxlen=max_frames)
+
+    def push(self, data: bytes, timestamp: float):
+        self.frames.append((timestamp, data))
+        while self.frames and self.frames[0][0] < timestamp - self.window:
+            self.frames.popleft()
+
+    def clear(self):
+        self.frames.clear()
+
+    def mjpeg(self) -> bytes:
+        """Frames concatenated as Motion JPEG"""
+        return b"".join(data for _, data in self.frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class FailureStore:
+    """Directory of failure captures kept under a size limit, oldest evicted first"""
+
+    def __init__(self, directory: str = settings.FAILURE_DIR, max_bytes: int = settings.FAILURE_MAX_MB * 2**20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = {"saved": 0, "bytes_written": 0, "evicted": 0}
+
+    def new(self, nodeid: str) -> Path:
+        target = self.directory / directory_name(nodeid, time.time())
+        target.mkdir(parents=True, exist_ok=True)
+        return target
+
+    def entries(self) -> list:
+        """Failure directories, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(p for p in self.directory.iterdir() if p.is_dir())
+
+    @staticmethod
+    def size(entry: Path) -> int:
+        return sum(p.stat().st_size for p in entry.rglob("*") if p.is_file())
+
+    def disk_usage(self) -> int:
+        return sum(self.size(entry) for entry in self.entries())
+
+    def saved(self, entry: Path):
+        """Account for a written failure and evict the oldest ones beyond the limit"""
+        self.stats["saved"] += 1
+        self.stats["bytes_written"] += self.size(entry)
+        entries = self.entries()
+        total = sum(self.size(e) for e in entries)
+        for old in entries:
+            # The newest failure is always kept, even when it alone exceeds the limit
+            if total <= self.max_bytes or old == entry:
+                break
+            total -= self.size(old)
+            shutil.rmtree(old, ignore_errors=True)
+            self.stats["evicted"] += 1
+
+
+class FailureRecorder:
+    """Keeps the rolling captures of the pages under test and writes them out for failures"""
+
+    def __init__(self, store: FailureStore, artifacts: tuple = ("trace", "dom"), window: float = settings.FAILURE_WINDOW_S):
+        self.store = store
+        self.artifacts = artifacts
+        self.window = window
+        self._traced = weakref.WeakSet()
+        self._chunked = weakref.WeakSet()
+        self._screencasts = weakref.WeakKeyDictionary()
+
+    def start(self, page):
+        """Begin a test on page: a fresh trace chunk and, in video mode, a running screencast"""
+        context = page.context
+        if "trace" in self.artifacts:
+            if context not in self._traced:
+                # Tracing stays on for the life of the context; tests only open and close chunks
+                context.tracing.start(screenshots=True, snapshots=True, sources=False)
+                self._traced.add(context)
+            context.tracing.start_chunk()
+            self._chunked.add(context)
+        if "video" in self.artifacts:
+            if page in self._screencasts:
+                # Frames of the previous test on a pooled page are not this test's
+                self._screencasts[page].clear()
+            else:
+                self._screencast(page)
+
+    def _screencast(self, page):
+        try:
+            session = page.context.new_cdp_session(page)
+        except Error:
+            # Not Chromium: no screencast, the other artifacts still work
+            return
+        ring = FrameRing(self.window)
+
+        def on_frame(event):
+            ring.push(base64.b64decode(event["data"]), event["metadata"].get("timestamp", time.time()))
+            try:
+                session.send("Page.screencastFrameAck", {"sessionId": event["sessionId"]})
+            except Error:
+                pass
+
+        session.on("Page.screencastFrame", on_frame)
+        session.send("Page.startScreencast", SCREENCAST)
+        self._screencasts[page] = ring
+
+    def finish(self, nodeid: str, page, failed: bool):
+        """End a test on page; returns the failure directory when one was written"""
+        context = page.context
+        target = self.store.new(nodeid) if failed else None
+        if context in self._chunked:
+            self._chunked.discard(context)
+            try:
+                # Without a path the chunk is dropped, so passing tests cost no disk
+                context.tracing.stop_chunk(path=target / "trace.zip" if target else None)
+            except Error:
+                pass
+        ring = self._screencasts.get(page)
+        if target is None:
+            return None
+        if ring:
+            (target / "screencast.mjpeg").write_bytes(ring.mjpeg())
+        if "dom" in self.artifacts and not page.is_closed():
+            try:
+                (target / "dom.html.gz").write_bytes(gzip.compress(page.content().encode("utf-8")))
+            except Error:
+                pass
+        self.store.saved(target)
+        return target
+
+
+class FailureCapture:
+    """pytest plugin running every test body inside a rolling capture of its page"""
+
+    def __init__(self, recorder: FailureRecorder):
+        self.recorder = recorder
+        self.failures = []
+
+    @staticmethod
+    def page_of(item):
+        page = item.funcargs.get("page")
+        home = item.funcargs.get("home_page")
+        page = page or getattr(home, "page", None)
+        return None if page is None or page.is_closed() else page
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        page = self.page_of(item)
+        if page is not None:
+            try:
+                self.recorder.start(page)
+            except Error:
+                page = None
+        item.stash[FAILURE_PAGE_KEY] = page
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        page = item.stash.get(FAILURE_PAGE_KEY, None)
+        if report.when != "call" or page is None:
+            return
+        # The page is still leased here: fixtures are only torn down after the call report
+        target = self.recorder.finish(item.nodeid, page, report.failed)
+        if target is not None:
+            self.failures.append(target)
+            report.sections.append(("failure artifacts", str(target)))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.failures:
+            return
+        store = self.recorder.store
+        terminalreporter.section("failure artifacts")
+        for target in self.failures:
+            if target.exists():
+                terminalreporter.write_line(f"{target}  {', '.join(sorted(p.name for p in target.iterdir()))}")
+        terminalreporter.write_line(
+            f"{store.stats['saved']} saved ({store.stats['bytes_written'] / 2**20:.1f} MiB), "
+            f"{store.stats['evicted']} evicted, {store.disk_usage() / 2**20:.1f} MiB in {store.directory}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the failure captures on disk")
+    parser.add_argument("--dir", default=settings.FAILURE_DIR)
+    args = parser.parse_args(argv)
+    store = FailureStore(args.dir)
+    for entry in store.entries():
+        print(f"{entry}  {store.size(entry) / 1024:.0f} KiB  {', '.join(sorted(p.name for p in entry.iterdir()))}")
+    print(f"{len(store.entries())} failures, {store.disk_usage() / 2**20:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Flake tracker: every test's outcome, duration and retry count across runs, in SQLite.
+Tests that keep recovering from failures (or that only pass on retry) get a flakiness score;
+tests scoring above the threshold are quarantined automatically. A test that passed and then
+fails every run is a regression, not a flake, and scores 0. Quarantined tests are retried;
+stable tests run once. A quarantined test is released once its score falls back below the
+release threshold.
+
+Lanes (--flake-lane):
+    all         every test; quarantined ones retried, failures still block the run (default)
+    stable      quarantined tests deselected: the fast, blocking CI lane
+    quarantine  only quarantined tests, retried, failures reported as xfail (non-blocking)
+
+Usage:
+    pytest --flake-lane stable
+    python -m utils.flakes              # flakiest tests and the quarantine
+    python -m utils.flakes --top 50
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+import pytest
+from _pytest.runner import runtestprotocol
+
+FLAKE_DB = ".flakes.db"
+LANES = ("all", "stable", "quarantine")
+# Results per test considered when scoring
+WINDOW = 30
+# Results needed before a test can be scored
+MIN_RESULTS = 5
+# Quarantine above this score, release below the lower one (hysteresis against toggling)
+QUARANTINE_SCORE = 0.2
+RELEASE_SCORE = 0.05
+# Recoveries (fail then pass, or a pass after retries) needed before a test counts as flaky
+MIN_RECOVERIES = 2
+# Extra attempts for quarantined tests
+QUARANTINE_RETRIES = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    lane TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, run_id);
+CREATE TABLE IF NOT EXISTS quarantine (
+    nodeid TEXT PRIMARY KEY,
+    since REAL NOT NULL,
+    score REAL NOT NULL
+);
+"""
+
+
+def flakiness(results: list):
+    """Share of consecutive results that recovered from a failure; a pass that needed retries counts too
+
+    results are (outcome, retries) pairs, oldest first; skips are ignored. Passing and then
+    failing from some run on is a regression rather than a flake, so a test scores 0 until it
+    recovered at least MIN_RECOVERIES times. Returns None while there are too few results to judge.
+    """
+    scored = [(outcome, retries) for outcome, retries in results if outcome in ("passed", "failed")]
+    if len(scored) < MIN_RESULTS:
+        return None
+    recoveries = sum(1 for (a, _), (b, _) in zip(scored, scored[1:]) if a == "failed" and b == "passed")
+    recoveries += sum(1 for outcome, retries in scored if outcome == "passed" and retries)
+    if recoveries < MIN_RECOVERIES:
+        return 0.0
+    return min(1.0, recoveries / (len(scored) - 1))
+
+
+class FlakeStore:
+    """SQLite history of test results and the current quarantine"""
+
+    def __init__(self, path: str = FLAKE_DB):
+        self.path = path
+        # Parallel shards write to the same database
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def quarantined(self) -> dict:
+        return dict(self.db.execute("SELECT nodeid, score FROM quarantine"))
+
+    def history(self, nodeid: str, window: int = WINDOW) -> list:
+        """(outcome, retries) of a test's latest results, oldest first"""
+        rows = self.db.execute(
+            "SELECT outcome, retries FROM results WHERE nodeid = ? ORDER BY run_id DESC LIMIT ?",
+            (nodeid, window),
+        ).fetchall()
+        return rows[::-1]
+
+    def record_run(self, results: dict, lane: str = "all") -> dict:
+        """Store one run's results and update the quarantine; returns {"quarantined": [...], "released": [...]}"""
+        changes = {"quarantined": [], "released": []}
+        with self.db:
+            run_id = self.db.execute(
+                "INSERT INTO runs (started, lane) VALUES (?, ?)", (time.time(), lane)
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO results (run_id, nodeid, outcome, duration, retries) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, nodeid, r["outcome"], r["duration"], r["retries"]) for nodeid, r in results.items()],
+            )
+            quarantined = self.quarantined()
+            for nodeid in results:
+                score = flakiness(self.history(nodeid))
+                if score is None:
+                    continue
+                if nodeid in quarantined:
+                    if score < RELEASE_SCORE:
+                        self.db.execute("DELETE FROM quarantine WHERE nodeid = ?", (nodeid,))
+                        changes["released"].append(nodeid)
+                    else:
+                        self.db.execute("UPDATE quarantine SET score = ? WHERE nodeid = ?", (score, nodeid))
+                elif score >= QUARANTINE_SCORE:
+                    self.db.execute(
+                        "INSERT INTO quarantine (nodeid, since, score) VALUES (?, ?, ?)", (nodeid, time.time(), score)
+                    )
+                    changes["quarantined"].append(nodeid)
+        return changes
+
+    def report(self, top: int = 20) -> list:
+        """Flakiest tests: nodeid, score, results, failure rate, median duration, quarantined"""
+        quarantined = self.quarantined()
+        rows = []
+        for (nodeid,) in self.db.execute("SELECT DISTINCT nodeid FROM results"):
+            history = self.history(nodeid)
+            durations = [d for (d,) in self.db.execute(
+                "SELECT duration FROM results WHERE nodeid = ? ORDER BY run_id DESC LIMIT ?", (nodeid, WINDOW))]
+            failures = sum(1 for outcome, _ in history if outcome == "failed")
+            score = flakiness(history)
+            rows.append({
+                "nodeid": nodeid,
+                "score": None if score is None else round(score, 3),
+                "results": len(history),
+                "failure_rate": round(failures / len(history), 3) if history else 0.0,
+                "median_s": round(statistics.median(durations), 2) if durations else None,
+                "quarantined": nodeid in quarantined,
+            })
+        rows.sort(key=lambda r: (r["quarantined"], r["score"] or 0.0, r["failure_rate"]), reverse=True)
+        return rows[:top]
+
+
+def select_lane(items: list, quarantined: dict, lane: str) -> tuple:
+    """Split collected items into (selected, deselected) for a lane"""
+    if lane == "all":
+        return list(items), []
+    wanted = lane == "quarantine"
+    selected = [item for item in items if (item.nodeid in quarantined) == wanted]
+    deselected = [item for item in items if (item.nodeid in quarantined) != wanted]
+    return selected, deselected
+
+
+class FlakeTracker:
+    """pytest plugin recording every result and retrying quarantined tests"""
+
+    def __init__(self, store: FlakeStore, lane: str = "all", retries: int = QUARANTINE_RETRIES):
+        self.store = store
+        self.lane = lane
+        self.retries = retries
+        self.quarantined = store.quarantined()
+        self.results = {}
+        self.changes = {"quarantined": [], "released": []}
+
+    def pytest_collection_modifyitems(self, config, items):
+        for item in items:
+            if item.nodeid in self.quarantined:
+                item.add_marker(pytest.mark.quarantined)
+        selected, deselected = select_lane(items, self.quarantined, self.lane)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if item.nodeid not in self.quarantined:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for attempt in range(self.retries + 1):
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            if not any(report.failed for report in reports):
+                break
+        self.results[item.nodeid] = {
+            "outcome": outcome_of(reports),
+            "duration": sum(report.duration for report in reports),
+            "retries": attempt,
+        }
+        for report in reports:
+            if report.failed and self.lane == "quarantine":
+                # Only the quarantine lane is non-blocking; elsewhere a test failing every attempt fails the run
+                report.outcome = "skipped"
+                report.wasxfail = f"quarantined (score {self.quarantined[item.nodeid]:.2f}, {attempt + 1} attempts)"
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        if report.nodeid in self.quarantined:
+            return
+        result = self.results.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0, "retries": 0})
+        result["duration"] += report.duration
+        if report.failed:
+            result["outcome"] = "failed"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+
+    def pytest_sessionfinish(self, session):
+        if self.results:
+            self.changes = self.store.record_run(self.results, self.lane)
+        self.store.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not (self.quarantined or self.changes["quarantined"] or self.changes["released"]):
+            return
+        terminalreporter.section("flaky tests")
+        for nodeid, score in sorted(self.quarantined.items(), key=lambda q: -q[1]):
+            result = self.results.get(nodeid)
+            status = f"{result['outcome']} after {result['retries']} retries" if result else "not run"
+            terminalreporter.write_line(f"quarantined {score:.2f} {nodeid}: {status}")
+        for nodeid in self.changes["quarantined"]:
+            terminalreporter.write_line(f"newly quarantined: {nodeid}")
+        for nodeid in self.changes["released"]:
+            terminalreporter.write_line(f"released: {nodeid}")
+
+
+def outcome_of(reports: list) -> str:
+    if any(report.failed for report in reports):
+        return "failed"
+    if any(report.skipped for report in reports):
+        return "skipped"
+    return "passed"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the flakiest tests and the quarantine")
+    parser.add_argument("--db", default=FLAKE_DB)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+    store = FlakeStore(args.db)
+    print(f"{'score':>6} {'runs':>5} {'fail%':>6} {'median s':>9}  test")
+    for row in store.report(args.top):
+        flag = "Q " if row["quarantined"] else "  "
+        median = "-" if row["median_s"] is None else f"{row['median_s']:.2f}"
+        score = "-" if row["score"] is None else f"{row['score']:.2f}"
+        print(f"{score:>6} {row['results']:>5} {row['failure_rate'] * 100:>5.0f}% {median:>9}  {flag}{row['nodeid']}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
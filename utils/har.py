@@ -0,0 +1,128 @@
+"""
+HAR record/replay for running the suite against phptravels.net snapshots.
+--record captures one HAR archive per test (page load plus its search flow).
+--replay serves every request from those archives through context routing,
+so navigation is fast, deterministic and works without network access.
+"""
+import base64
+import json
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+from playwright.sync_api import BrowserContext, Route
+
+FALLBACK_POLICIES = ("stub", "abort", "network")
+
+# Empty bodies served for unmatched requests in "stub" mode, by resource type
+STUB_RESPONSES = {
+    "document": (404, "text/html", "<html><body><h1>Not Found</h1></body></html>"),
+    "script": (200, "application/javascript", ""),
+    "stylesheet": (200, "text/css", ""),
+    "xhr": (200, "application/json", "{}"),
+    "fetch": (200, "application/json", "{}"),
+}
+
+# Headers that no longer match the decoded body stored in the archive
+SKIPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+def har_name(nodeid: str) -> str:
+    """Turn a pytest node id into a file-system friendly archive name"""
+    name = nodeid.split("::", 1)[-1]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+def _path_key(method: str, url: str) -> tuple:
+    """Lookup key used when an exact URL is not in any archive (query string ignored)"""
+    parts = urlsplit(url)
+    return method.upper(), parts.scheme, parts.netloc, parts.path
+
+
+class HarArchive:
+    """Records and replays per-test HAR archives under a directory"""
+
+    def __init__(self, har_dir: str, mode: str = "live", fallback: str = "stub"):
+        if fallback not in FALLBACK_POLICIES:
+            raise ValueError(f"Unknown HAR fallback policy: {fallback}")
+        self.har_dir = Path(har_dir)
+        self.mode = mode
+        self.fallback = fallback
+        self._index = None
+        self.stats = {"fallback_hits": 0, "fallback_misses": 0}
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def path_for(self, nodeid: str) -> Path:
+        """Archive path for a test: <har_dir>/<module>/<test>.har"""
+        module = Path(nodeid.split("::", 1)[0]).stem
+        return self.har_dir / module / f"{har_name(nodeid)}.har"
+
+    # ==================== RECORD ====================
+    def record(self, context: BrowserContext, nodeid: str) -> Path:
+        """Capture all traffic of the context; the archive is written when the context closes"""
+        path = self.path_for(nodeid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        context.route_from_har(path, update=True, update_content="embed", update_mode="minimal")
+        return path
+
+    # ==================== REPLAY ====================
+    def replay(self, context: BrowserContext, nodeid: str):
+        """Serve the context's requests from the test's archive, falling back to any archive"""
+        # Routes run in reverse registration order, so the fallback goes first
+        context.route("**/*", self._handle_unmatched)
+        path = self.path_for(nodeid)
+        if path.exists():
+            context.route_from_har(path, not_found="fallback")
+
+    def _handle_unmatched(self, route: Route):
+        """Serve a request that the test's own archive does not contain"""
+        request = route.request
+        entry = self.index().get(_path_key(request.method, request.url))
+        if entry is not None:
+            self.stats["fallback_hits"] += 1
+            route.fulfill(**self._fulfill_args(entry))
+            return
+        self.stats["fallback_misses"] += 1
+        if self.fallback == "network":
+            route.fallback()
+        elif self.fallback == "abort":
+            route.abort()
+        else:
+            status, content_type, body = STUB_RESPONSES.get(request.resource_type, (204, "text/plain", ""))
+            route.fulfill(status=status, content_type=content_type, body=body)
+
+    def index(self) -> dict:
+        """(method, scheme, host, path) -> entry, built lazily from every archive on disk"""
+        if self._index is None:
+            self._index = {}
+            for path in sorted(self.har_dir.rglob("*.har")):
+                with open(path, encoding="utf-8") as f:
+                    entries = json.load(f).get("log", {}).get("entries", [])
+                for entry in entries:
+                    request = entry["request"]
+                    self._index.setdefault(_path_key(request["method"], request["url"]), entry)
+        return self._index
+
+    @staticmethod
+    def _fulfill_args(entry: dict) -> dict:
+        """Convert a HAR entry into Route.fulfill keyword arguments"""
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(text)
+        else:
+            body = text.encode("utf-8")
+        headers = {
+            h["name"]: h["value"]
+            for h in response.get("headers", [])
+            if h["name"].lower() not in SKIPPED_HEADERS
+        }
+        # Aborted requests are archived with status 0
+        return {"status": response.get("status") or 200, "headers": headers, "body": body}
@@ -0,0 +1,242 @@
+"""
+Test impact analysis for page-object changes.
+Every run records which page-object locators and methods each test touches (e.g.
+"HomePageLocators.flights_tab", "HomePage.click_tab"); with --impact, the git diff of models/
+is mapped onto those symbols and only the tests that touched a changed one are selected.
+Tests missing from the map, and any change outside a class member, select everything that
+could be affected, so the selection errs on the side of running a test. Only public coroutine
+methods and locator declarations are ever recorded; a change to any other member (__init__,
+private helpers, properties, sync methods) selects every test of its class, or every test when
+the class has no recorded members at all (e.g. LocatorDef).
+
+Async page objects and their sync wrappers share symbols: a change to AsyncHomePage.click_tab
+or HomePage.click_tab both select the tests that called click_tab.
+
+Usage:
+    pytest --impact                         # changes since HEAD (uncommitted work)
+    pytest --impact --impact-base main      # changes since main
+    python -m utils.impact --base main      # list affected tests without running them
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+IMPACT_FILE = ".impact_map.json"
+MODELS_DIR = "models"
+# Changed symbol meaning "anything may be affected"
+EVERYTHING = "*"
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Symbols touched by the running test; None while nothing is being recorded
+_touched = None
+
+
+def touch(symbol: str):
+    """Record that the running test used a page-object symbol"""
+    if _touched is not None:
+        _touched.add(symbol)
+
+
+def symbol_name(class_name: str, member: str) -> str:
+    return f"{class_name.removeprefix('Async')}.{member}"
+
+
+# ==================== IMPACT MAP ====================
+def load_map(path: str = IMPACT_FILE) -> dict:
+    """Recorded nodeid -> touched symbols, or an empty dict if nothing was recorded yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_map(impact_map: dict, path: str = IMPACT_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(impact_map, f, indent=1, sort_keys=True)
+
+
+class ImpactRecorder:
+    """pytest plugin recording the page-object symbols each test touches"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.latest = {}
+        self.failed = set()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        global _touched
+        _touched = self.latest.setdefault(item.nodeid, set())
+        try:
+            yield
+        finally:
+            _touched = None
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        if not self.latest:
+            return
+        impact_map = load_map(self.path)
+        for nodeid, symbols in self.latest.items():
+            previous = set()
+            if nodeid in self.failed:
+                if nodeid not in impact_map:
+                    # Stopped early with nothing to go on: stay unknown, so it is always selected
+                    continue
+                # A failing test may have stopped early, so keep what earlier runs saw it touch
+                previous = set(impact_map[nodeid])
+            impact_map[nodeid] = sorted(symbols | previous)
+        save_map(impact_map, self.path)
+
+
+# ==================== GIT DIFF ====================
+def git(*args) -> str:
+    result = subprocess.run(["git", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def changed_lines(diff: str) -> dict:
+    """path -> (removed line numbers in the old file, added line numbers in the new file)"""
+    changes, path = {}, None
+    for line in diff.splitlines():
+        if line.startswith("diff --git"):
+            path = line.split(" b/", 1)[1]
+            changes[path] = (set(), set())
+        match = HUNK_RE.match(line)
+        if match and path:
+            old_start, old_count, new_start, new_count = match.groups()
+            old_count = 1 if old_count is None else int(old_count)
+            new_count = 1 if new_count is None else int(new_count)
+            changes[path][0].update(range(int(old_start), int(old_start) + old_count))
+            changes[path][1].update(range(int(new_start), int(new_start) + new_count))
+    return changes
+
+
+def is_recorded(stmt, name: str) -> bool:
+    """Whether touch() ever records this member: a public step coroutine, or a declared locator
+    or synced wrapper (a class attribute built by a call such as HEADER(...) or synced(...))"""
+    if name.startswith("_"):
+        return False
+    if isinstance(stmt, ast.AsyncFunctionDef):
+        return not stmt.decorator_list
+    value = getattr(stmt, "value", None)
+    return isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+
+
+def member_spans(source: str) -> tuple:
+    """(symbol, first line, last line, recorded) for class members, plus each class's own span
+    as (Cls.*, first line, last line, whether any member of the class is recorded)"""
+    members, classes = [], []
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        class_members = []
+        for stmt in node.body:
+            names = []
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                names = [stmt.name]
+            elif isinstance(stmt, ast.Assign):
+                names = [t.id for t in stmt.targets if isinstance(t, ast.Name)]
+            elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                names = [stmt.target.id]
+            first = min([stmt.lineno] + [d.lineno for d in getattr(stmt, "decorator_list", [])])
+            class_members += [(symbol_name(node.name, name), first, stmt.end_lineno, is_recorded(stmt, name))
+                              for name in names]
+        members += class_members
+        classes.append((symbol_name(node.name, EVERYTHING), node.lineno, node.end_lineno,
+                        any(recorded for *_, recorded in class_members)))
+    return members, classes
+
+
+def symbols_for_lines(source: str, lines: set) -> set:
+    """Symbols whose definition covers any of the given lines"""
+    if not lines:
+        return set()
+    try:
+        members, classes = member_spans(source)
+    except SyntaxError:
+        return {EVERYTHING}
+    text = source.splitlines()
+    symbols = set()
+    for line in lines:
+        if line > len(text) or not text[line - 1].strip() or text[line - 1].strip().startswith("#"):
+            # Pure blank or comment lines change no behaviour
+            continue
+        member = next((m for m in members if m[1] <= line <= m[2]), None)
+        cls = next((c for c in classes if c[1] <= line <= c[2]), None)
+        if member is not None and member[3]:
+            symbols.add(member[0])
+        elif cls is not None and cls[3]:
+            # Never recorded itself (constructor, helper, property...): every test of the class
+            symbols.add(cls[0])
+        else:
+            # Module code, or a class no test ever records a symbol of
+            symbols.add(EVERYTHING)
+    return symbols
+
+
+def changed_symbols(base: str = "HEAD", directory: str = MODELS_DIR) -> set:
+    """Page-object symbols changed between base and the working tree"""
+    symbols = set()
+    untracked = git("ls-files", "--others", "--exclude-standard", "--", directory).split()
+    if any(path.endswith(".py") for path in untracked):
+        # A new module can change anything that imports it
+        symbols.add(EVERYTHING)
+    for path, (removed, added) in changed_lines(git("diff", "-U0", base, "--", directory)).items():
+        if not path.endswith(".py"):
+            continue
+        try:
+            old_source = git("show", f"{base}:{path}")
+        except RuntimeError:
+            old_source = ""
+        new_source = Path(path).read_text(encoding="utf-8") if Path(path).exists() else ""
+        symbols |= symbols_for_lines(old_source, removed) | symbols_for_lines(new_source, added)
+    return symbols
+
+
+def is_affected(touched: list, changed: set) -> bool:
+    if EVERYTHING in changed:
+        return True
+    classes = {symbol[:-len(EVERYTHING)] for symbol in changed if symbol.endswith("." + EVERYTHING)}
+    return any(symbol in changed or symbol.startswith(tuple(classes)) for symbol in touched)
+
+
+def select_affected(nodeids: list, impact_map: dict, changed: set) -> tuple:
+    """Split node ids into (affected, unaffected); tests never recorded count as affected"""
+    affected, unaffected = [], []
+    for nodeid in nodeids:
+        if nodeid not in impact_map or is_affected(impact_map[nodeid], changed):
+            affected.append(nodeid)
+        else:
+            unaffected.append(nodeid)
+    return affected, unaffected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the tests affected by page-object changes")
+    parser.add_argument("--base", default="HEAD", help="git revision to diff the working tree against")
+    parser.add_argument("--map", default=IMPACT_FILE)
+    args = parser.parse_args(argv)
+    changed = changed_symbols(args.base)
+    impact_map = load_map(args.map)
+    affected, unaffected = select_affected(sorted(impact_map), impact_map, changed)
+    print(f"changed: {', '.join(sorted(changed)) or 'nothing'}")
+    for nodeid in affected:
+        print(nodeid)
+    print(f"{len(affected)} of {len(impact_map)} recorded tests affected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
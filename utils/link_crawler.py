@@ -0,0 +1,309 @@
+"""
+Concurrent link crawler.
+Starts from the homepage and the HomePage navigation links, follows internal links breadth
+first to a given depth and checks every distinct URL once. Requests go through a pool of
+keep-alive request contexts (no browser), bounded by a concurrency limit and a request rate.
+Pages that are expanded are fetched with GET; leaf links are checked with HEAD and re-checked
+with GET when HEAD fails (servers that reject HEAD, or to confirm a broken link). Redirects
+are followed hop by hop so the whole chain is reported.
+
+The report lists broken links (with the pages linking to them), redirect chains and slow
+responses. External links are listed but only checked with --external; bot walls (401, 403,
+429, 999) on external hosts are reported as unverified rather than broken.
+
+Usage:
+    python -m utils.link_crawler --local-site --catalog-size 400 --depth 3
+    python -m utils.link_crawler --base-url https://www.phptravels.net/ --depth 1 --rate 10 --external
+    python -m utils.link_crawler --local-site --json links.json
+"""
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import json
+import sys
+import time
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit
+from playwright.async_api import Error, async_playwright
+from utils import config as settings
+from utils.local_site import LocalSite, LocalSiteConfig
+
+SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "data:")
+# Statuses sites answer crawlers with instead of the page
+BOT_BLOCKED = (401, 403, 429, 999)
+MAX_REDIRECTS = 10
+# Pages listed per broken link in the report
+REFERRERS = 3
+
+
+# ==================== LINKS ====================
+class LinkParser(HTMLParser):
+    """href of every anchor of an HTML document, and its <base href> if any"""
+
+    def __init__(self):
+        super().__init__()
+        self.base = None
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self.hrefs.append(href.strip())
+        elif tag == "base" and self.base is None:
+            self.base = dict(attrs).get("href")
+
+
+def extract_links(html: str, page_url: str) -> list:
+    """Distinct absolute http(s) URLs linked from a page, without fragments, in document order"""
+    parser = LinkParser()
+    parser.feed(html)
+    base = urljoin(page_url, parser.base) if parser.base else page_url
+    links = {}
+    for href in parser.hrefs:
+        url = normalize(href, base)
+        if url:
+            links[url] = None
+    return list(links)
+
+
+def normalize(href: str, base: str):
+    """Absolute URL of a link without its fragment, or None for non-HTTP links"""
+    if not href or href.startswith("#") or href.lower().startswith(SKIPPED_SCHEMES):
+        return None
+    url = urldefrag(urljoin(base, href)).url
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return None
+    # An empty path is the root; hosts are case-insensitive
+    return parts._replace(netloc=parts.netloc.lower(), path=parts.path or "/").geturl()
+
+
+def is_internal(url: str, root: str) -> bool:
+    return urlsplit(url).netloc.lower() == urlsplit(root).netloc.lower()
+
+
+# ==================== CHECKING ====================
+class RateLimiter:
+    """Spaces request starts evenly at a maximum rate (0 for no limit)"""
+
+    def __init__(self, per_second: float = 0):
+        self.interval = 1 / per_second if per_second else 0
+        self.next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class LinkChecker:
+    """Link checks over a pool of keep-alive request contexts, bounded in concurrency and rate"""
+
+    def __init__(self, playwright, contexts: int = 4, concurrency: int = settings.LINK_CHECK_CONCURRENCY,
+                 rate: float = settings.LINK_CHECK_RATE, timeout_ms: int = 15000):
+        self.playwright = playwright
+        self.size = max(1, contexts)
+        self.timeout_ms = timeout_ms
+        self.limit = asyncio.Semaphore(concurrency)
+        self.rate = RateLimiter(rate)
+        self.contexts = []
+        self.requests = 0
+        self._turn = itertools.count()
+
+    async def __aenter__(self) -> "LinkChecker":
+        self.contexts = [
+            await self.playwright.request.new_context(
+                extra_http_headers={"User-Agent": settings.USER_AGENT},
+                timeout=self.timeout_ms,
+            )
+            for _ in range(self.size)
+        ]
+        return self
+
+    async def __aexit__(self, *exc):
+        for context in self.contexts:
+            await context.dispose()
+        self.contexts = []
+
+    async def fetch(self, url: str, method: str) -> tuple:
+        """(response, milliseconds) of one request without following redirects; rate waits are not timed"""
+        context = self.contexts[next(self._turn) % len(self.contexts)]
+        await self.rate.wait()
+        self.requests += 1
+        started = time.perf_counter()
+        response = await context.fetch(url, method=method, max_redirects=0, fail_on_status_code=False)
+        return response, (time.perf_counter() - started) * 1000
+
+    async def follow(self, url: str, method: str) -> tuple:
+        """(final response, redirect hops as [status, url], milliseconds) following redirects one at a time"""
+        chain = []
+        response, ms = await self.fetch(url, method)
+        while 300 <= response.status < 400 and response.headers.get("location") and len(chain) < MAX_REDIRECTS:
+            chain.append([response.status, url])
+            url = urljoin(url, response.headers["location"])
+            await response.dispose()
+            response, hop_ms = await self.fetch(url, method)
+            ms += hop_ms
+        return response, chain, ms
+
+    async def check(self, url: str, expand: bool = False) -> dict:
+        """Status, redirect chain and latency of a URL; expanded pages also return their links"""
+        result = {"url": url, "status": None, "final_url": url, "redirects": [], "method": None, "ms": None,
+                  "error": None, "links": []}
+        async with self.limit:
+            try:
+                method = "GET" if expand else "HEAD"
+                response, chain, ms = await self.follow(url, method)
+                if method == "HEAD" and response.status >= 400:
+                    # Some servers reject HEAD; GET also confirms a link is really broken
+                    await response.dispose()
+                    method = "GET"
+                    response, chain, ms = await self.follow(url, method)
+                result.update(status=response.status, final_url=response.url, redirects=chain, method=method,
+                              ms=round(ms, 1))
+                if expand and response.ok and "html" in response.headers.get("content-type", ""):
+                    result["links"] = extract_links(await response.text(), response.url)
+                await response.dispose()
+            except Error as e:
+                result["error"] = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        return result
+
+
+async def crawl(checker: LinkChecker, root: str, seeds: list, depth: int = settings.LINK_CHECK_DEPTH,
+                external: bool = False) -> list:
+    """Check every distinct link reachable from seeds within depth internal hops, breadth first"""
+    referrers = collections.defaultdict(list)
+    found = {}
+    level = []
+    for seed in seeds:
+        url = normalize(seed, root)
+        if url and url not in found:
+            found[url] = 0
+            level.append(url)
+    results = []
+    for current in range(depth + 1):
+        checked = [url for url in level if external or is_internal(url, root)]
+        results.extend({"url": url, "depth": current, "skipped": True}
+                       for url in level if not (external or is_internal(url, root)))
+        level = []
+        pages = await asyncio.gather(*(
+            checker.check(url, expand=current < depth and is_internal(url, root)) for url in checked
+        ))
+        for page in pages:
+            page.update(depth=current, skipped=False)
+            for link in page.pop("links"):
+                if len(referrers[link]) < REFERRERS:
+                    referrers[link].append(page["url"])
+                if link not in found:
+                    found[link] = current + 1
+                    level.append(link)
+            results.append(page)
+    for result in results:
+        result["found_on"] = referrers.get(result["url"], [])
+    return results
+
+
+async def crawl_site(root: str, seeds: list = None, depth: int = settings.LINK_CHECK_DEPTH, external: bool = False,
+                     contexts: int = 4, concurrency: int = settings.LINK_CHECK_CONCURRENCY,
+                     rate: float = settings.LINK_CHECK_RATE) -> tuple:
+    """(results, seconds) of a crawl from root and seeds"""
+    async with async_playwright() as p:
+        async with LinkChecker(p, contexts, concurrency, rate) as checker:
+            started = time.perf_counter()
+            results = await crawl(checker, root, [root, *(seeds or [])], depth, external)
+            return results, time.perf_counter() - started
+
+
+def check_site(root: str, seeds: list = None, **options) -> dict:
+    """Crawl and summarize from synchronous code (tests); runs on its own thread and event loop"""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        results, elapsed = pool.submit(asyncio.run, crawl_site(root, seeds, **options)).result()
+    return summarize(results, elapsed, root)
+
+
+# ==================== REPORT ====================
+def summarize(results: list, duration_s: float, root: str, slow_ms: float = settings.LINK_SLOW_MS) -> dict:
+    """Counts plus the broken, unverified, redirected and slow links of a crawl"""
+    checked = [r for r in results if not r["skipped"]]
+    broken, unverified = [], []
+    for r in checked:
+        if r["error"] is None and r["status"] < 400:
+            continue
+        blocked = r["status"] in BOT_BLOCKED and not is_internal(r["url"], root)
+        (unverified if blocked else broken).append(r)
+    return {
+        "links": len(results),
+        "checked": len(checked),
+        "skipped": len(results) - len(checked),
+        "seconds": round(duration_s, 2),
+        "per_second": round(len(checked) / duration_s, 1) if duration_s else None,
+        "broken": broken,
+        "unverified": unverified,
+        "redirects": [r for r in checked if r["redirects"]],
+        "slow": sorted((r for r in checked if (r["ms"] or 0) > slow_ms), key=lambda r: -r["ms"]),
+    }
+
+
+def report_lines(summary: dict) -> list:
+    lines = [
+        f"{summary['checked']} links checked in {summary['seconds']}s ({summary['per_second']}/s), "
+        f"{summary['skipped']} external skipped, {len(summary['broken'])} broken, "
+        f"{len(summary['redirects'])} redirected, {len(summary['slow'])} slow"
+    ]
+    for r in summary["broken"]:
+        lines.append(f"BROKEN  {r['status'] or r['error']}  {r['url']}  (on {', '.join(r['found_on']) or 'seed'})")
+    for r in summary["unverified"]:
+        lines.append(f"BLOCKED {r['status']}  {r['url']}")
+    for r in summary["redirects"]:
+        hops = " -> ".join(f"{url} [{status}]" for status, url in r["redirects"])
+        lines.append(f"REDIRECT {hops} -> {r['final_url']} [{r['status']}]")
+    for r in summary["slow"]:
+        lines.append(f"SLOW    {r['ms']:.0f}ms  {r['url']}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl the site from the homepage and check every link")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--local-site", action="store_true", help="crawl the bundled stand-in server")
+    parser.add_argument("--catalog-size", type=int, default=None, help="detail pages per landing page on --local-site")
+    parser.add_argument("--depth", type=int, default=settings.LINK_CHECK_DEPTH, help="internal hops followed from the seeds")
+    parser.add_argument("--external", action="store_true", help="also check links to other hosts")
+    parser.add_argument("--contexts", type=int, default=4, help="request contexts in the pool")
+    parser.add_argument("--concurrency", type=int, default=settings.LINK_CHECK_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=settings.LINK_CHECK_RATE, help="requests per second (0: no limit)")
+    parser.add_argument("--slow-ms", type=float, default=settings.LINK_SLOW_MS)
+    parser.add_argument("--json", default=None, help="write every result to this file")
+    args = parser.parse_args(argv)
+
+    site = None
+    if args.local_site:
+        config = LocalSiteConfig.from_env()
+        if args.catalog_size is not None:
+            config.catalog_size = args.catalog_size
+        site = LocalSite(config=config).start()
+    try:
+        root = site.url if site else (args.base_url or settings.BASE_URL)
+        results, elapsed = asyncio.run(crawl_site(root, depth=args.depth, external=args.external, contexts=args.contexts,
+                                                  concurrency=args.concurrency, rate=args.rate))
+    finally:
+        if site:
+            site.stop()
+    summary = summarize(results, elapsed, root, args.slow_ms)
+    for line in report_lines(summary):
+        print(line)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if summary["broken"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
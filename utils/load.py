@@ -0,0 +1,356 @@
+"""
+Concurrent virtual-user load generator for the HomePage search flows (TEST_PLAN.md 4.2).
+Virtual users run the flights/hotels/tours search scenarios in lightweight browser contexts
+multiplexed over a few browsers on one asyncio event loop. Each user drives an AsyncHomePage,
+so the load replays the same search_* flows (tab tracking, bulk form fills, submit waits) as
+the UI tests; every page-object call is timed as one transaction.
+
+Closed model: --users virtual users start over --ramp-up seconds and loop until --duration ends.
+Open model:   --arrival-rate new users per second (Poisson arrivals) each run one scenario,
+              with at most --users in flight at once.
+
+Usage:
+    python -m utils.load --local-site --users 100 --ramp-up 30 --duration 120
+    python -m utils.load --local-site --arrival-rate 5 --users 500 --duration 60 --think-time 1-3
+    python -m utils.load --local-site --users 50 --scenario flights=2 --scenario hotels=1 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright, Browser, Error
+from models.async_home_page import AsyncHomePage
+from utils import config as settings
+from utils.local_site import LocalSite, LocalSiteConfig
+from utils.stats import PERCENTILES, percentile
+
+CITIES = ("London", "Paris", "Dubai", "New York", "Tokyo", "Istanbul", "Singapore", "Bangkok")
+# Failed transactions: Playwright errors, form fields that did not stick (bulk_fill), timeouts
+FAILURES = (Error, AssertionError, asyncio.TimeoutError)
+
+
+# ==================== SCHEDULES ====================
+def ramp_schedule(users: int, ramp_up_s: float) -> list:
+    """Start offsets spreading users evenly over the ramp-up period"""
+    return [i * ramp_up_s / users for i in range(users)] if users else []
+
+
+def arrival_schedule(rate: float, duration_s: float, rng: random.Random) -> list:
+    """Poisson arrival offsets at the given mean rate (users per second)"""
+    offsets, t = [], 0.0
+    while rate > 0:
+        t += rng.expovariate(rate)
+        if t >= duration_s:
+            break
+        offsets.append(t)
+    return offsets
+
+
+# ==================== STATS ====================
+class LoadStats:
+    """Transaction samples and active-user counts of one load run"""
+
+    def __init__(self, bucket_s: float = 5.0):
+        self.bucket_s = bucket_s
+        # (seconds since start, transaction, latency ms, error or None)
+        self.samples = []
+        # (seconds since start, active users)
+        self.active = []
+
+    def record(self, t: float, name: str, latency_ms: float, error: str = None):
+        self.samples.append((t, name, latency_ms, error))
+
+    def _latencies(self, samples: list) -> dict:
+        latencies = [s[2] for s in samples if s[3] is None]
+        return {f"p{p}_ms": percentile(latencies, p) for p in PERCENTILES}
+
+    def summary(self, duration_s: float) -> dict:
+        """Per-transaction totals, error rate, throughput and latency percentiles"""
+        names = sorted({s[1] for s in self.samples})
+        result = {}
+        for name in names + ["all"]:
+            samples = [s for s in self.samples if name == "all" or s[1] == name]
+            errors = sum(1 for s in samples if s[3] is not None)
+            result[name] = {
+                "count": len(samples),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+                "throughput_per_s": round(len(samples) / duration_s, 2) if duration_s else 0.0,
+                **self._latencies(samples),
+            }
+        return result
+
+    def timeline(self, duration_s: float) -> list:
+        """Requests, errors, throughput, latency and active users per time bucket"""
+        buckets = []
+        for index in range(max(1, math.ceil(duration_s / self.bucket_s))):
+            start, end = index * self.bucket_s, (index + 1) * self.bucket_s
+            samples = [s for s in self.samples if start <= s[0] < end]
+            errors = sum(1 for s in samples if s[3] is not None)
+            active = [n for t, n in self.active if start <= t < end]
+            buckets.append({
+                "t": start,
+                "requests": len(samples),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+                "throughput_per_s": round(len(samples) / self.bucket_s, 2),
+                "p50_ms": percentile([s[2] for s in samples if s[3] is None], 50),
+                "p95_ms": percentile([s[2] for s in samples if s[3] is None], 95),
+                "active_users": max(active) if active else 0,
+            })
+        return buckets
+
+    def error_counts(self) -> dict:
+        counts = {}
+        for sample in self.samples:
+            if sample[3] is not None:
+                counts[sample[3]] = counts.get(sample[3], 0) + 1
+        return counts
+
+
+# ==================== VIRTUAL USERS ====================
+class LoadConfig:
+    """Shape of a load run"""
+
+    def __init__(self, users: int = 10, ramp_up_s: float = 10, duration_s: float = 60,
+                 think_time_s: tuple = (1.0, 3.0), arrival_rate: float = None, browsers: int = 2,
+                 scenarios: dict = None, bucket_s: float = 5.0, timeout_ms: int = 30000, seed: int = None):
+        self.users = users
+        self.ramp_up_s = ramp_up_s
+        self.duration_s = duration_s
+        self.think_time_s = think_time_s
+        self.arrival_rate = arrival_rate
+        self.browsers = browsers
+        self.scenarios = scenarios or {"flights": 1, "hotels": 1, "tours": 1}
+        self.bucket_s = bucket_s
+        self.timeout_ms = timeout_ms
+        self.seed = seed
+
+    def as_dict(self) -> dict:
+        return dict(vars(self), think_time_s=list(self.think_time_s))
+
+
+class VirtualUser:
+    """One simulated user with its own browser context"""
+
+    def __init__(self, index: int, browser: Browser, base_url: str, config: LoadConfig,
+                 stats: LoadStats, started: float):
+        self.index = index
+        self.browser = browser
+        self.base_url = base_url
+        self.config = config
+        self.stats = stats
+        self.started = started
+        self.rng = random.Random(None if config.seed is None else config.seed + index)
+        self.home = None
+
+    @asynccontextmanager
+    async def transaction(self, name: str):
+        """Time a block; failures are recorded and abort the current iteration"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except FAILURES as e:
+            message = str(e).splitlines()[0][:80] if str(e) else ""
+            error = f"{type(e).__name__}: {message}" if message else type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            self.stats.record(end - self.started, name, (end - start) * 1000, error)
+
+    def pick_scenario(self):
+        names = list(self.config.scenarios)
+        weights = [self.config.scenarios[n] for n in names]
+        return SCENARIOS[self.rng.choices(names, weights)[0]]
+
+    async def think(self):
+        low, high = self.config.think_time_s
+        await asyncio.sleep(self.rng.uniform(low, high))
+
+    async def run(self, deadline: float, iterations: int = None):
+        context = await self.browser.new_context(**settings.context_options())
+        context.set_default_timeout(self.config.timeout_ms)
+        self.home = AsyncHomePage(await context.new_page())
+        self.home.base_url = self.base_url
+        done = 0
+        try:
+            while time.perf_counter() < deadline and (iterations is None or done < iterations):
+                try:
+                    await self.pick_scenario()(self)
+                except FAILURES:
+                    pass  # recorded by the transaction that failed
+                done += 1
+                if iterations is None or done < iterations:
+                    await self.think()
+        finally:
+            await context.close()
+
+
+# ==================== SCENARIOS ====================
+async def open_home(vu: VirtualUser):
+    async with vu.transaction("home"):
+        await vu.home.navigate()
+
+
+async def search_flights(vu: VirtualUser):
+    await open_home(vu)
+    origin, destination = vu.rng.sample(CITIES, 2)
+    async with vu.transaction("search_flights"):
+        await vu.home.search_flights(origin, destination, departure_days=vu.rng.randint(3, 30))
+
+
+async def search_hotels(vu: VirtualUser):
+    await open_home(vu)
+    checkin = vu.rng.randint(3, 30)
+    async with vu.transaction("search_hotels"):
+        await vu.home.search_hotels(vu.rng.choice(CITIES), checkin, checkin + vu.rng.randint(1, 7))
+
+
+async def search_tours(vu: VirtualUser):
+    await open_home(vu)
+    async with vu.transaction("search_tours"):
+        await vu.home.search_tours(vu.rng.choice(CITIES), vu.rng.randint(3, 30))
+
+
+SCENARIOS = {
+    "flights": search_flights,
+    "hotels": search_hotels,
+    "tours": search_tours,
+}
+
+
+# ==================== RUNNER ====================
+async def run_load(config: LoadConfig, base_url: str) -> dict:
+    stats = LoadStats(config.bucket_s)
+    rng = random.Random(config.seed)
+    async with async_playwright() as p:
+        browsers = [await p.chromium.launch(headless=settings.HEADLESS) for _ in range(max(1, config.browsers))]
+        started = time.perf_counter()
+        deadline = started + config.duration_s
+        in_flight = asyncio.Semaphore(config.users)
+        active = 0
+
+        async def user(index: int, offset: float, iterations: int = None):
+            nonlocal active
+            await asyncio.sleep(offset)
+            async with in_flight:
+                if time.perf_counter() >= deadline:
+                    return
+                active += 1
+                try:
+                    vu = VirtualUser(index, browsers[index % len(browsers)], base_url, config, stats, started)
+                    await vu.run(deadline, iterations)
+                except Error as e:
+                    stats.record(time.perf_counter() - started, "context", 0, type(e).__name__)
+                finally:
+                    active -= 1
+
+        async def monitor():
+            while True:
+                stats.active.append((time.perf_counter() - started, active))
+                await asyncio.sleep(min(1.0, config.bucket_s))
+
+        if config.arrival_rate:
+            offsets = arrival_schedule(config.arrival_rate, config.duration_s, rng)
+            tasks = [asyncio.create_task(user(i, t, iterations=1)) for i, t in enumerate(offsets)]
+        else:
+            offsets = ramp_schedule(config.users, config.ramp_up_s)
+            tasks = [asyncio.create_task(user(i, t)) for i, t in enumerate(offsets)]
+        watcher = asyncio.create_task(monitor())
+        # Users finish their current iteration after the deadline, bounded by one action timeout
+        _, pending = await asyncio.wait(tasks, timeout=config.duration_s + config.timeout_ms / 1000)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        watcher.cancel()
+        elapsed = time.perf_counter() - started
+        for browser in browsers:
+            await browser.close()
+    return {
+        "config": config.as_dict(),
+        "base_url": base_url,
+        "duration_s": round(elapsed, 2),
+        "users_started": len(offsets),
+        "summary": stats.summary(elapsed),
+        "timeline": stats.timeline(elapsed),
+        "errors": stats.error_counts(),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['users_started']} users against {report['base_url']} in {report['duration_s']}s",
+        f"{'transaction':16} {'count':>7} {'errors':>7} {'rate/s':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8}",
+    ]
+    for name, row in report["summary"].items():
+        ms = ["-" if row[f"p{p}_ms"] is None else f"{row[f'p{p}_ms']:.0f}" for p in PERCENTILES]
+        lines.append(
+            f"{name:16} {row['count']:>7} {row['errors']:>7} {row['throughput_per_s']:>8} "
+            + " ".join(f"{value:>8}" for value in ms)
+        )
+    lines.append(f"{'t':>6} {'active':>7} {'req/s':>7} {'err%':>6} {'p95':>8}")
+    for bucket in report["timeline"]:
+        p95 = "-" if bucket["p95_ms"] is None else f"{bucket['p95_ms']:.0f}"
+        lines.append(
+            f"{bucket['t']:>6.0f} {bucket['active_users']:>7} {bucket['throughput_per_s']:>7} "
+            f"{bucket['error_rate'] * 100:>6.1f} {p95:>8}"
+        )
+    return "\n".join(lines)
+
+
+def parse_think_time(value: str) -> tuple:
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+
+def parse_scenario(value: str) -> tuple:
+    name, _, weight = value.partition("=")
+    if name not in SCENARIOS:
+        raise argparse.ArgumentTypeError(f"unknown scenario '{name}', expected one of {sorted(SCENARIOS)}")
+    return name, float(weight or 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive HomePage search flows with concurrent virtual users")
+    parser.add_argument("--users", type=int, default=10, help="virtual users (max in flight with --arrival-rate)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds to start all users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to generate load")
+    parser.add_argument("--think-time", type=parse_think_time, default=(1.0, 3.0), help="seconds, e.g. 2 or 1-3")
+    parser.add_argument("--arrival-rate", type=float, default=None, help="new users per second (open model)")
+    parser.add_argument("--browsers", type=int, default=2, help="browsers the users' contexts are spread over")
+    parser.add_argument("--scenario", type=parse_scenario, action="append", help="name=weight (default: all equally)")
+    parser.add_argument("--bucket", type=float, default=5.0, help="seconds per timeline bucket")
+    parser.add_argument("--timeout", type=int, default=30000, help="action timeout in ms")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--local-site", action="store_true", help="run against the bundled stand-in server")
+    parser.add_argument("--output", default=None, help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        users=args.users, ramp_up_s=args.ramp_up, duration_s=args.duration, think_time_s=args.think_time,
+        arrival_rate=args.arrival_rate, browsers=args.browsers,
+        scenarios=dict(args.scenario) if args.scenario else None,
+        bucket_s=args.bucket, timeout_ms=args.timeout, seed=args.seed,
+    )
+    site = LocalSite(config=LocalSiteConfig.from_env()).start() if args.local_site else None
+    try:
+        base_url = site.url if site else (args.base_url or settings.BASE_URL)
+        report = asyncio.run(run_load(config, base_url))
+    finally:
+        if site:
+            site.stop()
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
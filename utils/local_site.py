@@ -0,0 +1,655 @@
+"""
+Local stand-in for phptravels.net.
+Serves a homepage with the DOM the HomePage locators expect, plus scripted search
+backends for flights, hotels, tours, cars and visa with pagination, filters and sort.
+Latency, result counts and error rates are configurable so the suite and load tests
+can run locally at high concurrency.
+
+Run standalone:
+    python -m utils.local_site --port 8000 --latency-ms 20 --error-rate 0.01 --results flights=40
+"""
+import argparse
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+VERTICALS = ("flights", "hotels", "tours", "cars", "visa")
+
+DEFAULT_RESULTS = {"flights": 25, "hotels": 18, "tours": 12, "cars": 9, "visa": 1}
+
+CITIES = [
+    "New York", "London", "Paris", "Tokyo", "Dubai", "Singapore", "Los Angeles", "Sydney",
+    "Miami", "Barcelona", "Chicago", "Berlin", "Toronto", "Rome", "Bali", "Santorini",
+    "Machu Picchu", "Iceland", "Egypt", "San Francisco", "Istanbul", "Bangkok", "Lisbon",
+]
+
+AIRLINES = ["Emirates", "Qatar Airways", "Lufthansa", "Air France", "Delta", "Singapore Airlines"]
+
+# Query parameters each search form submits
+SEARCH_FIELDS = {
+    "flights": ("from", "to"),
+    "hotels": ("city",),
+    "tours": ("city",),
+    "cars": ("pickup", "dropoff"),
+    "visa": ("from_country", "nationality"),
+}
+
+
+class LocalSiteConfig:
+    """Tunable behaviour of the stand-in site"""
+
+    def __init__(self, latency_ms: float = 0, search_latency_ms: float = 0, error_rate: float = 0.0,
+                 results: dict = None, page_size: int = 10, seed: int = 0, catalog_size: int = 0):
+        self.latency_ms = latency_ms
+        self.search_latency_ms = search_latency_ms
+        self.error_rate = error_rate
+        self.results = dict(DEFAULT_RESULTS)
+        if results:
+            self.results.update(results)
+        self.page_size = page_size
+        self.seed = seed
+        # Detail pages linked from each vertical's landing page (link crawls)
+        self.catalog_size = catalog_size
+
+    @classmethod
+    def from_env(cls) -> "LocalSiteConfig":
+        """Build a config from LOCAL_SITE_* environment variables"""
+        results = {}
+        for vertical in VERTICALS:
+            value = os.environ.get(f"LOCAL_SITE_{vertical.upper()}_RESULTS")
+            if value is not None:
+                results[vertical] = int(value)
+        return cls(
+            latency_ms=float(os.environ.get("LOCAL_SITE_LATENCY_MS", "0")),
+            search_latency_ms=float(os.environ.get("LOCAL_SITE_SEARCH_LATENCY_MS", "0")),
+            error_rate=float(os.environ.get("LOCAL_SITE_ERROR_RATE", "0")),
+            results=results,
+            page_size=int(os.environ.get("LOCAL_SITE_PAGE_SIZE", "10")),
+            catalog_size=int(os.environ.get("LOCAL_SITE_CATALOG_SIZE", "0")),
+        )
+
+    def update(self, values: dict):
+        """Apply a partial update (used by POST /__config)"""
+        for key in ("latency_ms", "search_latency_ms", "error_rate", "page_size", "seed", "catalog_size"):
+            if key in values:
+                setattr(self, key, type(getattr(self, key))(values[key]))
+        if "results" in values:
+            self.results.update({k: int(v) for k, v in values["results"].items()})
+
+    def as_dict(self) -> dict:
+        return {
+            "latency_ms": self.latency_ms,
+            "search_latency_ms": self.search_latency_ms,
+            "error_rate": self.error_rate,
+            "results": dict(self.results),
+            "page_size": self.page_size,
+            "seed": self.seed,
+            "catalog_size": self.catalog_size,
+        }
+
+
+# ==================== PAGE TEMPLATES ====================
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+header, .container { padding: 12px 24px; }
+nav a { margin-right: 16px; }
+.dropdown-toggle { margin-left: 12px; }
+.hero { padding: 32px 24px; background: #0d6efd; color: #fff; min-height: 420px; }
+.tab-pane { display: none; }
+.tab-pane.active { display: block; }
+.fade { transition: opacity .15s linear; opacity: 0; }
+.fade.show { opacity: 1; }
+.autocomplete { list-style: none; margin: 0; padding: 0; background: #fff; color: #000; }
+.row { display: flex; flex-wrap: wrap; gap: 12px; }
+.col-md-4 { width: 30%; }
+.card-item, .rounded-2 { min-height: 120px; border: 1px solid #ddd; }
+.section-heading { margin-top: 40px; }
+.results li, .results .result { border-bottom: 1px solid #eee; padding: 8px; }
+section.footer-area { margin-top: 60px; padding: 24px; background: #222; color: #fff; min-height: 200px; }
+"""
+
+SCRIPT = """
+document.querySelectorAll("button[role='tab']").forEach(tab => {
+    tab.addEventListener("click", () => {
+        document.querySelectorAll("button[role='tab']").forEach(t => {
+            t.classList.remove("active");
+            t.setAttribute("aria-selected", "false");
+        });
+        document.querySelectorAll(".tab-pane").forEach(p => p.classList.remove("show", "active"));
+        tab.classList.add("active");
+        tab.setAttribute("aria-selected", "true");
+        const pane = document.querySelector(tab.dataset.bsTarget);
+        pane.classList.add("active");
+        requestAnimationFrame(() => pane.classList.add("show"));
+    });
+});
+
+const iso = d => d.toISOString().slice(0, 10);
+const today = () => iso(new Date());
+document.querySelectorAll("input[data-min-today]").forEach(input => {
+    input.addEventListener("input", () => {
+        if (input.value && input.value < today()) input.value = today();
+    });
+});
+const checkin = document.querySelector("#checkin");
+const checkout = document.querySelector("#checkout");
+if (checkin && checkout) {
+    const fixCheckout = () => {
+        if (checkin.value && checkout.value && checkout.value <= checkin.value) {
+            const next = new Date(checkin.value);
+            next.setDate(next.getDate() + 1);
+            checkout.value = iso(next);
+        }
+    };
+    checkin.addEventListener("input", fixCheckout);
+    checkout.addEventListener("input", fixCheckout);
+}
+
+document.querySelectorAll("input[data-autocomplete]").forEach(input => {
+    const list = document.createElement("ul");
+    list.className = "autocomplete";
+    input.after(list);
+    input.addEventListener("input", async () => {
+        const q = input.value.trim();
+        if (!q) { list.innerHTML = ""; return; }
+        const response = await fetch("/api/autocomplete?q=" + encodeURIComponent(q));
+        const items = response.ok ? await response.json() : [];
+        list.innerHTML = items.map(i => "<li>" + i + "</li>").join("");
+    });
+});
+
+const sort = document.querySelector("select[name='sort']");
+if (sort) {
+    sort.addEventListener("change", () => {
+        const list = document.querySelector(".results");
+        if (!list) return;
+        const key = sort.value;
+        [...list.children]
+            .sort((a, b) => Number(a.dataset[key] || 0) - Number(b.dataset[key] || 0))
+            .forEach(item => list.appendChild(item));
+    });
+}
+document.querySelectorAll("[data-href]").forEach(card => {
+    card.addEventListener("click", event => {
+        if (event.target.closest("a")) return;
+        window.location.href = card.dataset.href;
+    });
+});
+"""
+
+LOGO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="160" height="40">'
+    '<rect width="160" height="40" fill="#0d6efd"/>'
+    '<text x="10" y="26" fill="#fff" font-size="16">PHPTRAVELS</text></svg>'
+)
+
+
+def card_svg(index: int) -> str:
+    """Placeholder card image"""
+    hue = (index * 47) % 360
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="320" height="180">'
+        f'<rect width="320" height="180" fill="hsl({hue},60%,60%)"/></svg>'
+    )
+
+
+def layout(title: str, body: str) -> str:
+    """Wrap page content with the shared header and footer"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>{STYLE}</style>
+</head>
+<body>
+<header>
+  <a href="/"><img class="logo p-1 rounded" src="/assets/logo.svg" alt="logo" width="160" height="40"></a>
+  <nav>
+    <a href="/flights">Flights</a>
+    <a href="/hotels">Hotels</a>
+    <a href="/tours">Tours</a>
+    <a href="/cars">Cars</a>
+    <a href="/visa">Visa</a>
+    <a href="/blogs">Blogs</a>
+    <a class="dropdown-toggle" href="#">English</a>
+    <a class="dropdown-toggle" href="#">USD</a>
+    <a class="dropdown-toggle" href="#">Agents</a>
+    <a class="dropdown-toggle" href="#">Customer</a>
+  </nav>
+</header>
+{body}
+<section class="footer-area">
+  <a class="foot__logo" href="/"><img src="/assets/logo.svg" alt="footer logo" width="160" height="40"></a>
+  <ul>
+    <li><a href="/about-us">About Us</a></li>
+    <li><a href="/contact-us">Contact Us</a></li>
+    <li><a href="/contact-us#form">Support</a></li>
+    <li><a href="https://www.facebook.com/phptravels" rel="noopener">Facebook</a></li>
+    <li><a href="https://twitter.com/phptravels" rel="noopener">Twitter</a></li>
+  </ul>
+  <form class="newsletter" onsubmit="return false">
+    <input class="newsletter_name" name="name" placeholder="Name">
+    <input class="newsletter_email" name="email" type="email" placeholder="Email">
+    <button class="subscribe" type="submit">Signup</button>
+  </form>
+  <p>&copy; 2024 PHPTRAVELS. All rights reserved.</p>
+</section>
+<script>{SCRIPT}</script>
+</body>
+</html>"""
+
+
+def home_html() -> str:
+    """Homepage with hero, the five search tabs, featured sections and footer"""
+    tomorrow = time.strftime("%Y-%m-%d", time.localtime(time.time() + 86400))
+    flight_cards = "".join(
+        f'<div class="col-md-4"><img src="/assets/img/flight-{i}.svg" alt="" width="320" height="180">'
+        f'<p>{CITIES[i]} to {CITIES[i + 1]}</p></div>'
+        for i in range(3)
+    )
+    tour_cards = "".join(
+        f'<a class="fadeout list-group-item" href="/tours/detail/{i}">{CITIES[10 + i]} tour</a>'
+        for i in range(4)
+    )
+    tour_images = "".join(
+        f'<div class="rounded-2 overflow-hidden h-100"><img src="/assets/img/tour-{i}.svg" alt="" width="320" height="180"></div>'
+        for i in range(2)
+    )
+    car_cards = "".join(
+        f'<div class="col-md-4 mb-3"><div class="shadow-sm rounded card-item p-2">Transfer car {i}</div></div>'
+        for i in range(3)
+    )
+    body = f"""
+<div class="hero">
+  <h4>Your Trip Starts Here!</h4>
+  <p>Let the journey begin</p>
+  <div class="nav nav-tabs" role="tablist">
+    <button class="nav-link active" role="tab" aria-selected="true" data-bs-target="#tab-flights">Flights</button>
+    <button class="nav-link" role="tab" aria-selected="false" data-bs-target="#tab-hotels">Hotels</button>
+    <button class="nav-link" role="tab" aria-selected="false" data-bs-target="#tab-tours">Tours</button>
+    <button class="nav-link" role="tab" aria-selected="false" data-bs-target="#tab-cars">Cars</button>
+    <button class="nav-link" role="tab" aria-selected="false" data-bs-target="#tab-visa">Visa</button>
+  </div>
+  <div class="tab-content">
+    <div class="tab-pane fade show active" id="tab-flights" role="tabpanel">
+      <form action="/flights/search" method="get">
+        <div class="row g-3">
+          <select class="flight_way" name="flight_way">
+            <option value="oneway">One Way</option>
+            <option value="round">Round Trip</option>
+          </select>
+          <input name="from" placeholder="Flying From" data-autocomplete required>
+          <input name="to" placeholder="To Destination" data-autocomplete required>
+          <input id="departure" name="departure" value="{tomorrow}" data-min-today>
+          <input id="return" name="return" data-min-today>
+          <button id="flights-search" type="submit">Search</button>
+        </div>
+      </form>
+    </div>
+    <div class="tab-pane fade" id="tab-hotels" role="tabpanel">
+      <form action="/hotels/search" method="get">
+        <input name="city" placeholder="Search by City" data-autocomplete>
+        <input id="checkin" name="checkin" data-min-today>
+        <input id="checkout" name="checkout" data-min-today>
+        <select name="guests">
+          <option value="1">1</option><option value="2">2</option>
+          <option value="3">3</option><option value="4">4</option>
+        </select>
+        <button class="search_button" type="submit">Search</button>
+      </form>
+    </div>
+    <div class="tab-pane fade" id="tab-tours" role="tabpanel">
+      <form action="/tours/search" method="get">
+        <input name="city" placeholder="Search by City" data-autocomplete>
+        <input id="date" name="date" data-min-today>
+        <button class="search_button" type="submit">Search</button>
+      </form>
+    </div>
+    <div class="tab-pane fade" id="tab-cars" role="tabpanel">
+      <form action="/cars/search" method="get">
+        <input name="pickup" placeholder="Pick-up Location" data-autocomplete>
+        <input name="dropoff" placeholder="Drop-off Location" data-autocomplete>
+        <button class="search_button" type="submit">Search</button>
+      </form>
+    </div>
+    <div class="tab-pane fade" id="tab-visa" role="tabpanel">
+      <form action="/visa/search" method="get">
+        <input name="from_country" placeholder="From Country" data-autocomplete>
+        <input name="nationality" placeholder="To Country" data-autocomplete>
+        <button class="search_button" type="submit">Search</button>
+      </form>
+    </div>
+  </div>
+</div>
+<div class="container">
+  <div class="section-heading text-end">
+    <h2><strong>Featured Flights</strong></h2>
+    <p>These alluring destinations are picked just for you</p>
+  </div>
+  <div class="row g-3">{flight_cards}</div>
+  <div class="section-heading text-start">
+    <h2><strong>Featured Hotels</strong></h2>
+    <p>These alluring destinations are picked just for you</p>
+  </div>
+  <div class="section-heading">
+    <h2><strong>Popular Tours</strong></h2>
+    <p>These alluring destinations are picked just for you</p>
+  </div>
+  <div class="list-group">{tour_cards}</div>
+  <div class="row">{tour_images}</div>
+  <div class="section-heading">
+    <h2><strong>Recommended Transfer Cars</strong></h2>
+  </div>
+  <div class="row">{car_cards}</div>
+</div>
+"""
+    return layout("PHPTRAVELS | Travel Technology Partner", body)
+
+
+def landing_html(vertical: str, catalog_size: int = 0) -> str:
+    """Landing page reached from the header navigation, listing catalog_size detail pages"""
+    title = vertical.capitalize()
+    catalog = "".join(f'<li><a href="/{vertical}/detail/{i}">{title} {i}</a></li>' for i in range(1, catalog_size + 1))
+    body = f"""
+<div class="container">
+  <nav aria-label="breadcrumb"><ol class="breadcrumb"><li><a href="/">Home</a></li><li>{title}</li></ol></nav>
+  <h1>{title}</h1>
+  <ul class="catalog">{catalog}</ul>
+</div>
+"""
+    return layout(f"{title} - PHPTRAVELS", body)
+
+
+def not_found_html() -> str:
+    return layout("404 Not Found - PHPTRAVELS", '<div class="container"><h1>404</h1><p>Page Not Found</p></div>')
+
+
+def error_html() -> str:
+    return layout("Error - PHPTRAVELS", '<div class="container"><h1>500</h1><p>Something went wrong</p></div>')
+
+
+class SiteServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for load runs"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class LocalSite:
+    """Threaded HTTP server serving the stand-in site"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: LocalSiteConfig = None):
+        self.config = config or LocalSiteConfig()
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._server = SiteServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "LocalSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(SiteRequestHandler):
+            pass
+
+        Handler.site = site
+        return Handler
+
+
+class SiteRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the page builders and search backends"""
+
+    site = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # ==================== RESPONSES ====================
+    def _send(self, status: int, body, content_type: str = "text/html; charset=utf-8", headers: dict = None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _redirect(self, location: str):
+        self._send(302, "", headers={"Location": location})
+
+    def _delay(self, search: bool = False):
+        config = self.site.config
+        delay_ms = config.latency_ms + (config.search_latency_ms if search else 0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    # ==================== ROUTING ====================
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        with self.site._lock:
+            self.site.requests_served += 1
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        segments = [s for s in path.split("/") if s]
+
+        if path.startswith("/assets/"):
+            return self._asset(path)
+        self._delay(search=path.endswith("/search") or path.startswith("/api/"))
+
+        if path in ("/", "/home", "/index.php"):
+            if path == "/home":
+                return self._redirect("/")
+            return self._send(200, home_html())
+        if path == "/__config":
+            return self._send(200, json.dumps(self.site.config.as_dict()), "application/json")
+        if path == "/api/autocomplete":
+            return self._autocomplete(query.get("q", ""))
+        if segments and segments[0] in VERTICALS:
+            vertical = segments[0]
+            if len(segments) == 1:
+                return self._send(200, landing_html(vertical, self.site.config.catalog_size))
+            if segments[1] == "search":
+                return self._search(vertical, query)
+            if segments[1] in ("detail", "booking") and len(segments) == 3:
+                return self._detail(vertical, segments[1], segments[2])
+        if path in ("/blogs", "/about-us", "/contact-us"):
+            return self._send(200, landing_html(path.strip("/").replace("-", " ")))
+        return self._send(404, not_found_html())
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/__config":
+            return self._send(404, not_found_html())
+        length = int(self.headers.get("Content-Length") or 0)
+        values = json.loads(self.rfile.read(length) or b"{}")
+        self.site.config.update(values)
+        self._send(200, json.dumps(self.site.config.as_dict()), "application/json")
+
+    # ==================== HANDLERS ====================
+    def _asset(self, path: str):
+        if path == "/assets/logo.svg":
+            return self._send(200, LOGO_SVG, "image/svg+xml", {"Cache-Control": "max-age=3600"})
+        if path.startswith("/assets/img/") and path.endswith(".svg"):
+            name = path.rsplit("/", 1)[-1][:-4]
+            index = sum(ord(c) for c in name)
+            return self._send(200, card_svg(index), "image/svg+xml", {"Cache-Control": "max-age=3600"})
+        return self._send(404, "", "text/plain")
+
+    def _autocomplete(self, q: str):
+        if self.site._should_fail():
+            return self._send(500, "[]", "application/json")
+        q = q.lower()
+        matches = [c for c in CITIES if q and q in c.lower()][:8]
+        self._send(200, json.dumps(matches), "application/json")
+
+    def _search(self, vertical: str, query: dict):
+        if self.site._should_fail():
+            return self._send(500, error_html())
+        config = self.site.config
+        terms = [query.get(field, "") for field in SEARCH_FIELDS[vertical]]
+        total = config.results.get(vertical, 0)
+        page = max(1, int(query.get("page", "1") or 1))
+        first = (page - 1) * config.page_size
+        items = results_for(vertical, terms, total, config.seed)[first:first + config.page_size]
+        self._send(200, results_html(vertical, terms, items, query, page, total, config.page_size))
+
+    def _detail(self, vertical: str, kind: str, item_id: str):
+        item_id = html.escape(item_id)
+        body = (f'<div class="container"><nav aria-label="breadcrumb"><ol class="breadcrumb"><li><a href="/">Home</a></li>'
+                f'<li><a href="/{vertical}">{vertical.capitalize()}</a></li></ol></nav>'
+                f'<h1>{vertical.capitalize()} {kind} #{item_id}</h1>'
+                + (f'<a class="book" href="/{vertical}/booking/{item_id}">Book Now</a>' if kind == "detail" else "")
+                + '</div>')
+        self._send(200, layout(f"{vertical} {kind} - PHPTRAVELS", body))
+
+
+def results_for(vertical: str, terms: list, total: int, seed: int = 0) -> list:
+    """Deterministic result rows for a search (same query, same results)"""
+    rng = random.Random(f"{seed}:{vertical}:{'|'.join(terms).lower()}")
+    rows = []
+    for i in range(total):
+        rows.append({
+            "id": i + 1,
+            "price": rng.randint(40, 1500),
+            "duration": rng.randint(60, 1200),
+            "rating": rng.randint(1, 5),
+            "name": f"{AIRLINES[i % len(AIRLINES)]}" if vertical == "flights" else f"{vertical.capitalize()} option {i + 1}",
+        })
+    return rows
+
+
+def results_html(vertical: str, terms: list, items: list, query: dict, page: int, total: int, page_size: int) -> str:
+    """Search results page with filters, sort and pagination"""
+    label = " / ".join(html.escape(t) for t in terms if t) or "All"
+    singular = {"flights": "flight", "hotels": "hotel", "tours": "tour", "cars": "car", "visa": "visa"}[vertical]
+    rows = []
+    for item in items:
+        data = f'data-price="{item["price"]}" data-duration="{item["duration"]}" data-rating="{item["rating"]}"'
+        detail = f"/{vertical}/detail/{item['id']}"
+        if vertical == "flights":
+            rows.append(f'<li class="flight-list result" {data}>{item["name"]} - ${item["price"]}</li>')
+        elif vertical == "tours":
+            rows.append(
+                f'<li class="tour-list tour-card result" data-href="{detail}" {data}>{item["name"]} - ${item["price"]} '
+                f'<a href="/tours/booking/{item["id"]}">Book Now</a></li>'
+            )
+        elif vertical == "visa":
+            rows.append(f'<li class="visa-list result" {data}>{item["name"]}</li>')
+        else:
+            rows.append(
+                f'<li class="{singular}-list {singular}-card result" data-href="{detail}" {data}>'
+                f'{item["name"]} - ${item["price"]}</li>'
+            )
+    if rows:
+        listing = f'<ul class="results">{"".join(rows)}</ul>'
+    else:
+        listing = f"<p>No {vertical} found</p>"
+
+    extras = ""
+    if vertical == "cars":
+        extras = '<input name="pickup_date" type="date">'
+    if vertical == "visa" and items:
+        extras = '<form class="visa-application"><input name="passport"><button type="button">Apply</button></form>'
+
+    pages = (total + page_size - 1) // page_size
+    pagination = ""
+    if pages > 1:
+        links = []
+        if page > 1:
+            links.append(f'<a class="prev" href="?{urlencode({**query, "page": page - 1})}">Prev</a>')
+        links.append(f'<span class="current">{page} / {pages}</span>')
+        if page < pages:
+            links.append(f'<a class="next" href="?{urlencode({**query, "page": page + 1})}">Next</a>')
+        pagination = f'<nav class="pagination">{"".join(links)}</nav>'
+
+    body = f"""
+<div class="container">
+  <nav aria-label="breadcrumb"><ol class="breadcrumb"><li><a href="/">Home</a></li><li>{vertical.capitalize()}</li></ol></nav>
+  <h1>{vertical.capitalize()} results for {label}</h1>
+  <aside class="filters">
+    <input type="range" class="price-filter" min="0" max="1500">
+    <select class="rating-filter" name="rating"><option value="">Any</option><option value="5">5 stars</option></select>
+    <select name="sort"><option value="">Sort</option><option value="price">Price</option><option value="duration">Duration</option></select>
+    {extras}
+  </aside>
+  {listing}
+  {pagination}
+</div>
+"""
+    return layout(f"{vertical.capitalize()} search - PHPTRAVELS", body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local PHPTravels stand-in site")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--search-latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--catalog-size", type=int, default=0, help="detail pages linked from each landing page")
+    parser.add_argument("--results", action="append", default=[], metavar="VERTICAL=N",
+                        help="Result count per vertical, e.g. --results flights=40")
+    args = parser.parse_args(argv)
+    results = {}
+    for item in args.results:
+        vertical, _, count = item.partition("=")
+        if vertical not in VERTICALS:
+            parser.error(f"unknown vertical: {vertical}")
+        results[vertical] = int(count)
+    config = LocalSiteConfig(
+        latency_ms=args.latency_ms,
+        search_latency_ms=args.search_latency_ms,
+        error_rate=args.error_rate,
+        results=results,
+        page_size=args.page_size,
+        catalog_size=args.catalog_size,
+    )
+    site = LocalSite(args.host, args.port, config)
+    print(f"Serving PHPTravels stand-in at {site.url}")
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
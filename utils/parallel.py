@@ -0,0 +1,272 @@
+"""
+Parallel sharded test runner with duration-aware load balancing.
+Tests are split across N worker processes (each with its own browser) using durations
+recorded by earlier runs, and the per-shard results are merged into one report.
+
+Usage:
+    python -m utils.parallel -n 4 tests/ --local-site
+    python -m utils.parallel -n 4 --junitxml=report.xml --html=report.html tests/
+"""
+import argparse
+import html
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from utils import config as settings
+from utils.perf_budget import BUDGET_DIR, HISTORY_FILE, check as check_budgets, in_ci, recording_baseline, report_lines
+from utils.impact import IMPACT_FILE, load_map, save_map
+from utils.perf_metrics import read_records
+from utils.spans import format_steps, read_trace, slowest_steps
+
+DURATIONS_FILE = ".test_durations.json"
+SHARD_DIR = ".shards"
+# Used for tests that have never been timed and no other durations are known
+DEFAULT_DURATION = 10.0
+# Weight of the newest run when updating recorded durations
+SMOOTHING = 0.5
+
+
+# ==================== DURATIONS ====================
+def load_durations(path: str = DURATIONS_FILE) -> dict:
+    """Recorded nodeid -> seconds, or an empty dict if nothing was recorded yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def merge_durations(recorded: dict, latest: dict) -> dict:
+    """Blend the latest timings into the recorded ones"""
+    merged = dict(recorded)
+    for nodeid, seconds in latest.items():
+        previous = merged.get(nodeid)
+        merged[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+    return merged
+
+
+def save_durations(durations: dict, path: str = DURATIONS_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=1, sort_keys=True)
+
+
+class DurationRecorder:
+    """pytest plugin that records per-test durations (setup + call + teardown)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.latest = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.latest[report.nodeid] = self.latest.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.latest:
+            save_durations(merge_durations(load_durations(self.path), self.latest), self.path)
+
+
+def select_shard(items: list, shard_file: str) -> tuple:
+    """Split collected items into (selected, deselected) according to a shard file"""
+    with open(shard_file, encoding="utf-8") as f:
+        wanted = {line.strip() for line in f if line.strip()}
+    selected = [item for item in items if item.nodeid in wanted]
+    deselected = [item for item in items if item.nodeid not in wanted]
+    return selected, deselected
+
+
+# ==================== SHARDING ====================
+def partition(nodeids: list, durations: dict, workers: int) -> list:
+    """Split tests into balanced shards (longest processing time first)"""
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    weighted = sorted(nodeids, key=lambda n: durations.get(n, fallback), reverse=True)
+    shards = [{"tests": [], "estimate": 0.0} for _ in range(max(1, workers))]
+    for nodeid in weighted:
+        lightest = min(shards, key=lambda s: s["estimate"])
+        lightest["tests"].append(nodeid)
+        lightest["estimate"] += durations.get(nodeid, fallback)
+    return [s for s in shards if s["tests"]]
+
+
+def collect(pytest_args: list) -> list:
+    """Node ids selected by the given pytest arguments"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        capture_output=True, text=True,
+    )
+    nodeids = [line.strip() for line in result.stdout.splitlines() if "::" in line and not line.startswith(" ")]
+    if result.returncode not in (0, 5) and not nodeids:
+        sys.stderr.write(result.stdout + result.stderr)
+        raise SystemExit(result.returncode)
+    return nodeids
+
+
+# ==================== REPORTS ====================
+def merge_junit(paths: list) -> ET.Element:
+    """Combine per-shard JUnit XML files into one <testsuites> tree"""
+    merged = ET.Element("testsuite", name="pytest")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    elapsed = 0.0
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            elapsed = max(elapsed, float(suite.get("time", 0)))
+            merged.extend(suite.findall("testcase"))
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set("time", f"{elapsed:.3f}")
+    root = ET.Element("testsuites")
+    root.append(merged)
+    return root
+
+
+def case_outcome(case: ET.Element) -> str:
+    for tag in ("failure", "error", "skipped"):
+        if case.find(tag) is not None:
+            return {"failure": "failed", "error": "error", "skipped": "skipped"}[tag]
+    return "passed"
+
+
+def write_html_summary(root: ET.Element, path: str, shards: list):
+    """Single HTML page listing every test from every shard"""
+    rows = []
+    for case in root.iter("testcase"):
+        name = f"{case.get('classname')}::{case.get('name')}"
+        outcome = case_outcome(case)
+        rows.append(
+            f"<tr class='{outcome}'><td>{html.escape(name)}</td><td>{outcome}</td>"
+            f"<td>{float(case.get('time', 0)):.2f}s</td></tr>"
+        )
+    shard_rows = "".join(
+        f"<li>shard {i}: {len(s['tests'])} tests, estimated {s['estimate']:.1f}s, "
+        f"actual {s.get('elapsed', 0):.1f}s</li>"
+        for i, s in enumerate(shards)
+    )
+    Path(path).write_text(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Parallel test report</title>
+<style>.failed,.error{{background:#fdd}}.skipped{{background:#eee}}td{{padding:2px 8px}}</style></head>
+<body><h1>Parallel test report</h1><ul>{shard_rows}</ul>
+<table><tr><th>Test</th><th>Outcome</th><th>Duration</th></tr>{''.join(rows)}</table></body></html>
+""", encoding="utf-8")
+
+
+# ==================== RUNNER ====================
+def run(workers: int, pytest_args: list, junitxml: str = None, html_report: str = None,
+        durations_file: str = DURATIONS_FILE, impact_file: str = IMPACT_FILE, budget_dir: str = BUDGET_DIR,
+        history_path: str = HISTORY_FILE, record_baseline: bool = False, perf_dir: str = settings.PERF_DIR) -> int:
+    nodeids = collect([*pytest_args, f"--impact-map={impact_file}"])
+    if not nodeids:
+        print("No tests collected")
+        return 5
+    durations = load_durations(durations_file)
+    shards = partition(nodeids, durations, workers)
+    shard_dir = Path(SHARD_DIR)
+    shard_dir.mkdir(exist_ok=True)
+    impact_map = load_map(impact_file)
+
+    # Shards write their page-load metrics to metrics-<index>.jsonl and step spans to
+    # steps-<index>.trace.json; drop files from earlier runs
+    for pattern in ("metrics-*.jsonl", "steps-*.trace.json"):
+        for stale in Path(perf_dir).glob(pattern):
+            stale.unlink()
+
+    processes = []
+    for index, shard in enumerate(shards):
+        shard_file = shard_dir / f"shard-{index}.txt"
+        shard_file.write_text("\n".join(shard["tests"]) + "\n", encoding="utf-8")
+        shard["junit"] = str(shard_dir / f"shard-{index}.xml")
+        shard["durations"] = str(shard_dir / f"durations-{index}.json")
+        for stale in (shard["junit"], shard["durations"]):
+            Path(stale).unlink(missing_ok=True)
+        # Each shard updates its own copy of the impact map; the copies are merged afterwards
+        shard["impact"] = str(shard_dir / f"impact-{index}.json")
+        save_map(impact_map, shard["impact"])
+        shard["log"] = open(shard_dir / f"shard-{index}.log", "w", encoding="utf-8")
+        command = [
+            sys.executable, "-m", "pytest", *pytest_args,
+            f"--shard-file={shard_file}",
+            f"--junitxml={shard['junit']}",
+            f"--durations-file={shard['durations']}",
+            f"--impact-map={shard['impact']}",
+            f"--perf-dir={perf_dir}",
+            "-p", "no:cacheprovider",
+        ]
+        env = dict(os.environ, PYTEST_SHARD=str(index))
+        shard["started"] = time.perf_counter()
+        processes.append(subprocess.Popen(command, stdout=shard["log"], stderr=subprocess.STDOUT, env=env))
+        print(f"shard {index}: {len(shard['tests'])} tests, estimated {shard['estimate']:.1f}s")
+
+    exit_codes = []
+    for shard, process in zip(shards, processes):
+        exit_codes.append(process.wait())
+        shard["elapsed"] = time.perf_counter() - shard["started"]
+        shard["log"].close()
+
+    for shard in shards:
+        durations = merge_durations(durations, load_durations(shard["durations"]))
+    save_durations(durations, durations_file)
+    for shard in shards:
+        shard_map = load_map(shard["impact"])
+        impact_map.update({nodeid: shard_map[nodeid] for nodeid in shard["tests"] if nodeid in shard_map})
+    save_map(impact_map, impact_file)
+
+    root = merge_junit([s["junit"] for s in shards])
+    if junitxml:
+        ET.ElementTree(root).write(junitxml, encoding="utf-8", xml_declaration=True)
+    if html_report:
+        write_html_summary(root, html_report, shards)
+    suite = root.find("testsuite")
+    print(
+        f"{suite.get('tests')} tests in {len(shards)} shards: {suite.get('failures')} failed, "
+        f"{suite.get('errors')} errors, {suite.get('skipped')} skipped "
+        f"(wall {max(s['elapsed'] for s in shards):.1f}s, logs in {SHARD_DIR}/)"
+    )
+    # Budgets are checked once over all shards, so the baselines see the whole run
+    records = [r for path in sorted(Path(perf_dir).glob("metrics-*.jsonl")) for r in read_records(path)]
+    verdicts = check_budgets(records, budget_dir=budget_dir, history_path=history_path,
+                             record=recording_baseline(record_baseline))
+    if verdicts:
+        for line in report_lines(verdicts):
+            print(f"perf: {line}")
+    events = [e for path in sorted(Path(perf_dir).glob("steps-*.trace.json")) for e in read_trace(path)]
+    steps = slowest_steps(events)
+    if steps:
+        for line in format_steps(steps):
+            print(f"steps: {line}")
+    # pytest exits with 5 when a shard's tests were all deselected; that is not a failure here
+    failures = [code for code in exit_codes if code not in (0, 5)]
+    if not failures and in_ci() and any(v.confirmed for v in verdicts):
+        failures.append(1)
+    return failures[0] if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the suite across parallel pytest workers")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--junitxml", default="report.xml")
+    parser.add_argument("--html", dest="html_report", default=None)
+    parser.add_argument("--durations-file", default=DURATIONS_FILE)
+    parser.add_argument("--impact-map", default=IMPACT_FILE)
+    # Budgets are checked here once over all shards, so these are not passed on to pytest
+    parser.add_argument("--perf-budgets", default=BUDGET_DIR)
+    parser.add_argument("--perf-history", default=HISTORY_FILE)
+    parser.add_argument("--perf-record-baseline", action="store_true")
+    # Read here as well, since the shards' metrics and traces are merged from it; passed on to every shard
+    parser.add_argument("--perf-dir", default=settings.PERF_DIR)
+    args, pytest_args = parser.parse_known_args(argv)
+    return run(args.workers, pytest_args, args.junitxml, args.html_report, args.durations_file, args.impact_map,
+               args.perf_budgets, args.perf_history, args.perf_record_baseline, args.perf_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
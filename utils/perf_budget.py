@@ -0,0 +1,234 @@
+"""
+Performance budgets with rolling-baseline regression detection.
+Budget files in perf_budgets/ set per-page limits on the metrics recorded by utils.perf_metrics.
+Every run's median per page and metric is compared with the last runs of the same target
+(host and resource profile, so throttled runs never mix with full-page ones): a sample is flagged when it is over budget or a significant regression (robust z-score against
+the baseline median/MAD), and a regression is confirmed once flagged in consecutive runs.
+Only confirmed regressions fail a CI run; single noisy spikes are reported but tolerated.
+Runs are always judged, but only fold their samples into the history when recording a baseline
+(CI, or --perf-record-baseline), so partial local runs cannot skew it.
+
+Budget file (perf_budgets/home.json):
+    {"pages": ["/"], "metrics": {"lcp_ms": 2500, "ttfb_ms": 800, "transfer_bytes": 3000000}}
+
+Usage:
+    python -m utils.perf_budget perf/metrics-*.jsonl
+    python -m utils.perf_budget perf/metrics-*.jsonl --record-baseline
+"""
+import argparse
+import fnmatch
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+from utils.perf_metrics import read_records
+
+BUDGET_DIR = "perf_budgets"
+HISTORY_FILE = ".perf_history.json"
+# Runs kept in the rolling baseline per page and metric
+WINDOW = 20
+# Baseline runs needed before regressions are judged statistically
+MIN_SAMPLES = 5
+# Robust z-score above which a sample counts as a regression
+Z_THRESHOLD = 3.5
+# ...and it must also be at least this much worse than the baseline median
+MIN_EFFECT = 0.10
+# Consecutive flagged runs needed to confirm a regression
+CONFIRM_RUNS = 2
+
+
+class Budget:
+    """Metric limits for the pages matching a set of URL path patterns"""
+
+    def __init__(self, name: str, pages: list, metrics: dict):
+        self.name = name
+        self.pages = pages
+        self.metrics = metrics
+
+    def matches(self, label: str) -> bool:
+        path = label.rstrip("/") or "/"
+        return any(fnmatch.fnmatchcase(path, pattern.rstrip("/") or "/") for pattern in self.pages)
+
+
+def load_budgets(directory: str = BUDGET_DIR) -> list:
+    budgets = []
+    for path in sorted(Path(directory).glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        budgets.append(Budget(data.get("name", path.stem), data["pages"], data["metrics"]))
+    return budgets
+
+
+def run_samples(records: list, budgets: list) -> dict:
+    """(budget, metric) -> median value over this run's matching page loads"""
+    values = {}
+    for record in records:
+        for budget in budgets:
+            if not budget.matches(record.get("label") or urlsplit(record.get("url", "")).path):
+                continue
+            for metric in budget.metrics:
+                if record.get(metric) is not None:
+                    values.setdefault((budget.name, metric), []).append(record[metric])
+    return {key: statistics.median(samples) for key, samples in values.items()}
+
+
+def robust_z(value: float, baseline: list) -> float:
+    """How many robust standard deviations value is above the baseline median"""
+    median = statistics.median(baseline)
+    mad = statistics.median(abs(x - median) for x in baseline)
+    # A perfectly flat baseline would make any change infinitely significant
+    scale = max(1.4826 * mad, abs(median) * 0.01, 1e-9)
+    return (value - median) / scale
+
+
+class Verdict:
+    """Outcome of one page metric in one run"""
+
+    def __init__(self, budget: str, metric: str, value: float, limit: float, baseline: list, streak: int,
+                 target: str = None):
+        self.budget = budget
+        self.metric = metric
+        self.value = value
+        self.limit = limit
+        self.baseline_median = statistics.median(baseline) if baseline else None
+        self.z = robust_z(value, baseline) if len(baseline) >= MIN_SAMPLES else None
+        self.over_budget = value > limit
+        self.regressed = (
+            self.z is not None and self.z > Z_THRESHOLD
+            and value > self.baseline_median * (1 + MIN_EFFECT)
+        )
+        self.streak = streak + 1 if self.flagged else 0
+        self.target = target
+
+    @property
+    def flagged(self) -> bool:
+        return self.over_budget or self.regressed
+
+    @property
+    def confirmed(self) -> bool:
+        return self.flagged and self.streak >= CONFIRM_RUNS
+
+    @property
+    def status(self) -> str:
+        if self.confirmed:
+            return "confirmed"
+        return "suspect" if self.flagged else "ok"
+
+    def as_dict(self) -> dict:
+        return {
+            "target": self.target,
+            "budget": self.budget,
+            "metric": self.metric,
+            "value": self.value,
+            "limit": self.limit,
+            "baseline_median": self.baseline_median,
+            "z": None if self.z is None else round(self.z, 2),
+            "over_budget": self.over_budget,
+            "regressed": self.regressed,
+            "streak": self.streak,
+            "status": self.status,
+        }
+
+
+class BudgetHistory:
+    """Rolling per-target baselines and flag streaks, persisted across runs"""
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def entry(self, target: str, key: str) -> dict:
+        return self.data.setdefault(target, {}).setdefault(key, {"samples": [], "streak": 0})
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+
+
+def evaluate(records: list, budgets: list, history: BudgetHistory, target: str) -> list:
+    """Judge this run's samples and fold them into the history"""
+    verdicts = []
+    limits = {(b.name, metric): limit for b in budgets for metric, limit in b.metrics.items()}
+    for (budget, metric), value in sorted(run_samples(records, budgets).items()):
+        entry = history.entry(target, f"{budget}/{metric}")
+        verdict = Verdict(budget, metric, value, limits[(budget, metric)], entry["samples"], entry["streak"], target)
+        entry["streak"] = verdict.streak
+        # Flagged samples stay out of the baseline so a regression cannot become the new normal
+        if not verdict.flagged:
+            entry["samples"] = (entry["samples"] + [value])[-WINDOW:]
+        verdicts.append(verdict)
+    return verdicts
+
+
+def baseline_target(record: dict) -> str:
+    """History key of a page load: the host it came from and the resource profile it ran under"""
+    host = urlsplit(record.get("url") or "").hostname or "unknown"
+    return f"{host}/{record.get('resource_profile') or 'full'}"
+
+
+def check(records: list, target: str = None, budget_dir: str = BUDGET_DIR, history_path: str = HISTORY_FILE,
+          record: bool = False) -> list:
+    """Evaluate a run's records per target; the baselines are only updated when recording"""
+    budgets = load_budgets(budget_dir)
+    if not budgets or not records:
+        return []
+    history = BudgetHistory(history_path)
+    targets = {}
+    for entry in records:
+        targets.setdefault(target or baseline_target(entry), []).append(entry)
+    verdicts = [v for key, group in sorted(targets.items()) for v in evaluate(group, budgets, history, key)]
+    if record:
+        history.save()
+    return verdicts
+
+
+def in_ci() -> bool:
+    return os.environ.get("CI", "").lower() not in ("", "0", "false")
+
+
+def recording_baseline(requested: bool = False) -> bool:
+    """Whether this run's samples go into the history: in CI or when explicitly asked"""
+    return requested or in_ci()
+
+
+def report_lines(verdicts: list) -> list:
+    lines = []
+    for v in verdicts:
+        if v.status == "ok":
+            continue
+        reasons = []
+        if v.over_budget:
+            reasons.append(f"over budget {v.limit}")
+        if v.regressed:
+            reasons.append(f"baseline {v.baseline_median} (z={v.z:.1f})")
+        lines.append(f"{v.status.upper():9} {v.budget}/{v.metric}={v.value} {', '.join(reasons)} streak={v.streak}"
+                     + (f" [{v.target}]" if v.target else ""))
+    flagged = sum(v.flagged for v in verdicts)
+    confirmed = sum(v.confirmed for v in verdicts)
+    lines.append(f"{len(verdicts)} budget metrics checked, {flagged} flagged, {confirmed} confirmed")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check page-load metrics against performance budgets")
+    parser.add_argument("records", nargs="+", help="metrics JSON lines written by the test run")
+    parser.add_argument("--budgets", default=BUDGET_DIR)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--target", default=None,
+                        help="baseline key (default: host/resource profile of each record)")
+    parser.add_argument("--record-baseline", action="store_true", help="fold the samples into the history")
+    args = parser.parse_args(argv)
+    records = [r for path in args.records for r in read_records(path)]
+    verdicts = check(records, args.target, args.budgets, args.history, recording_baseline(args.record_baseline))
+    for line in report_lines(verdicts):
+        print(line)
+    return 1 if in_ci() and any(v.confirmed for v in verdicts) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Page-load performance metrics captured after every page-object navigation.
+Recording waits for the window load event, so it is off unless metrics are wanted
+(--perf-metrics, CI, or tests marked perf); navigations then return once the DOM is ready.
+Each record holds Navigation Timing, paint timings, LCP, CLS, transfer sizes and request
+counts for one document; records are written per test as JSON lines under PERF_DIR.
+"""
+import html
+import json
+import time
+import weakref
+from pathlib import Path
+from playwright.async_api import Error
+from utils.playwright_compat import impl_of
+
+# Observes LCP and layout shifts from the very start of every document
+OBSERVERS_JS = """
+(() => {
+    if (window.__perfMetrics) return;
+    const metrics = window.__perfMetrics = { lcp: null, cls: 0 };
+    try {
+        new PerformanceObserver(list => {
+            const entries = list.getEntries();
+            if (entries.length) metrics.lcp = entries[entries.length - 1].startTime;
+        }).observe({ type: "largest-contentful-paint", buffered: true });
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) {
+                if (!entry.hadRecentInput) metrics.cls += entry.value;
+            }
+        }).observe({ type: "layout-shift", buffered: true });
+    } catch (e) {
+        // Entry types this browser does not support stay null
+    }
+})();
+"""
+
+COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const metrics = window.__perfMetrics || {};
+    return {
+        url: location.href,
+        navigation: nav ? nav.toJSON() : null,
+        paint: Object.fromEntries(performance.getEntriesByType("paint").map(p => [p.name, p.startTime])),
+        lcp: metrics.lcp ?? null,
+        cls: metrics.cls ?? null,
+        resources: performance.getEntriesByType("resource").map(r => ({
+            type: r.initiatorType,
+            transfer: r.transferSize,
+        })),
+    };
+}
+"""
+
+# Metrics shown in the HTML report, in column order
+REPORT_COLUMNS = (
+    ("ttfb_ms", "TTFB ms"),
+    ("fcp_ms", "FCP ms"),
+    ("lcp_ms", "LCP ms"),
+    ("dom_content_loaded_ms", "DCL ms"),
+    ("load_ms", "Load ms"),
+    ("cls", "CLS"),
+    ("transfer_bytes", "Bytes"),
+    ("request_count", "Requests"),
+)
+
+_observed_pages = weakref.WeakSet()
+
+
+async def install_perf_observers_async(page):
+    """Install the LCP/CLS observers once per page"""
+    key = impl_of(page)
+    if key in _observed_pages:
+        return
+    await page.add_init_script(OBSERVERS_JS)
+    _observed_pages.add(key)
+
+
+def _ms(value):
+    """Milliseconds since navigation start, or None for events that have not happened"""
+    return round(value, 1) if value else None
+
+
+def summarize(raw: dict) -> dict:
+    """Flat metric record from the raw browser-side performance entries"""
+    nav = raw.get("navigation") or {}
+    paint = raw.get("paint") or {}
+    resources = raw.get("resources") or []
+    by_type = {}
+    for resource in resources:
+        entry = by_type.setdefault(resource["type"] or "other", {"count": 0, "transfer_bytes": 0})
+        entry["count"] += 1
+        entry["transfer_bytes"] += resource["transfer"] or 0
+    document_bytes = nav.get("transferSize") or 0
+    cls = raw.get("cls")
+    return {
+        "url": raw.get("url"),
+        "ttfb_ms": _ms(nav.get("responseStart")),
+        "dom_content_loaded_ms": _ms(nav.get("domContentLoadedEventEnd")),
+        "load_ms": _ms(nav.get("loadEventEnd")),
+        "first_paint_ms": _ms(paint.get("first-paint")),
+        "fcp_ms": _ms(paint.get("first-contentful-paint")),
+        "lcp_ms": _ms(raw.get("lcp")),
+        "cls": round(cls, 4) if cls is not None else None,
+        "document_bytes": document_bytes,
+        "transfer_bytes": document_bytes + sum(t["transfer_bytes"] for t in by_type.values()),
+        "request_count": len(resources) + (1 if nav else 0),
+        "resources": by_type,
+    }
+
+
+class AsyncPerfRecorder:
+    """Captures page-load metrics for one page object, one record per navigation"""
+
+    def __init__(self, page, waits, enabled: bool = True):
+        self.page = page
+        self.waits = waits
+        self.records = []
+        self.enabled = enabled
+
+    async def measure(self, label: str) -> dict:
+        """Wait for the load event and record the current document's metrics; None when recording is off"""
+        if not self.enabled:
+            return None
+        await self.waits.page_loaded()
+        try:
+            raw = await self.page.evaluate(COLLECT_JS)
+        except Error:
+            # The document was replaced while collecting; nothing reliable to record
+            return None
+        record = {"label": label, "timestamp": round(time.time(), 3), **summarize(raw)}
+        self.records.append(record)
+        return record
+
+    @property
+    def latest(self) -> dict:
+        return self.records[-1] if self.records else None
+
+
+class PerfLog:
+    """Per-test metric records for one run, as JSON lines"""
+
+    def __init__(self, directory: str, shard: str = None):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        suffix = f"-{shard}" if shard else ""
+        self.path = Path(directory) / f"metrics{suffix}.jsonl"
+        self.path.write_text("", encoding="utf-8")
+
+    def write(self, nodeid: str, records: list, resource_profile: str = "full"):
+        # The profile keeps throttled page loads out of the full-page baselines (see utils.perf_budget)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps({"nodeid": nodeid, "resource_profile": resource_profile, **record}) + "\n")
+
+
+def read_records(path) -> list:
+    """Records written by PerfLog"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def records_html(records: list) -> str:
+    """HTML table of a test's page loads for the pytest-html report"""
+    header = "".join(f"<th>{title}</th>" for _, title in REPORT_COLUMNS)
+    rows = []
+    for record in records:
+        cells = "".join(
+            f"<td>{'-' if record.get(key) is None else record[key]}</td>" for key, _ in REPORT_COLUMNS
+        )
+        rows.append(f"<tr><td>{html.escape(record['label'])}</td>{cells}</tr>")
+    return (
+        "<table class='perf-metrics'><tr><th>Page</th>" + header + "</tr>"
+        + "".join(rows) + "</table>"
+    )
@@ -0,0 +1,95 @@
+"""
+Every use of Playwright internals in this repo, in one place.
+The sync page objects wrap the async ones by handing the connection object behind a sync API
+object to its async twin and running coroutines on the sync object's event loop; the browser
+server needs the bundled Node driver. None of this is public API, so requirements.txt limits
+Playwright to the range it was checked against. An installed version without these internals
+does not break the suite: UNSUPPORTED says what changed, the sync page-object fixtures skip their
+tests with that reason, and the browser server falls back to one browser per worker.
+
+Sync and async wrappers of one connection object share a single cache of wrapped children:
+page.keyboard, page.context... return whichever wrapper was created first. Async code must
+therefore only use objects converted with async_twin() or built from them (locators, frames
+found through async calls), never a child attribute a sync wrapper may already have wrapped.
+"""
+from importlib.metadata import version
+from playwright import async_api, sync_api
+from playwright._impl import _driver, _sync_base
+
+# Versions these internals were checked against (lowest and highest), as in requirements.txt
+TESTED_VERSIONS = ("1.44.0", "1.64.0")
+SyncBase = _sync_base.SyncBase
+
+
+class _Probe:
+    """Stands in for a connection object when checking how wrappers are built"""
+    _loop = None
+    _dispatcher_fiber = None
+
+
+def problems() -> list:
+    """Internals used here that the installed Playwright no longer has"""
+    missing = []
+    if not callable(getattr(SyncBase, "_sync", None)):
+        missing.append("SyncBase._sync")
+    if not callable(getattr(_driver, "compute_driver_executable", None)):
+        missing.append("_driver.compute_driver_executable")
+    probe = _Probe()
+    try:
+        wrapped = (sync_api.Locator(probe), async_api.Locator(probe))
+    except (AttributeError, TypeError):
+        wrapped = ()
+    if not (wrapped and isinstance(wrapped[0], SyncBase) and all(w._impl_obj is probe for w in wrapped)):
+        missing.append("wrappers built from their _impl_obj")
+    return missing
+
+
+def verify():
+    """Raise ImportError when the installed Playwright no longer has the internals used here"""
+    missing = problems()
+    if missing:
+        low, high = TESTED_VERSIONS
+        raise ImportError(
+            f"playwright {version('playwright')} changed internals the sync page objects rely on "
+            f"({', '.join(missing)}); utils/playwright_compat.py was checked against {low} to {high}"
+        )
+
+
+def impl_of(api_object):
+    """Connection object behind a sync or async API object (the object itself otherwise)"""
+    return getattr(api_object, "_impl_obj", api_object)
+
+
+def is_sync(value) -> bool:
+    return isinstance(value, SyncBase)
+
+
+def async_twin(sync_object):
+    """playwright.async_api object driving the same connection object as a sync one"""
+    return getattr(async_api, type(sync_object).__name__)(sync_object._impl_obj)
+
+
+def run_on_loop(sync_object, coroutine):
+    """Run a coroutine to completion on the event loop driving a sync API object"""
+    return sync_object._sync(coroutine)
+
+
+def driver_executable() -> tuple:
+    """(node, cli.js) of the Node driver bundled with the playwright package; RuntimeError if unsupported"""
+    if UNSUPPORTED:
+        raise RuntimeError(UNSUPPORTED)
+    return _driver.compute_driver_executable()
+
+
+def require_supported():
+    """Raise RuntimeError with the reason when the sync page objects cannot run on this Playwright"""
+    if UNSUPPORTED:
+        raise RuntimeError(UNSUPPORTED)
+
+
+try:
+    verify()
+    # Why the sync page objects cannot run on the installed Playwright, or None
+    UNSUPPORTED = None
+except ImportError as e:
+    UNSUPPORTED = str(e)
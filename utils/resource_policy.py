@@ -0,0 +1,155 @@
+"""
+Request interception policy that blocks heavy third-party and media resources.
+Profiles:
+    full        - load everything (default)
+    structural  - block images, fonts, media and trackers; for DOM/structure assertions
+    visual      - block trackers and ads only; pages still render pixel-complete
+Blocked requests are counted per test, and bytes saved are estimated from response sizes
+learned on earlier unblocked loads (or typical sizes per resource type).
+"""
+import json
+from urllib.parse import urlsplit
+from playwright.sync_api import BrowserContext, Route, Response
+
+# Analytics, tag managers, ads and chat widgets
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "tawk.to",
+    "adservice.google.com",
+)
+
+# Used when the size of a blocked URL has never been observed
+TYPICAL_SIZES = {
+    "image": 40_000,
+    "font": 30_000,
+    "media": 500_000,
+    "script": 25_000,
+    "stylesheet": 15_000,
+}
+DEFAULT_SIZE = 5_000
+
+SIZES_FILE = ".resource_sizes.json"
+
+
+def host_matches(host: str, patterns) -> bool:
+    """True if host equals or is a subdomain of any pattern"""
+    host = (host or "").lower()
+    return any(host == p or host.endswith("." + p) for p in patterns)
+
+
+class ResourcePolicy:
+    """Allow/deny rules by resource type and host"""
+
+    def __init__(self, name: str, block_types=(), allow_types=(), allow_hosts=(), deny_hosts=()):
+        self.name = name
+        self.block_types = set(block_types)
+        self.allow_types = set(allow_types)
+        self.allow_hosts = tuple(allow_hosts)
+        self.deny_hosts = tuple(deny_hosts)
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.block_types or self.deny_hosts)
+
+    def is_blocked(self, resource_type: str, url: str) -> bool:
+        """Allowed hosts win, then denied hosts, then resource type rules"""
+        host = urlsplit(url).hostname
+        if host_matches(host, self.allow_hosts):
+            return False
+        if host_matches(host, self.deny_hosts):
+            return True
+        return resource_type in self.block_types and resource_type not in self.allow_types
+
+    def apply(self, context: BrowserContext, sizes: "SizeCache") -> "ResourceMeter":
+        """Start enforcing the policy on a context and return its meter"""
+        meter = ResourceMeter(self, context, sizes)
+        meter.attach()
+        return meter
+
+
+PROFILES = {
+    "full": ResourcePolicy("full"),
+    "structural": ResourcePolicy("structural", block_types={"image", "font", "media"}, deny_hosts=TRACKER_HOSTS),
+    "visual": ResourcePolicy("visual", deny_hosts=TRACKER_HOSTS),
+}
+
+
+class SizeCache:
+    """URL -> body size in bytes, learned from unblocked responses and persisted across runs"""
+
+    def __init__(self, path: str = SIZES_FILE):
+        self.path = path
+        self.sizes = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.sizes = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def learn(self, url: str, size: int):
+        if self.sizes.get(url) != size:
+            self.sizes[url] = size
+            self.dirty = True
+
+    def estimate(self, url: str, resource_type: str) -> int:
+        return self.sizes.get(url, TYPICAL_SIZES.get(resource_type, DEFAULT_SIZE))
+
+    def save(self):
+        if self.dirty:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.sizes, f)
+            self.dirty = False
+
+
+class ResourceMeter:
+    """Enforces a policy on one context and counts what it saved"""
+
+    def __init__(self, policy: ResourcePolicy, context: BrowserContext, sizes: SizeCache):
+        self.policy = policy
+        self.context = context
+        self.sizes = sizes
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+
+    def attach(self):
+        self.context.on("response", self._on_response)
+        if self.policy.blocks_anything:
+            self.context.route("**/*", self._on_route)
+
+    def detach(self):
+        """Stop listening; routes are cleared when the pooled context is reset"""
+        self.context.remove_listener("response", self._on_response)
+
+    def _on_route(self, route: Route):
+        request = route.request
+        if not self.policy.is_blocked(request.resource_type, request.url):
+            route.fallback()
+            return
+        self.requests_blocked += 1
+        self.bytes_saved += self.sizes.estimate(request.url, request.resource_type)
+        route.abort("blockedbyclient")
+
+    def _on_response(self, response: Response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.sizes.learn(response.url, int(length))
+
+    def checkpoint(self) -> tuple:
+        """Current counters, to measure what a single test saved on a shared context"""
+        return self.requests_blocked, self.bytes_saved
+
+    def summary(self, since: tuple = (0, 0)) -> dict:
+        return {
+            "profile": self.policy.name,
+            "requests_blocked": self.requests_blocked - since[0],
+            "bytes_saved": self.bytes_saved - since[1],
+        }
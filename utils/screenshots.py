@@ -0,0 +1,300 @@
+"""
+Background screenshot store.
+Page objects hand the captured bytes to a writer thread and return at once; hashing, PNG
+recompression and disk I/O happen off the test thread. Frames are stored once per content
+hash (identical frames across steps, tests and runs are deduplicated), an index maps names to
+frames, and the oldest frames are evicted to keep the store under a size limit.
+
+Modes (--screenshots):
+    off      only explicit take_screenshot() calls
+    failure  also the page of every failing test (default)
+    steps    also after every outermost page-object step
+
+Usage:
+    pytest --screenshots steps --screenshot-dir screenshots --screenshot-max-mb 200
+    python -m utils.screenshots                     # latest frame per name, store size
+    python -m utils.screenshots --name test_logo    # frames whose name contains the text
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+import pytest
+from playwright.sync_api import Error
+from utils import config as settings
+from utils.spans import CURRENT
+
+MODES = ("off", "failure", "steps")
+INDEX_FILE = "index.jsonl"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Frames waiting for the writer; a full queue makes capturing wait instead of growing memory
+QUEUE_SIZE = 64
+# Longest a capture waits for room in the queue before its frame is dropped
+PUT_TIMEOUT_S = 10
+
+# Mode and running test, set by the ScreenshotCapture plugin
+mode = "off"
+_test = {"name": None, "steps": 0}
+
+
+def recompress_png(data: bytes, level: int = 9) -> bytes:
+    """Losslessly recompress a PNG's image data at a higher zlib level; other formats and damaged PNGs pass through"""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    chunks, image, offset = [], b"", len(PNG_SIGNATURE)
+    try:
+        while offset < len(data):
+            length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+            body = data[offset + 8:offset + 8 + length]
+            offset += length + 12
+            if kind == b"IDAT":
+                image += body
+            else:
+                chunks.append((kind, body))
+        idat = zlib.compress(zlib.decompress(image), level)
+    except (struct.error, zlib.error):
+        # e.g. a truncated capture: keep the bytes as they are
+        return data
+    out = [PNG_SIGNATURE]
+    for kind, body in chunks:
+        if kind == b"IEND":
+            out.append(_chunk(b"IDAT", idat))
+        out.append(_chunk(kind, body))
+    result = b"".join(out)
+    return result if len(result) < len(data) else data
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+class ScreenshotStore:
+    """Content-addressed screenshot directory, written by a background thread"""
+
+    def __init__(self, directory: str = settings.SCREENSHOT_DIR, max_bytes: int = settings.SCREENSHOT_MAX_MB * 2**20,
+                 level: int = 9):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.level = level
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.thread = None
+        self.size = None
+        self.stats = {"captured": 0, "deduplicated": 0, "written": 0, "bytes_captured": 0, "bytes_written": 0,
+                      "evicted": 0, "failed": 0, "dropped": 0, "writer_ms": 0.0}
+        # Last error the writer hit, for the terminal summary
+        self.last_error = None
+
+    def submit(self, name: str, data: bytes):
+        """Queue a captured frame; returns immediately unless the writer is far behind"""
+        if self.thread is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+            self.thread.start()
+        if not self.thread.is_alive():
+            # Nothing would ever take the frame off the queue
+            self.stats["dropped"] += 1
+            return
+        try:
+            self.queue.put((name, data, time.time()), timeout=PUT_TIMEOUT_S)
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def flush(self):
+        """Wait until every queued frame is on disk"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            if self.thread.is_alive():
+                self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while (item := self.queue.get()) is not None:
+            started = time.perf_counter()
+            try:
+                self._store(*item)
+            except Exception as e:
+                # One bad frame (damaged data, full disk, a frame evicted by another shard) must not stop the writer
+                self.stats["failed"] += 1
+                self.last_error = f"{item[0]}: {type(e).__name__}: {e}"
+            finally:
+                self.stats["writer_ms"] += (time.perf_counter() - started) * 1000
+                self.queue.task_done()
+        self.queue.task_done()
+
+    def _store(self, name: str, data: bytes, taken: float):
+        self.stats["captured"] += 1
+        self.stats["bytes_captured"] += len(data)
+        if self.size is None:
+            self.size = self.disk_usage()
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        frame = self.directory / f"{digest}{'.png' if data.startswith(PNG_SIGNATURE) else '.jpg'}"
+        if self._reuse(frame):
+            self.stats["deduplicated"] += 1
+        else:
+            encoded = recompress_png(data, self.level)
+            partial = frame.with_suffix(".tmp")
+            try:
+                partial.write_bytes(encoded)
+                os.replace(partial, frame)
+            except OSError:
+                partial.unlink(missing_ok=True)
+                raise
+            self.stats["written"] += 1
+            self.stats["bytes_written"] += len(encoded)
+            self.size += len(encoded)
+        with open(self.directory / INDEX_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"name": name, "file": frame.name, "time": round(taken, 3)}) + "\n")
+        if self.size > self.max_bytes:
+            self._evict()
+
+    @staticmethod
+    def _reuse(frame: Path) -> bool:
+        """Whether an identical frame is on disk; reused frames count as recent for eviction"""
+        try:
+            os.utime(frame)
+            return True
+        except FileNotFoundError:
+            # Never written, or evicted by another shard sharing the store
+            return False
+
+    def frames(self) -> list:
+        return [p for p in self.directory.iterdir() if p.suffix in (".png", ".jpg")]
+
+    def disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.frames()) if self.directory.exists() else 0
+
+    def _evict(self):
+        """Delete the least recently used frames until the store fits its limit"""
+        for frame in sorted(self.frames(), key=lambda p: p.stat().st_mtime):
+            if self.size <= self.max_bytes:
+                break
+            try:
+                self.size -= frame.stat().st_size
+                frame.unlink()
+            except FileNotFoundError:
+                # Already evicted by another shard
+                continue
+            self.stats["evicted"] += 1
+
+    def lookup(self, text: str = "") -> dict:
+        """Latest frame still on disk per name containing text"""
+        latest = {}
+        try:
+            with open(self.directory / INDEX_FILE, encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if text in entry["name"] and (self.directory / entry["file"]).exists():
+                        latest[entry["name"]] = self.directory / entry["file"]
+        except (OSError, ValueError):
+            pass
+        return latest
+
+
+_shared = None
+
+
+def default_store() -> ScreenshotStore:
+    """Store shared by every page object of this process"""
+    global _shared
+    if _shared is None:
+        configure(ScreenshotStore())
+    return _shared
+
+
+def configure(store: ScreenshotStore):
+    """Make store the shared one; it is drained at exit so no queued frame is lost"""
+    global _shared
+    _shared = store
+    atexit.register(store.close)
+
+
+async def capture(page, name: str):
+    """Screenshot a page into the shared store (the browser encodes; everything else is backgrounded)"""
+    default_store().submit(name, await page.screenshot())
+
+
+async def after_step(name: str, args: tuple):
+    """In steps mode, capture the page after each outermost page-object step of a test"""
+    parent = CURRENT.get()
+    if mode != "steps" or parent is None or parent.kind != "phase" or not hasattr(args[0], "page"):
+        return
+    _test["steps"] += 1
+    await capture(args[0].page, f"{_test['name']}@{_test['steps']:03d}-{name}")
+
+
+class ScreenshotCapture:
+    """pytest plugin naming step screenshots after the running test and capturing failing pages"""
+
+    def __init__(self, store: ScreenshotStore, capture_mode: str = "failure"):
+        global mode
+        mode = capture_mode
+        self.store = store
+        configure(store)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        _test.update(name=item.nodeid, steps=0)
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if mode == "off" or report.when != "call" or not report.failed:
+            return
+        page = item.funcargs.get("page")
+        home = item.funcargs.get("home_page")
+        page = page or getattr(home, "page", None)
+        if page is None or page.is_closed():
+            return
+        try:
+            self.store.submit(f"{item.nodeid}@failure", page.screenshot())
+        except Error:
+            # A crashed page must not hide the test's own failure
+            return
+
+    def pytest_sessionfinish(self, session):
+        self.store.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        stats = self.store.stats
+        if not stats["captured"]:
+            return
+        terminalreporter.section("screenshots")
+        terminalreporter.write_line(
+            f"{stats['captured']} captured, {stats['deduplicated']} duplicates, {stats['written']} written "
+            f"({stats['bytes_captured'] / 2**20:.1f} MiB in, {stats['bytes_written'] / 2**20:.1f} MiB out), "
+            f"{stats['evicted']} evicted, writer busy {stats['writer_ms'] / 1000:.1f}s -> {self.store.directory}"
+        )
+        if stats["failed"] or stats["dropped"]:
+            terminalreporter.write_line(
+                f"{stats['failed']} failed to store, {stats['dropped']} dropped; last error: {self.store.last_error}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the frames in the screenshot store")
+    parser.add_argument("--dir", default=settings.SCREENSHOT_DIR)
+    parser.add_argument("--name", default="", help="only names containing this text")
+    args = parser.parse_args(argv)
+    store = ScreenshotStore(args.dir)
+    for name, frame in sorted(store.lookup(args.name).items()):
+        print(f"{frame}  {name}")
+    print(f"{len(store.frames()) if store.directory.exists() else 0} frames, {store.disk_usage() / 2**20:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
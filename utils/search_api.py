@@ -0,0 +1,387 @@
+"""
+Direct search API mode: learn the requests behind the search forms from one UI run, then
+replay large search matrices straight over HTTP through a pool of keep-alive
+APIRequestContexts, with a cap on requests in flight. Thousands of route checks per minute,
+while the UI tests stay focused on UI behaviour.
+
+Learning records each search_* form submission (HomePage.learn_searches) and turns the
+request carrying the typed values into a template: values found in the query string, form
+body, JSON body or path become placeholders, dates keep the format the site uses.
+
+Usage:
+    python -m utils.search_api learn --local-site        # one UI search per vertical
+    pytest tests/test_search_functionality.py --learn-search-api
+    python -m utils.search_api run --local-site --contexts 4 --concurrency 64
+    python -m utils.search_api run --verticals flights hotels --days 7 30 --json matrix.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+from playwright.async_api import Error, async_playwright
+from models.async_home_page import AsyncHomePage
+from models.home_page_locators import HomePageLocators
+from utils import config as settings
+from utils.local_site import CITIES, LocalSite, LocalSiteConfig
+from utils.stats import PERCENTILES, percentile
+
+SEARCH_API_FILE = ".search_api.json"
+VERTICALS = ("flights", "hotels", "tours", "cars", "visa")
+# Date formats recognised in learned requests, besides the ISO dates the forms are filled with
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%m/%d/%Y", "%Y%m%d")
+PLACEHOLDER_RE = re.compile(r"\{(\w+)(?::([^}]+))?\}")
+# Result rows are the elements the search_results locator matches
+RESULT_CLASSES = tuple(part.strip().lstrip(".") for part in HomePageLocators.search_results.selector.split(","))
+CLASS_RE = re.compile(r"""class\s*=\s*["']([^"']*)["']""")
+JSON_RESULT_KEYS = ("results", "data", "items")
+
+# One UI search per vertical, used by `learn`
+SAMPLE_SEARCHES = {
+    "flights": ("search_flights", ("New York", "London")),
+    "hotels": ("search_hotels", ("Paris",)),
+    "tours": ("search_tours", ("Dubai",)),
+    "cars": ("search_cars", ("London", "Paris")),
+    "visa": ("search_visa", ("United States", "France")),
+}
+# Matrix values per vertical from (first city, second city, first date, second date)
+CASE_VALUES = {
+    "flights": lambda a, b, d1, d2: {"origin": a, "destination": b, "departure": d1},
+    "hotels": lambda a, b, d1, d2: {"city": a, "checkin": d1, "checkout": d2},
+    "tours": lambda a, b, d1, d2: {"destination": a, "date": d1},
+    "cars": lambda a, b, d1, d2: {"pickup": a, "dropoff": b},
+    "visa": lambda a, b, d1, d2: {"from_country": a, "to_country": b},
+}
+
+
+# ==================== LEARNING ====================
+def slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+def placeholder_for(text: str, values: dict):
+    """Placeholder for a request value that carries one of the submitted values, else None"""
+    if not text:
+        return None
+    for name, value in values.items():
+        if text.lower() == value.lower():
+            return f"{{{name}}}"
+        if slug(value) == text.lower():
+            return f"{{{name}:slug}}"
+        try:
+            day = datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            continue
+        for fmt in DATE_FORMATS[1:]:
+            if day.strftime(fmt) == text:
+                return f"{{{name}:{fmt}}}"
+    return None
+
+
+def template_for(request: dict, values: dict) -> dict:
+    """Endpoint template for one captured request: method, path, query, form/JSON body and fields"""
+    parts = urlsplit(request["url"])
+    path = "/".join(
+        placeholder_for(unquote(segment), values) or segment for segment in parts.path.split("/")
+    )
+    query = [[key, placeholder_for(value, values) or value] for key, value in parse_qsl(parts.query, keep_blank_values=True)]
+    form = body = None
+    post_data = request.get("post_data")
+    if post_data:
+        try:
+            body = json.loads(post_data)
+        except ValueError:
+            form = [[key, placeholder_for(value, values) or value] for key, value in parse_qsl(post_data, keep_blank_values=True)]
+        else:
+            if isinstance(body, dict):
+                body = {key: placeholder_for(value, values) or value if isinstance(value, str) else value
+                        for key, value in body.items()}
+    text = json.dumps([path, query, form, body])
+    return {
+        "method": request["method"],
+        "path": path,
+        "query": query,
+        "form": form,
+        "json": body,
+        "fields": sorted({match[1] for match in PLACEHOLDER_RE.finditer(text)}),
+        "sample": values,
+    }
+
+
+def learn(capture: dict):
+    """Template of the captured request carrying the most submitted values, or None"""
+    best = None
+    for request in capture["requests"]:
+        endpoint = template_for(request, capture["values"])
+        if endpoint["fields"] and (best is None or len(endpoint["fields"]) > len(best["fields"])):
+            best = endpoint
+    return best
+
+
+def learn_all(captures: list) -> dict:
+    """vertical -> endpoint from HomePage.search_requests; later captures win ties"""
+    endpoints = {}
+    for capture in captures:
+        endpoint = learn(capture)
+        previous = endpoints.get(capture["vertical"])
+        if endpoint and (previous is None or len(endpoint["fields"]) >= len(previous["fields"])):
+            endpoints[capture["vertical"]] = endpoint
+    return endpoints
+
+
+def load_endpoints(host: str, path: str = SEARCH_API_FILE) -> dict:
+    """Learned endpoints of a host, or an empty dict if nothing was learned yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(host, {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_endpoints(endpoints: dict, host: str, path: str = SEARCH_API_FILE):
+    """Merge newly learned endpoints into the file, keeping other hosts and verticals"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            learned = json.load(f)
+    except (OSError, ValueError):
+        learned = {}
+    learned.setdefault(host, {}).update(endpoints)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(learned, f, indent=1, sort_keys=True)
+
+
+# ==================== EXPANSION ====================
+def render(value: str, spec: str = None) -> str:
+    if not spec:
+        return value
+    if spec == "slug":
+        return slug(value)
+    return datetime.strptime(value, "%Y-%m-%d").strftime(spec)
+
+
+def expand(endpoint: dict, values: dict) -> tuple:
+    """(method, url, fetch options) of an endpoint filled with values; missing fields use the sample"""
+    merged = {**endpoint["sample"], **values}
+
+    def fill(text):
+        if not isinstance(text, str):
+            return text
+        return PLACEHOLDER_RE.sub(lambda m: render(merged.get(m[1], ""), m[2]), text)
+
+    path = "/".join(quote(fill(segment)) if PLACEHOLDER_RE.search(segment) else segment
+                    for segment in endpoint["path"].split("/"))
+    url = path
+    if endpoint["query"]:
+        url += "?" + urlencode([(key, fill(value)) for key, value in endpoint["query"]])
+    options = {}
+    if endpoint["form"] is not None:
+        options["form"] = {key: fill(value) for key, value in endpoint["form"]}
+    elif endpoint["json"] is not None:
+        body = endpoint["json"]
+        options["data"] = {key: fill(value) for key, value in body.items()} if isinstance(body, dict) else body
+    return endpoint["method"], url, options
+
+
+def count_results(body: str, content_type: str = "") -> int:
+    """Result rows in a search response: search_results elements in HTML, list items in JSON"""
+    if "json" in content_type:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 0
+        if isinstance(data, dict):
+            data = next((data[key] for key in JSON_RESULT_KEYS if isinstance(data.get(key), list)), [])
+        return len(data) if isinstance(data, list) else 0
+    return sum(
+        1 for match in CLASS_RE.finditer(body)
+        if any(name in RESULT_CLASSES for name in match[1].split())
+    )
+
+
+def build_matrix(endpoints: dict, cities: list = CITIES, days: list = (7, 14, 30), stay: int = 2,
+                 limit: int = None) -> list:
+    """(vertical, values) cases: every ordered city pair and date offset, per learned vertical"""
+    cases, seen = [], set()
+    for vertical in endpoints:
+        for (a, b), offset in itertools.product(itertools.permutations(cities, 2), days):
+            first = (date.today() + timedelta(days=offset)).isoformat()
+            second = (date.today() + timedelta(days=offset + stay)).isoformat()
+            values = CASE_VALUES.get(vertical, CASE_VALUES["flights"])(a, b, first, second)
+            # Only the learned fields vary; single-city verticals would otherwise repeat
+            values = {k: v for k, v in values.items() if k in endpoints[vertical]["fields"]}
+            key = (vertical, tuple(sorted(values.items())))
+            if key not in seen:
+                seen.add(key)
+                cases.append((vertical, values))
+    return cases[:limit] if limit else cases
+
+
+# ==================== CLIENT ====================
+class SearchClient:
+    """Learned search endpoints called through a pool of keep-alive request contexts"""
+
+    def __init__(self, playwright, base_url: str, endpoints: dict, contexts: int = 4, concurrency: int = 32,
+                 timeout_ms: int = 30000):
+        self.playwright = playwright
+        self.base_url = base_url
+        self.endpoints = endpoints
+        self.size = max(1, contexts)
+        self.timeout_ms = timeout_ms
+        self.limit = asyncio.Semaphore(concurrency)
+        self.contexts = []
+        self._turn = itertools.count()
+
+    async def __aenter__(self) -> "SearchClient":
+        # Each context keeps its connections alive; requests are spread over them round-robin
+        self.contexts = [
+            await self.playwright.request.new_context(
+                base_url=self.base_url,
+                extra_http_headers={"User-Agent": settings.USER_AGENT},
+                timeout=self.timeout_ms,
+            )
+            for _ in range(self.size)
+        ]
+        return self
+
+    async def __aexit__(self, *exc):
+        for context in self.contexts:
+            await context.dispose()
+        self.contexts = []
+
+    async def check(self, vertical: str, values: dict) -> dict:
+        """Run one search; returns vertical, url, status, result count, latency and error"""
+        method, url, options = expand(self.endpoints[vertical], values)
+        context = self.contexts[next(self._turn) % len(self.contexts)]
+        result = {"vertical": vertical, "url": url, "status": None, "results": None, "ms": None, "error": None}
+        async with self.limit:
+            started = time.perf_counter()
+            try:
+                response = await context.fetch(url, method=method, fail_on_status_code=False, **options)
+                try:
+                    body = await response.text()
+                finally:
+                    # Playwright keeps every response body until it is disposed
+                    await response.dispose()
+            except Error as e:
+                result["error"] = type(e).__name__
+                return result
+            finally:
+                result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["status"] = response.status
+        if response.status >= 400:
+            result["error"] = f"HTTP {response.status}"
+        else:
+            result["results"] = count_results(body, response.headers.get("content-type", ""))
+        return result
+
+
+async def run_matrix(client: SearchClient, cases: list) -> list:
+    """Check every (vertical, values) case; the client bounds how many run at once"""
+    return await asyncio.gather(*(client.check(vertical, values) for vertical, values in cases))
+
+
+def summarize(results: list, duration_s: float) -> dict:
+    """Checks per minute overall, and per vertical: checks, errors, empty results and latency"""
+    summary = {
+        "checks": len(results),
+        "duration_s": round(duration_s, 2),
+        "checks_per_min": round(len(results) / duration_s * 60) if duration_s else 0,
+        "verticals": {},
+    }
+    for vertical in sorted({r["vertical"] for r in results}):
+        rows = [r for r in results if r["vertical"] == vertical]
+        latencies = [r["ms"] for r in rows if r["error"] is None]
+        summary["verticals"][vertical] = {
+            "checks": len(rows),
+            "errors": sum(1 for r in rows if r["error"] is not None),
+            "empty": sum(1 for r in rows if r["results"] == 0),
+            **{f"p{p}_ms": percentile(latencies, p) for p in PERCENTILES},
+        }
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f"{summary['checks']} checks in {summary['duration_s']}s ({summary['checks_per_min']}/min)"]
+    for vertical, row in summary["verticals"].items():
+        lines.append(
+            f"  {vertical:<8} checks={row['checks']} errors={row['errors']} empty={row['empty']} "
+            f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms"
+        )
+    return "\n".join(lines)
+
+
+# ==================== CLI ====================
+async def learn_from_ui(base_url: str, verticals: list) -> list:
+    """Run one UI search per vertical and return what the forms submitted"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=settings.HEADLESS)
+        try:
+            context = await browser.new_context(**settings.context_options())
+            home = AsyncHomePage(await context.new_page())
+            home.base_url = base_url
+            home.learn_searches = True
+            for vertical in verticals:
+                method, args = SAMPLE_SEARCHES[vertical]
+                await home.navigate()
+                await home.wait_for_load()
+                await getattr(home, method)(*args)
+        finally:
+            await browser.close()
+    return home.search_requests
+
+
+async def check_matrix(base_url: str, endpoints: dict, cases: list, contexts: int, concurrency: int) -> tuple:
+    async with async_playwright() as p:
+        async with SearchClient(p, base_url, endpoints, contexts, concurrency) as client:
+            started = time.perf_counter()
+            results = await run_matrix(client, cases)
+            return results, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Learn the search requests and run search matrices over HTTP")
+    parser.add_argument("command", choices=("learn", "run"))
+    parser.add_argument("--base-url", default=settings.BASE_URL)
+    parser.add_argument("--local-site", action="store_true", help="Use the bundled stand-in site")
+    parser.add_argument("--file", default=settings.SEARCH_API_FILE, help="Learned endpoints, per host")
+    parser.add_argument("--verticals", nargs="+", choices=VERTICALS, default=list(VERTICALS))
+    parser.add_argument("--days", nargs="+", type=int, default=[7, 14, 30], help="Date offsets in the matrix")
+    parser.add_argument("--limit", type=int, default=None, help="Check at most this many cases")
+    parser.add_argument("--contexts", type=int, default=4, help="Pooled request contexts")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--json", default=None, help="Write the summary and every result here")
+    args = parser.parse_args(argv)
+
+    site = LocalSite(config=LocalSiteConfig.from_env()).start() if args.local_site else None
+    base_url = site.url if site else args.base_url
+    host = urlsplit(base_url).hostname
+    try:
+        if args.command == "learn":
+            endpoints = learn_all(asyncio.run(learn_from_ui(base_url, args.verticals)))
+            save_endpoints(endpoints, host, args.file)
+            for vertical, endpoint in sorted(endpoints.items()):
+                print(f"{vertical:<8} {endpoint['method']} {endpoint['path']} fields={','.join(endpoint['fields'])}")
+            return 0 if endpoints else 1
+        endpoints = {v: e for v, e in load_endpoints(host, args.file).items() if v in args.verticals}
+        if not endpoints:
+            print(f"No search endpoints learned for {host}; run `python -m utils.search_api learn` first")
+            return 1
+        cases = build_matrix(endpoints, days=args.days, limit=args.limit)
+        results, elapsed = asyncio.run(check_matrix(base_url, endpoints, cases, args.contexts, args.concurrency))
+        summary = summarize(results, elapsed)
+        print(format_summary(summary))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"summary": summary, "results": results}, f, indent=1)
+        return 1 if any(row["errors"] for row in summary["verticals"].values()) else 0
+    finally:
+        if site:
+            site.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
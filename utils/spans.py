@@ -0,0 +1,278 @@
+"""
+Step-level timing spans for page-object methods and the Playwright calls inside them.
+With --trace-steps, every public page-object coroutine (HomePage.search_flights, WaitEngine.autocomplete...)
+and every Playwright Page/Locator call opens a span while a test runs, giving one nested span tree per test.
+Playwright's classes are only patched then; without it, no Playwright call is wrapped.
+The trees are written in the Chrome trace event format (open them in chrome://tracing, Perfetto
+or speedscope) and aggregated into a "slowest steps" table.
+
+Usage:
+    python -m utils.spans perf/steps.trace.json
+    python -m utils.spans perf/steps-*.trace.json --top 30
+"""
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import pytest
+from playwright import async_api, sync_api
+from utils.impact import symbol_name, touch
+
+# Innermost open span of the running test; None outside tests, which disables recording
+CURRENT = contextvars.ContextVar("current_span", default=None)
+# Playwright classes whose calls are recorded, in both the sync and async API
+PLAYWRIGHT_CLASSES = ("Page", "Frame", "Locator", "Keyboard", "Mouse")
+# Span kinds aggregated into the slowest steps table
+STEP_KINDS = ("step", "playwright")
+DEFAULT_TOP = 15
+
+# Wall clock at a known perf_counter value, so traces of parallel shards share one timeline
+_EPOCH_WALL = time.time()
+_EPOCH_PERF = time.perf_counter()
+
+
+class Span:
+    """One timed call with its nested calls"""
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+        self.children = []
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    @property
+    def self_ms(self) -> float:
+        """Time not spent in child spans"""
+        return max(0.0, self.duration_ms - sum(child.duration_ms for child in self.children))
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": round(self.duration_ms, 2),
+            "error": self.error,
+            "children": [child.as_dict() for child in self.children],
+        }
+
+    def trace_events(self, pid: int, tid: int) -> list:
+        """Complete ("X") events for this span and its descendants"""
+        args = {"self_ms": round(self.self_ms, 3)}
+        if self.error:
+            args["error"] = self.error
+        events = [{
+            "name": self.name,
+            "cat": self.kind,
+            "ph": "X",
+            "ts": round((_EPOCH_WALL + self.start - _EPOCH_PERF) * 1e6),
+            "dur": round(self.duration_ms * 1000),
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }]
+        for child in self.children:
+            events += child.trace_events(pid, tid)
+        return events
+
+
+@contextmanager
+def span(name: str, kind: str = "step"):
+    """Record a child of the current span; does nothing when no test is being traced"""
+    parent = CURRENT.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, kind)
+    parent.children.append(child)
+    token = CURRENT.set(child)
+    try:
+        yield child
+    except BaseException as error:
+        child.error = type(error).__name__
+        raise
+    finally:
+        child.finish()
+        CURRENT.reset(token)
+
+
+def traced(function, name: str, kind: str, on_call=None, after=None):
+    """Wrap a function or coroutine function so each call is recorded as a span
+
+    after is an optional coroutine function awaited with (name, args) once a traced coroutine
+    call has succeeded, only while a test is being traced.
+    """
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            if on_call is not None:
+                on_call(name)
+            if CURRENT.get() is None:
+                return await function(*args, **kwargs)
+            with span(name, kind):
+                result = await function(*args, **kwargs)
+            if after is not None:
+                await after(name, args)
+            return result
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if on_call is not None:
+                on_call(name)
+            if CURRENT.get() is None:
+                return function(*args, **kwargs)
+            with span(name, kind):
+                return function(*args, **kwargs)
+    wrapper.__traced__ = True
+    return wrapper
+
+
+def instrument_steps(cls, after=None):
+    """Record the public coroutine methods a class defines as steps (e.g. 'HomePage.click_tab')"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(value) or getattr(value, "__traced__", False):
+            continue
+        # Step names double as the symbols test impact analysis records
+        setattr(cls, name, traced(value, symbol_name(cls.__name__, name), "step", on_call=touch, after=after))
+    return cls
+
+
+def instrument_playwright():
+    """Record Playwright calls that talk to the browser, in the sync and async API (idempotent)"""
+    for class_name in PLAYWRIGHT_CLASSES:
+        twin = vars(getattr(async_api, class_name))
+        for module in (async_api, sync_api):
+            cls = getattr(module, class_name)
+            for name, value in list(vars(cls).items()):
+                # Builders like locator() and first are not calls; only the async twin's coroutines are
+                if name.startswith("_") or not inspect.isfunction(value) or getattr(value, "__traced__", False):
+                    continue
+                if not inspect.iscoroutinefunction(twin.get(name)):
+                    continue
+                setattr(cls, name, traced(value, f"{class_name}.{name}", "playwright"))
+
+
+# ==================== AGGREGATION ====================
+def slowest_steps(events: list, top: int = DEFAULT_TOP) -> list:
+    """Per step name: calls, total and self time, sorted by self time (where the time really went)"""
+    steps = {}
+    for event in events:
+        if event.get("ph") != "X" or event.get("cat") not in STEP_KINDS:
+            continue
+        entry = steps.setdefault(event["name"], {"name": event["name"], "calls": 0, "total_ms": 0.0,
+                                                 "self_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        duration_ms = event["dur"] / 1000
+        entry["calls"] += 1
+        entry["total_ms"] += duration_ms
+        entry["self_ms"] += event["args"].get("self_ms", duration_ms)
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["errors"] += 1 if event["args"].get("error") else 0
+    ranked = sorted(steps.values(), key=lambda s: s["self_ms"], reverse=True)[:top]
+    for entry in ranked:
+        entry["mean_ms"] = entry["total_ms"] / entry["calls"]
+    return ranked
+
+
+def format_steps(steps: list) -> list:
+    lines = [f"{'step':44} {'calls':>6} {'self s':>8} {'total s':>8} {'mean ms':>8} {'max ms':>8} {'errors':>6}"]
+    for s in steps:
+        lines.append(
+            f"{s['name'][:44]:44} {s['calls']:>6} {s['self_ms'] / 1000:>8.2f} {s['total_ms'] / 1000:>8.2f} "
+            f"{s['mean_ms']:>8.0f} {s['max_ms']:>8.0f} {s['errors']:>6}"
+        )
+    return lines
+
+
+def read_trace(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["traceEvents"]
+
+
+# ==================== PYTEST PLUGIN ====================
+class StepTracer:
+    """pytest plugin building a span tree per test and writing the run's trace
+
+    playwright_calls=False keeps Playwright unpatched, recording page-object steps only.
+    """
+
+    def __init__(self, directory: str, shard: str = None, top: int = DEFAULT_TOP, playwright_calls: bool = True):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        suffix = f"-{shard}" if shard else ""
+        self.path = Path(directory) / f"steps{suffix}.trace.json"
+        self.pid = int(shard) if shard else 0
+        self.top = top
+        self.tests = 0
+        process = f"shard {shard}" if shard else "pytest"
+        self.events = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": process}}]
+        if playwright_calls:
+            instrument_playwright()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        root = Span(item.nodeid, "test")
+        token = CURRENT.set(root)
+        try:
+            yield
+        finally:
+            root.finish()
+            CURRENT.reset(token)
+        # One trace "thread" per test, named after it
+        self.tests += 1
+        self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": self.tests,
+                            "args": {"name": item.nodeid}})
+        self.events += root.trace_events(self.pid, self.tests)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with span("setup", "phase"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with span("call", "phase"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        with span("teardown", "phase"):
+            yield
+
+    def pytest_sessionfinish(self, session):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        steps = slowest_steps(self.events, self.top)
+        if not steps or not self.top:
+            return
+        terminalreporter.section("slowest steps")
+        for line in format_steps(steps):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"trace: {self.path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Slowest steps across one or more step traces")
+    parser.add_argument("traces", nargs="+", help="trace files written by the test run")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args(argv)
+    events = [event for path in args.traces for event in read_trace(path)]
+    for line in format_steps(slowest_steps(events, args.top)):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
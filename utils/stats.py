@@ -0,0 +1,16 @@
+"""
+Latency statistics shared by the load generator and the search API matrix.
+"""
+import math
+
+# Latency percentiles reported by the load and search matrix summaries
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values: list, p: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,262 @@
+"""
+Data-driven search sweeps: the HomePage search_* flows fed from CSV or JSONL files.
+Rows are streamed through a generator (never loaded all at once), spread over parallel pages
+through a bounded queue, and each result is appended to a JSONL file as soon as it is known.
+An interrupted sweep resumes where it stopped: rows already in the results file are skipped,
+except those that ended in an error, which run again. A worker whose page crashed or whose
+context closed starts over on a new one instead of failing every row it has left.
+
+Columns are the search method's parameters (origin, destination, departure_days... for
+flights; city, checkin_days... for hotels); an optional min_results column turns a row into
+an assertion. Other columns are ignored.
+
+Usage:
+    python -m utils.sweep generate flights --rows 50000 --output routes.csv
+    python -m utils.sweep run flights routes.csv --output flights.jsonl --pages 8 --local-site
+    python -m utils.sweep run flights routes.csv --output flights.jsonl --resume
+    python -m utils.sweep run hotels cities.jsonl --output hotels.jsonl --start 1200 --limit 500
+"""
+import argparse
+import asyncio
+import csv
+import inspect
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext, suppress
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright
+from models.async_home_page import AsyncHomePage
+from utils import config as settings
+from utils.local_site import CITIES, LocalSite, LocalSiteConfig
+
+SEARCHES = {
+    "flights": "search_flights",
+    "hotels": "search_hotels",
+    "tours": "search_tours",
+    "cars": "search_cars",
+    "visa": "search_visa",
+}
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+
+# ==================== INPUT ====================
+def read_rows(path: str, start: int = 0):
+    """(offset, row) for every row of a CSV or JSONL file from start on, read lazily"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(JSONL_SUFFIXES):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        yield from itertools.islice(enumerate(rows), start, None)
+
+
+def search_arguments(vertical: str, row: dict) -> dict:
+    """Keyword arguments of the vertical's search method found in a row, converted to the annotated types"""
+    parameters = inspect.signature(getattr(AsyncHomePage, SEARCHES[vertical])).parameters
+    arguments = {}
+    for name, parameter in parameters.items():
+        value = row.get(name)
+        if name == "self" or value in (None, ""):
+            continue
+        arguments[name] = int(value) if parameter.annotation is int else value
+    return arguments
+
+
+def generate_rows(vertical: str, count: int):
+    """Synthetic rows: every ordered city pair, then again with later dates"""
+    pairs = list(itertools.permutations(CITIES, 2))
+    for index in range(count):
+        (a, b), days = pairs[index % len(pairs)], 7 + (index // len(pairs)) % 60
+        yield {
+            "flights": {"origin": a, "destination": b, "flight_type": "oneway", "departure_days": days},
+            "hotels": {"city": a, "checkin_days": days, "checkout_days": days + 2},
+            "tours": {"destination": a, "days_from_today": days},
+            "cars": {"pickup_location": a, "dropoff_location": b},
+            "visa": {"from_country": a, "to_country": b},
+        }[vertical]
+
+
+# ==================== OUTPUT ====================
+def resume_point(path: str) -> tuple:
+    """(first offset not yet done, offsets done past it) from an existing results file
+
+    A row is done when its latest line has no error; rows that errored run again.
+    """
+    passed = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                    passed[result["offset"]] = result.get("error") is None
+                except (ValueError, KeyError):
+                    # A line cut short by the interruption; that row runs again
+                    continue
+    except OSError:
+        return 0, set()
+    done = {offset for offset, ok in passed.items() if ok}
+    start = 0
+    while start in done:
+        start += 1
+    return start, {offset for offset in done if offset > start}
+
+
+class ResultWriter:
+    """Appends one JSON line per row and flushes it, so an interruption loses nothing written"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.errors = 0
+        self.results = 0
+        # Finish a line cut short by an earlier interruption before appending
+        partial = os.path.exists(path) and os.path.getsize(path) > 0 and not self._ends_with_newline()
+        self.file = open(path, "a", encoding="utf-8")
+        if partial:
+            self.file.write("\n")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write(self, result: dict):
+        self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+        self.rows += 1
+        self.errors += result["error"] is not None
+        self.results += result["results"] or 0
+
+    def close(self):
+        self.file.close()
+
+    def summary(self) -> dict:
+        return {"rows": self.rows, "errors": self.errors, "results": self.results}
+
+
+# ==================== SWEEP ====================
+async def run_row(home: AsyncHomePage, vertical: str, offset: int, row: dict) -> dict:
+    """Search for one row on a page and return its result line"""
+    result = {"offset": offset, "vertical": vertical, "input": row, "results": None, "url": None, "ms": None, "error": None}
+    started = time.perf_counter()
+    try:
+        await home.navigate()
+        await home.wait_for_load()
+        await getattr(home, SEARCHES[vertical])(**search_arguments(vertical, row))
+        result["results"] = await home.get_search_results_count()
+        result["url"] = home.page.url
+        if row.get("min_results") not in (None, "") and result["results"] < int(row["min_results"]):
+            result["error"] = f"expected at least {row['min_results']} results"
+    except Exception as e:
+        # Any failure is this row's result (bulk_fill raises AssertionError for fields that did not stick);
+        # one bad row must not abort the sweep. Cancellation is not an Exception and still stops it.
+        result["error"] = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+    result["ms"] = round((time.perf_counter() - started) * 1000)
+    return result
+
+
+def page_lost(home: AsyncHomePage, result: dict) -> bool:
+    """Whether a row failed because its page or context went away rather than because of the row"""
+    error = result["error"] or ""
+    return home.page.is_closed() or error.startswith("TargetClosedError") or "crashed" in error
+
+
+async def sweep(vertical: str, rows, writer: ResultWriter, base_url: str, pages: int = 4, skip: set = frozenset()):
+    """Run rows over parallel pages; at most two rows per page are read ahead of the searches"""
+    queue = asyncio.Queue(maxsize=pages * 2)
+
+    async def produce():
+        for offset, row in rows:
+            if offset not in skip:
+                await queue.put((offset, row))
+        for _ in range(pages):
+            await queue.put(None)
+
+    async def open_page(browser):
+        context = await browser.new_context(**settings.context_options())
+        home = AsyncHomePage(await context.new_page())
+        home.base_url = base_url
+        return context, home
+
+    async def work(browser):
+        context, home = await open_page(browser)
+        while (item := await queue.get()) is not None:
+            result = await run_row(home, vertical, *item)
+            if page_lost(home, result):
+                # Every later row would fail on the dead page: start over on a new one and give this row a second try
+                with suppress(Exception):
+                    await context.close()
+                context, home = await open_page(browser)
+                result = await run_row(home, vertical, *item)
+            writer.write(result)
+        await context.close()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=settings.HEADLESS)
+        try:
+            await asyncio.gather(produce(), *(work(browser) for _ in range(pages)))
+        finally:
+            await browser.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run HomePage search flows for every row of a CSV/JSONL file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write synthetic input rows as CSV")
+    generate.add_argument("vertical", choices=SEARCHES)
+    generate.add_argument("--rows", type=int, default=1000)
+    generate.add_argument("--output", default=None, help="CSV file (default: stdout)")
+    run = commands.add_parser("run", help="search every row and append the results as JSON lines")
+    run.add_argument("vertical", choices=SEARCHES)
+    run.add_argument("input", help="CSV or JSONL rows")
+    run.add_argument("--output", required=True, help="JSONL results, appended to")
+    run.add_argument("--pages", type=int, default=4, help="pages searching in parallel")
+    run.add_argument("--start", type=int, default=0, help="first row offset to run")
+    run.add_argument("--resume", action="store_true", help="skip the rows already in --output without an error")
+    run.add_argument("--limit", type=int, default=None, help="run at most this many rows")
+    run.add_argument("--base-url", default=None)
+    run.add_argument("--local-site", action="store_true", help="run against the bundled stand-in server")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        # Columns from a sample row, so --rows 0 still writes the header
+        fieldnames = list(next(generate_rows(args.vertical, 1)))
+        target = open(args.output, "w", newline="", encoding="utf-8") if args.output else nullcontext(sys.stdout)
+        with target as f:
+            out = csv.DictWriter(f, fieldnames=fieldnames)
+            out.writeheader()
+            out.writerows(generate_rows(args.vertical, args.rows))
+        return 0
+
+    start, skip = args.start, set()
+    if args.resume:
+        start, skip = resume_point(args.output)
+        start = max(start, args.start)
+    rows = read_rows(args.input, start)
+    if args.limit is not None:
+        rows = itertools.islice(rows, args.limit)
+    site = LocalSite(config=LocalSiteConfig.from_env()).start() if args.local_site else None
+    writer = ResultWriter(args.output)
+    started = time.perf_counter()
+    try:
+        base_url = site.url if site else (args.base_url or settings.BASE_URL)
+        print(f"{args.vertical}: rows from offset {start} of {args.input} against {urlsplit(base_url).netloc}")
+        asyncio.run(sweep(args.vertical, rows, writer, base_url, args.pages, skip))
+    except KeyboardInterrupt:
+        print("interrupted; continue with --resume")
+    finally:
+        writer.close()
+        if site:
+            site.stop()
+    summary = writer.summary()
+    elapsed = time.perf_counter() - started
+    print(f"{summary['rows']} rows in {elapsed:.1f}s ({summary['rows'] / elapsed * 60:.0f}/min), "
+          f"{summary['errors']} errors, {summary['results']} results -> {args.output}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Element-level visual baselines.
+Page-object regions (header, featured sections, footer) are captured as element screenshots
+with dynamic content (prices, dates, copyright) masked by Playwright, then compared with the
+baseline of the target site. The diff is vectorized with NumPy and tiled: byte-identical bands
+of tiles are skipped, changed pixels are found per band, and differences that match a
+neighbouring pixel both ways (anti-aliasing, sub-pixel shifts) are tolerated. Changes are
+counted per tile, and failing comparisons write a compact heatmap. A full-HD capture compares
+in a few milliseconds.
+
+Requires numpy and Pillow (requirements.txt).
+
+Usage:
+    pytest -m visual --update-baselines   # record or refresh baselines
+    python -m utils.visual baseline.png actual.png --heatmap diff.png
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from utils import config as settings
+
+BASELINE_DIR = settings.VISUAL_BASELINE_DIR
+DIFF_DIR = "visual_diffs"
+# Side of the square tiles changes are counted in
+TILE = 16
+# Largest per-channel difference (0-255) still counted as the same colour
+PIXEL_THRESHOLD = 24
+# Neighbourhood searched for a matching pixel before a difference counts (anti-aliasing)
+AA_RADIUS = 1
+# Share of changed pixels a region may have and still match its baseline
+MAX_DIFF_RATIO = 0.0001
+# Colour Playwright paints masked elements with, identical in baseline and capture
+MASK_COLOR = "#FF00FF"
+# Heatmap pixels per tile side
+HEATMAP_SCALE = 4
+
+# Set by the conftest: write captures as the new baselines instead of comparing
+update_baselines = False
+
+
+def decode(data: bytes) -> np.ndarray:
+    """RGB array (height, width, 3) of an encoded image"""
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+
+def encode(array: np.ndarray) -> bytes:
+    out = io.BytesIO()
+    Image.fromarray(array).save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+class Diff:
+    """Changed pixels of a capture against its baseline, counted per tile"""
+
+    def __init__(self, changed: np.ndarray = None, size_changed: tuple = None, new: bool = False, compare_ms: float = 0.0,
+                 missing: str = None):
+        self.changed = changed
+        # (baseline size, capture size) when the region changed size
+        self.size_changed = size_changed
+        self.new = new
+        self.compare_ms = compare_ms
+        # Path of the baseline when there is none to compare with
+        self.missing = missing
+
+    @property
+    def changed_pixels(self) -> int:
+        return 0 if self.changed is None else int(self.changed.sum())
+
+    @property
+    def ratio(self) -> float:
+        if self.size_changed:
+            return 1.0
+        return 0.0 if self.changed is None or not self.changed.size else self.changed_pixels / self.changed.size
+
+    def tiles(self, tile: int = TILE) -> np.ndarray:
+        """Changed pixels per tile (rows, columns)"""
+        height, width = self.changed.shape
+        rows, cols = -(-height // tile), -(-width // tile)
+        padded = np.zeros((rows * tile, cols * tile), dtype=np.int32)
+        padded[:height, :width] = self.changed
+        return padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+
+    def bbox(self):
+        """(x, y, width, height) around every changed pixel, or None"""
+        if not self.changed_pixels:
+            return None
+        ys, xs = np.nonzero(self.changed)
+        return int(xs.min()), int(ys.min()), int(xs.max() - xs.min() + 1), int(ys.max() - ys.min() + 1)
+
+    def passed(self, max_ratio: float = MAX_DIFF_RATIO) -> bool:
+        return not self.missing and not self.size_changed and self.ratio <= max_ratio
+
+    def summary(self) -> str:
+        if self.new:
+            return "new baseline recorded"
+        if self.missing:
+            return f"no baseline at {self.missing}; record it with --update-baselines and commit it"
+        if self.size_changed:
+            return f"size changed from {self.size_changed[0]} to {self.size_changed[1]}"
+        return (f"{self.changed_pixels} pixels changed ({self.ratio:.3%}) in {int((self.tiles() > 0).sum())} tiles, "
+                f"bbox {self.bbox()}, compared in {self.compare_ms:.1f}ms")
+
+
+def matched_nearby(source: np.ndarray, target: np.ndarray, ys: np.ndarray, xs: np.ndarray,
+                   radius: int = AA_RADIUS, threshold: int = PIXEL_THRESHOLD) -> np.ndarray:
+    """Per candidate pixel: whether source has a pixel within radius close to target's colour there"""
+    height, width = source.shape[:2]
+    colours = target[ys, xs].astype(np.int16)
+    best = np.full(len(ys), 255, dtype=np.int16)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            near = source[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)].astype(np.int16)
+            best = np.minimum(best, np.abs(near - colours).max(axis=1))
+    return best <= threshold
+
+
+def compare(baseline: np.ndarray, actual: np.ndarray, masks: tuple = (), threshold: int = PIXEL_THRESHOLD,
+            aa_radius: int = AA_RADIUS) -> Diff:
+    """Changed pixels between two RGB arrays; masks are (x, y, width, height) regions to ignore"""
+    started = time.perf_counter()
+    if baseline.shape != actual.shape:
+        return Diff(size_changed=(baseline.shape[1::-1], actual.shape[1::-1]))
+    changed = np.zeros(baseline.shape[:2], dtype=bool)
+    # Bands of one tile row are compared byte-wise first; only differing bands are diffed per pixel
+    for top in range(0, baseline.shape[0], TILE):
+        before, after = baseline[top:top + TILE], actual[top:top + TILE]
+        if not np.array_equal(before, after):
+            changed[top:top + TILE] = np.abs(before.astype(np.int16) - after.astype(np.int16)).max(axis=2) > threshold
+    for x, y, width, height in masks:
+        changed[y:y + height, x:x + width] = False
+    if aa_radius and changed.any():
+        ys, xs = np.nonzero(changed)
+        # Anti-aliased edges have a close match nearby in both images; real changes do not
+        tolerated = (matched_nearby(baseline, actual, ys, xs, aa_radius, threshold)
+                     & matched_nearby(actual, baseline, ys, xs, aa_radius, threshold))
+        changed[ys[tolerated], xs[tolerated]] = False
+    return Diff(changed, compare_ms=(time.perf_counter() - started) * 1000)
+
+
+def heatmap(actual: np.ndarray, diff: Diff, tile: int = TILE, scale: int = HEATMAP_SCALE) -> np.ndarray:
+    """Dimmed grayscale thumbnail of the capture (scale pixels per tile) with changed tiles in red"""
+    counts = diff.tiles(tile)
+    rows, cols = counts.shape
+    height, width = actual.shape[:2]
+    block = tile // scale
+    padded = np.zeros((rows * tile, cols * tile), dtype=np.float32)
+    padded[:height, :width] = actual.mean(axis=2)
+    gray = padded.reshape(rows * scale, block, cols * scale, block).mean(axis=(1, 3)) * 0.4
+    heat = np.repeat(np.repeat(counts / (tile * tile), scale, axis=0), scale, axis=1)
+    # Any change is clearly visible; fully changed tiles are pure red
+    red = np.where(heat > 0, 128 + 127 * heat, gray)
+    image = np.stack([red, np.where(heat > 0, 0, gray), np.where(heat > 0, 0, gray)], axis=2)
+    return image.clip(0, 255).astype(np.uint8)
+
+
+def check(name: str, capture: bytes, target: str, masks: tuple = (), max_ratio: float = MAX_DIFF_RATIO,
+          baseline_dir: str = BASELINE_DIR, diff_dir: str = DIFF_DIR) -> Diff:
+    """Compare a capture with its baseline and write a heatmap on failure; with update_baselines, record it instead
+
+    A missing baseline fails the comparison: recording it silently would let any layout pass.
+    """
+    baseline_path = Path(baseline_dir) / target / f"{name}.png"
+    if update_baselines:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_bytes(capture)
+        return Diff(new=True)
+    if not baseline_path.exists():
+        return Diff(missing=str(baseline_path))
+    actual = decode(capture)
+    diff = compare(decode(baseline_path.read_bytes()), actual, masks)
+    if not diff.passed(max_ratio):
+        out = Path(diff_dir) / target
+        out.mkdir(parents=True, exist_ok=True)
+        (out / f"{name}.actual.png").write_bytes(capture)
+        if not diff.size_changed:
+            (out / f"{name}.heatmap.png").write_bytes(encode(heatmap(actual, diff)))
+    return diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two screenshots and write a diff heatmap")
+    parser.add_argument("baseline")
+    parser.add_argument("actual")
+    parser.add_argument("--heatmap", default=None, help="write the heatmap PNG here")
+    parser.add_argument("--max-ratio", type=float, default=MAX_DIFF_RATIO)
+    args = parser.parse_args(argv)
+    actual = decode(Path(args.actual).read_bytes())
+    diff = compare(decode(Path(args.baseline).read_bytes()), actual)
+    print(diff.summary())
+    if args.heatmap and not diff.size_changed:
+        Path(args.heatmap).write_bytes(encode(heatmap(actual, diff)))
+    return 0 if diff.passed(args.max_ratio) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Event-driven wait strategies used by the page objects instead of fixed sleeps.
+Every wait has its own timeout, never raises on timeout, and records how long it actually took.
+"""
+import time
+import weakref
+from playwright.async_api import Error
+from utils.playwright_compat import impl_of
+from utils.spans import instrument_steps
+
+# Tracks in-flight fetch/XHR requests so autocomplete calls can be awaited from the page
+WAIT_HOOKS_JS = """
+(() => {
+    if (window.__waitHooks) return;
+    const hooks = window.__waitHooks = { pending: 0, lastActivity: performance.now() };
+    const touch = () => { hooks.lastActivity = performance.now(); };
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            hooks.pending++;
+            touch();
+            return originalFetch.apply(this, args).finally(() => { hooks.pending--; touch(); });
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        hooks.pending++;
+        touch();
+        this.addEventListener("loadend", () => { hooks.pending--; touch(); }, { once: true });
+        return originalSend.apply(this, args);
+    };
+})();
+"""
+
+NETWORK_QUIET_JS = """
+quietMs => {
+    const hooks = window.__waitHooks;
+    if (!hooks) return true;
+    return hooks.pending === 0 && performance.now() - hooks.lastActivity >= quietMs;
+}
+"""
+
+DOM_QUIET_JS = """
+([selector, quietMs, timeoutMs]) => new Promise(resolve => {
+    const root = (selector && document.querySelector(selector)) || document.documentElement;
+    let quietTimer;
+    const finish = ok => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        resolve(ok);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(root, { subtree: true, childList: true, attributes: true, characterData: true });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    const hardTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+ANIMATIONS_JS = """
+(el, timeoutMs) => {
+    const running = el.getAnimations({ subtree: true }).map(a => a.finished.catch(() => null));
+    if (!running.length) return true;
+    return Promise.race([
+        Promise.all(running).then(() => true),
+        new Promise(resolve => setTimeout(() => resolve(false), timeoutMs)),
+    ]);
+}
+"""
+
+STABLE_JS = """
+(el, [frames, timeoutMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let last = null;
+    let stableFrames = 0;
+    const check = () => {
+        const r = el.getBoundingClientRect();
+        const box = [r.x, r.y, r.width, r.height].join(",");
+        stableFrames = box === last ? stableFrames + 1 : 0;
+        last = box;
+        if (stableFrames >= frames) return resolve(true);
+        if (performance.now() - start > timeoutMs) return resolve(false);
+        requestAnimationFrame(check);
+    };
+    requestAnimationFrame(check);
+})
+"""
+
+# Runs on the input: suggestions count once its own list shows options (or a request started after
+# the call has settled, for queries with no match) and the network has been quiet for quietMs.
+# Sites debounce the suggestion fetch, so network quiet alone can pass before it is even sent.
+AUTOCOMPLETE_JS = """
+(input, [quietMs, timeoutMs]) => new Promise(resolve => {
+    const since = performance.now();
+    const hooks = window.__waitHooks;
+    const byId = id => (id && document.getElementById(id)) || null;
+    // The list the widget ties to the input, else the input's own field container
+    const list = () => byId(input.getAttribute("aria-controls")) || byId(input.getAttribute("aria-owns"))
+        || input.list || input.parentElement;
+    const shown = el => el.tagName === "OPTION" || el.getClientRects().length > 0;
+    const hasOptions = () => {
+        const root = list();
+        return !!root && [...root.querySelectorAll("li, option, [role='option']")].some(shown);
+    };
+    const requested = () => !!hooks && (hooks.pending > 0 || hooks.lastActivity > since);
+    const quiet = () => !hooks || (hooks.pending === 0 && performance.now() - hooks.lastActivity >= quietMs);
+    const poll = () => {
+        if (quiet() && (hasOptions() || requested())) return resolve(true);
+        if (performance.now() - since >= timeoutMs) return resolve(false);
+        setTimeout(poll, 50);
+    };
+    poll();
+})
+"""
+
+_hooked_pages = weakref.WeakSet()
+
+
+async def install_wait_hooks_async(page):
+    """Install the request tracking script once per page"""
+    # Keyed by the underlying page so sync and async wrappers of one page share the hooks
+    key = impl_of(page)
+    if key in _hooked_pages:
+        return
+    await page.add_init_script(WAIT_HOOKS_JS)
+    _hooked_pages.add(key)
+
+
+class WaitTiming:
+    """How long a single wait took and whether its condition was met"""
+
+    def __init__(self, name: str, elapsed_ms: float, timeout_ms: int, satisfied: bool):
+        self.name = name
+        self.elapsed_ms = elapsed_ms
+        self.timeout_ms = timeout_ms
+        self.satisfied = satisfied
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "timeout_ms": self.timeout_ms,
+            "satisfied": self.satisfied,
+        }
+
+    def __repr__(self):
+        state = "ok" if self.satisfied else "timeout"
+        return f"<WaitTiming {self.name} {self.elapsed_ms:.0f}ms {state}>"
+
+
+@instrument_steps
+class AsyncWaitEngine:
+    """Waits on real page conditions with per-condition timeouts (milliseconds)"""
+
+    DEFAULT_TIMEOUTS = {
+        "network_quiet": 3000,
+        "dom_quiet": 2000,
+        "animations": 2000,
+        "stable": 2000,
+        "autocomplete": 3000,
+        "results": 5000,
+        "page_load": 10000,
+    }
+
+    def __init__(self, page, timeouts: dict = None):
+        self.page = page
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.timings = []
+
+    async def _timed(self, name: str, timeout: int, condition) -> bool:
+        """Run a condition, record its duration and swallow timeouts"""
+        start = time.perf_counter()
+        try:
+            satisfied = bool(await condition())
+        except Error:
+            # Timeouts and navigations tearing down the document count as unmet conditions
+            satisfied = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.timings.append(WaitTiming(name, elapsed_ms, timeout, satisfied))
+        return satisfied
+
+    # ==================== CONDITIONS ====================
+    async def network_quiet(self, quiet_ms: int = 250, timeout: int = None) -> bool:
+        """Wait until no fetch/XHR request is in flight for quiet_ms"""
+        timeout = timeout or self.timeouts["network_quiet"]
+        return await self._timed("network_quiet", timeout, lambda: self.page.wait_for_function(
+            NETWORK_QUIET_JS, arg=quiet_ms, timeout=timeout, polling=50))
+
+    async def dom_quiet(self, selector: str = "body", quiet_ms: int = 150, timeout: int = None) -> bool:
+        """Wait until the subtree under selector stops mutating for quiet_ms"""
+        timeout = timeout or self.timeouts["dom_quiet"]
+        return await self._timed("dom_quiet", timeout, lambda: self.page.evaluate(
+            DOM_QUIET_JS, [selector, quiet_ms, timeout]))
+
+    async def animations_finished(self, locator, timeout: int = None) -> bool:
+        """Wait until all CSS/Web animations on the element and its children have ended"""
+        timeout = timeout or self.timeouts["animations"]
+        return await self._timed("animations", timeout, lambda: locator.evaluate(
+            ANIMATIONS_JS, timeout, timeout=timeout))
+
+    async def element_stable(self, locator, frames: int = 3, timeout: int = None) -> bool:
+        """Wait until the element's bounding box is unchanged for several animation frames"""
+        timeout = timeout or self.timeouts["stable"]
+        return await self._timed("stable", timeout, lambda: locator.evaluate(
+            STABLE_JS, [frames, timeout], timeout=timeout))
+
+    async def autocomplete(self, input_locator, quiet_ms: int = 250, timeout: int = None) -> bool:
+        """Wait until the input's suggestion list shows options (or its debounced request settles)"""
+        timeout = timeout or self.timeouts["autocomplete"]
+        return await self._timed("autocomplete", timeout, lambda: input_locator.evaluate(
+            AUTOCOMPLETE_JS, [quiet_ms, timeout], timeout=timeout))
+
+    async def attached(self, locator, name: str = "attached", timeout: int = None) -> bool:
+        """Wait until at least one element matching the locator is in the DOM"""
+        timeout = timeout or self.timeouts["results"]
+
+        async def condition():
+            await locator.first.wait_for(state="attached", timeout=timeout)
+            return True
+
+        return await self._timed(name, timeout, condition)
+
+    async def page_loaded(self, timeout: int = None) -> bool:
+        """Wait for the window load event of the current document"""
+        timeout = timeout or self.timeouts["page_load"]
+
+        async def condition():
+            await self.page.wait_for_load_state("load", timeout=timeout)
+            return True
+
+        return await self._timed("page_load", timeout, condition)
+
+    # ==================== REPORTING ====================
+    def total_ms(self) -> float:
+        """Total time spent waiting so far"""
+        return sum(t.elapsed_ms for t in self.timings)
+
+    def summary(self) -> list:
+        """Recorded waits as plain dicts, in the order they happened"""
+        return [t.as_dict() for t in self.timings]